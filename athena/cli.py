@@ -1,6 +1,7 @@
 import click
 
 from athena.entrypoints.backtest import backtest
+from athena.entrypoints.compact import compact
 from athena.entrypoints.download import download
 from athena.entrypoints.visualize import visualize
 
@@ -14,6 +15,7 @@ def app():
 app.add_command(download)
 app.add_command(backtest)
 app.add_command(visualize)
+app.add_command(compact)
 
 
 if __name__ == "__main__":
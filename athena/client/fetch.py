@@ -5,9 +5,14 @@ from pathlib import Path
 from tqdm import tqdm
 
 from athena.client.binance import BinanceClient
-from athena.core.dataset_layout import DatasetLayout
-from athena.core.fluctuations import Fluctuations, load_candles_from_file
+from athena.core.candle_frame import update_csv_file
+from athena.core.column_store import append_frame_to_column_store
+from athena.core.dataset_layout import DatasetLayout, StorageFormat
+from athena.core.fluctuations import Fluctuations
 from athena.core.market_entities import Candle
+from athena.core.manifest import DatasetManifest
+from athena.core.parquet import update_parquet_file
+from athena.core.sqlite import count_sqlite_candles, save_frame_to_sqlite
 from athena.core.types import Coin, Period
 
 logger = logging.getLogger(__name__)
@@ -103,6 +108,8 @@ def download_daily_market_candles(
     timeframe: str,
     output_dir: Path,
     overwrite: bool = False,
+    storage_format: StorageFormat = "csv",
+    column_store: bool = False,
 ):
     """Download market data from coin / currency pair as fluctuations and save them.
 
@@ -114,6 +121,10 @@ def download_daily_market_candles(
         timeframe: timeframe of candles to download
         output_dir: directory to save downloaded candles
         overwrite: replace existing candles with freshly downloaded ones
+        storage_format: 'csv' saves a file per day, 'parquet' merges days into monthly files,
+            'sqlite' inserts candles in a database shared by every pair
+        column_store: also append downloaded candles to the memory-mappable column store of the dataset,
+            days already downloaded and skipped are not added
     """
 
     client = BinanceClient()
@@ -121,7 +132,14 @@ def download_daily_market_candles(
     from_date = datetime.datetime.strptime(from_date, "%Y-%m-%d")
     to_date = datetime.datetime.strptime(to_date, "%Y-%m-%d")
 
-    dataset_layout = DatasetLayout(output_dir)
+    dataset_layout = DatasetLayout(output_dir, storage_format=storage_format)
+    dataset_path = dataset_layout.get_dataset_path(
+        coin=Coin[coin], currency=Coin[currency], period=period
+    )
+    manifest = DatasetManifest.load(dataset_path)
+    if not manifest.entries:  # index datasets downloaded before manifests existed
+        manifest = DatasetManifest.build(dataset_path)
+
     # retrieve data day by day to limit transfer size
     for day_ii in tqdm(range((to_date - from_date).days)):
         start_date = from_date + datetime.timedelta(days=day_ii)
@@ -134,11 +152,27 @@ def download_daily_market_candles(
             date=start_date,
         )
 
-        if overwrite:
-            filename.unlink(missing_ok=True)
+        if storage_format == "sqlite":
+            if not overwrite and (
+                count_sqlite_candles(
+                    filename,
+                    coin=Coin[coin],
+                    currency=Coin[currency],
+                    period=period,
+                    from_date=start_date,
+                    to_date=start_date + datetime.timedelta(days=1),
+                )
+                >= candles_expected_number
+            ):
+                continue
+        elif overwrite:
+            # compacted files hold other days, their candles are replaced below
+            if storage_format == "csv" and not dataset_layout.is_compacted(filename):
+                filename.unlink(missing_ok=True)
+                manifest.remove(filename)
         elif filename.exists():
             if (
-                len(Fluctuations.from_candles(load_candles_from_file(filename)).candles)
+                manifest.count_candles(filename=filename, day=start_date.date())
                 >= candles_expected_number
             ):
                 continue
@@ -152,12 +186,38 @@ def download_daily_market_candles(
             end_date=start_date + datetime.timedelta(days=1),
         )
 
-        if not fluctuations.candles:
+        if not len(fluctuations):
             continue
 
-        if len(fluctuations.candles) < candles_expected_number:
+        if storage_format == "sqlite":  # indexed by the database, no manifest
+            save_frame_to_sqlite(fluctuations.frame, filename)
+        else:
+            if storage_format == "parquet":
+                frame = update_parquet_file(fluctuations.frame, filename)
+            elif dataset_layout.is_compacted(filename):
+                frame = update_csv_file(fluctuations.frame, filename)
+            else:
+                fluctuations.save(filename)
+                frame = fluctuations.frame
+            manifest.update(filename=filename, frame=frame)
+            manifest.save(dataset_path)
+        if column_store:
+            append_frame_to_column_store(
+                fluctuations.frame,
+                dataset_layout.get_column_store_path(
+                    coin=Coin[coin], currency=Coin[currency], period=period
+                ),
+            )
+
+        if len(fluctuations) < candles_expected_number:
+            gaps = (
+                ""
+                if storage_format == "sqlite"
+                else f", missing {manifest.get_gaps(start_date, start_date + datetime.timedelta(days=1))}"
+            )
             logger.warning(
-                f"Expected {candles_expected_number} candles to be downloaded, got {len(fluctuations.candles)} for day {start_date.strftime('%Y-%m-%d')}."
+                f"Expected {candles_expected_number} candles to be downloaded, got {len(fluctuations)} for day {start_date.strftime('%Y-%m-%d')}{gaps}."
             )
 
-        fluctuations.save(filename)
+    if dataset_path.is_dir():
+        manifest.save(dataset_path)
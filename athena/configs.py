@@ -1,5 +1,5 @@
 import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, field_validator, Field
 
@@ -15,6 +15,7 @@ class DataConfig(BaseModel):
         period: the timeframe of the candles data
         from_date: the lower bound date of the dataset.
         to_date: the upper bound date of the dataset.
+        precision: float precision of prices and volumes, 'float32' halves memory for exploration sweeps
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -24,6 +25,7 @@ class DataConfig(BaseModel):
     period: Period
     from_date: datetime.datetime | None = None
     to_date: datetime.datetime | None = None
+    precision: Literal["float64", "float32"] = "float64"
 
     @field_validator("coin", mode="before")
     @classmethod
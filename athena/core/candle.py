@@ -1,35 +1,33 @@
 import datetime
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from athena.core.candle_frame import (
+    AVAILABLE_ATTRIBUTES,
+    ATTRIBUTES_DTYPES,
+    TIME_ATTRIBUTES,
+    CandleFrame,
+    convert_frame_to_period,
+    datetimes_to_epoch,
+    epoch_to_datetimes,
+    load_frame_from_file,
+    sanitize_frame,
+)
 from athena.core.types import Period, Coin
 
 logger = logging.getLogger()
 
-AVAILABLE_ATTRIBUTES = (
-    "open",
-    "high",
-    "low",
-    "close",
-    "open_time",
-    "high_time",
-    "low_time",
-    "close_time",
-    "volume",
-    "quote_volume",
-    "nb_trades",
-    "taker_volume",
-    "taker_quote_volume",
-)
-
 
-@dataclass
+@dataclass(slots=True)
 class Candle:
     """Indicators of a specific candle.
 
+    Candles are compared field by field, values already of the right type are not coerced.
+
     coin: the base coin
     currency: the currency used to trade the coin
     period: the time frame of the candle (e.g. '1m' or '4h')
@@ -43,6 +41,8 @@ class Candle:
     nb_trades: number of trades completed in the candle
     taker_volume: the volume of coin from selling orders that have been filled (taker_volume / volume > 0.5 is high demand)
     taker_quote_volume: the volume of currency earned by selling orders that have been filled
+
+    Attributes not loaded, for candles built from frames loaded with a column projection, are None.
     """
 
     coin: Coin
@@ -64,12 +64,12 @@ class Candle:
     low_time: datetime.datetime | None = None
 
     def __post_init__(self):
-        if isinstance(self.coin, str):
+        if type(self.coin) is str:
             self.coin = Coin[self.coin]
-        if isinstance(self.currency, str):
+        if type(self.currency) is str:
             self.currency = Coin[self.currency]
 
-        if isinstance(self.period, str):
+        if type(self.period) is str:
             self.period = Period(timeframe=self.period)
 
         if isinstance(self.open_time, pd.Timestamp):
@@ -77,18 +77,8 @@ class Candle:
         if isinstance(self.close_time, pd.Timestamp):
             self.close_time = self.close_time.to_pydatetime()
 
-        if pd.isna(self.high_time):
-            self.high_time = None
-        if pd.isna(self.low_time):
-            self.low_time = None
-
-        if isinstance(self.high_time, pd.Timestamp):
-            self.high_time = self.high_time.to_pydatetime()
-        if isinstance(self.low_time, pd.Timestamp):
-            self.low_time = self.low_time.to_pydatetime()
-
-    def __eq__(self, other):
-        return asdict(self) == asdict(other)
+        self.high_time = _to_optional_datetime(self.high_time)
+        self.low_time = _to_optional_datetime(self.low_time)
 
     @classmethod
     def is_available_attribute(cls, attr: str) -> bool:
@@ -118,6 +108,100 @@ class Candle:
         )
 
 
+# candle attributes stored in frames, in the order of `Candle` fields
+CANDLE_ATTRIBUTES = tuple(field.name for field in fields(Candle))[3:]
+
+
+def _to_optional_datetime(value) -> datetime.datetime | None:
+    """Convert pandas timestamps and missing times to python objects."""
+    if value is None or type(value) is datetime.datetime:
+        return value
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+
+def candles_to_frame(candles: list[Candle]) -> CandleFrame:
+    """Store candles as a struct of arrays.
+
+    Args:
+        candles: candles sharing the same coin, currency and period
+
+    Returns:
+        a frame holding candles attributes, rows keep the input order
+
+    Raises:
+        ValueError: if candles have different periods, coins or currencies
+    """
+    if not candles:
+        return CandleFrame.empty(
+            coin=Coin.default_coin(),
+            currency=Coin.default_currency(),
+            period=Period(timeframe="1m"),
+        )
+
+    periods = {candle.period for candle in candles}
+    if len(periods) > 1:
+        periods_str = "[" + ", ".join([period.timeframe for period in periods]) + "]"
+        raise ValueError(f"All candles must have the same period, found {periods_str}.")
+
+    coins = {candle.coin for candle in candles}
+    if len(coins) > 1:
+        coins_str = "[" + ", ".join([coin.value for coin in coins]) + "]"
+        raise ValueError(f"All candles must have the same coin, found {coins_str}.")
+
+    currencies = {candle.currency for candle in candles}
+    if len(currencies) > 1:
+        currencies_str = "[" + ", ".join([coin.value for coin in currencies]) + "]"
+        raise ValueError(
+            f"All candles must have the same currency, found {currencies_str}."
+        )
+
+    columns = {}
+    for name in AVAILABLE_ATTRIBUTES:
+        values = [getattr(candle, name) for candle in candles]
+        columns[name] = (
+            datetimes_to_epoch(values)
+            if name in TIME_ATTRIBUTES
+            else np.asarray(values, dtype=ATTRIBUTES_DTYPES[name])
+        )
+    return CandleFrame(
+        coin=candles[0].coin,
+        currency=candles[0].currency,
+        period=candles[0].period,
+        columns=columns,
+    )
+
+
+def frame_to_candles(frame: CandleFrame) -> list[Candle]:
+    """Build a candle for each row of the frame, attributes missing from the frame are None."""
+    columns = [
+        [None] * len(frame)
+        if name not in frame.columns
+        else epoch_to_datetimes(frame.columns[name])
+        if name in TIME_ATTRIBUTES
+        else frame.columns[name].tolist()
+        for name in CANDLE_ATTRIBUTES
+    ]
+    return [
+        Candle(frame.coin, frame.currency, frame.period, *values)
+        for values in zip(*columns)
+    ]
+
+
+def frame_to_candle(frame: CandleFrame, index: int) -> Candle:
+    """Build the candle stored at row `index` of the frame, see `frame_to_candles`."""
+    row = frame.row(index)
+    return Candle(
+        frame.coin,
+        frame.currency,
+        frame.period,
+        *(row.get(name) for name in CANDLE_ATTRIBUTES),
+    )
+
+
 def merge_candles(candles: list[Candle]) -> Candle:
     """Generate a new candle aggregating input candles information.
 
@@ -163,8 +247,7 @@ def convert_candles_to_period(
 ) -> list[Candle]:
     """Merge close candles into 'bigger' ones.
 
-    We iterate over sorted candles until we reach a theoretical `close_time`.
-    Merge candles between last generated candle and current time into a new candle.
+    Candles are converted to a frame and resampled with `convert_frame_to_period`.
 
     This function assumes every candle have the same coin, currency and period.
 
@@ -182,57 +265,33 @@ def convert_candles_to_period(
     if not candles:
         return []
 
-    src_period = candles[0].period
-
-    if src_period.to_timedelta() > target_period.to_timedelta():
+    if candles[0].period.to_timedelta() > target_period.to_timedelta():
         raise ValueError("Cannot convert candles to lower timeframe.")
 
-    if src_period.to_timedelta() == target_period.to_timedelta():
+    if candles[0].period.to_timedelta() == target_period.to_timedelta():
         return candles
 
-    sorted_candles = sorted(candles, key=lambda candle: candle.open_time)
-    new_candles = []
-    new_candle_start_index = 0
-    new_candle_from_date = sorted_candles[new_candle_start_index].open_time
-
-    for ii in range(len(sorted_candles)):
-        theoretical_close_time_is_reached = sorted_candles[ii].close_time >= (
-            new_candle_from_date + target_period.to_timedelta()
-        )
-        if theoretical_close_time_is_reached:
-            new_candles.append(
-                merge_candles(sorted_candles[new_candle_start_index : ii + 1])
-            )
-            if ii < (len(sorted_candles) - 1):
-                new_candle_start_index = ii + 1
-                new_candle_from_date = sorted_candles[new_candle_start_index].open_time
-            else:
-                # we have reached the end of the loop, don't initiate a new candle
-                pass
-    if new_candle_start_index != (len(sorted_candles) - 1):
-        logger.debug("Last candle could not be closed, won't be kept.")
-    return new_candles
+    return frame_to_candles(
+        convert_frame_to_period(candles_to_frame(candles), target_period=target_period)
+    )
 
 
 def sanitize_candles(candles: list[Candle]) -> list[Candle]:
     """Remove invalid candles.
 
     Invalid candles are :
-        - duplicated candles
+        - duplicated candles, the first occurrence of an open time is kept
         - candles with volume of 0.
 
-    # TODO: improve this function to check over prices / highs / lows / closes
+    Candles are checked as a frame, see `check_frame` for price and time checks.
 
     Args:
         candles: list of raw candles
 
     Returns:
-        filtered candles as a list
+        filtered candles as a list, sorted by open time
     """
-    # remove duplicated candles based on their `open_time`
-    sanitized_candles = list({candle.open_time: candle for candle in candles}.values())
-    sanitized_candles = [candle for candle in sanitized_candles if candle.volume > 0]
-    return sanitized_candles
+    return frame_to_candles(sanitize_frame(candles_to_frame(candles)))
 
 
 def load_candles_from_file(
@@ -247,21 +306,7 @@ def load_candles_from_file(
     Returns:
         new candles as a list of candle
     """
-    df = (
-        pd.read_csv(filename)
-        .sort_values(by="open_time", ascending=True)
-        .drop_duplicates(subset=["open_time", "coin", "currency", "period"])
-        .reset_index(drop=True)
-        .astype(
-            {
-                "open_time": "datetime64[ns]",
-                "high_time": "datetime64[ns]",
-                "low_time": "datetime64[ns]",
-                "close_time": "datetime64[ns]",
-            }
-        )
-    )
-    candles = [Candle(**row.to_dict()) for _, row in df.iterrows()]
+    candles = frame_to_candles(load_frame_from_file(filename))
     if target_period is not None:
         candles = convert_candles_to_period(candles, target_period=target_period)
     return candles
@@ -0,0 +1,892 @@
+import datetime
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv
+
+from athena.core.files import atomic_write
+from athena.core.types import Coin, Period
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE_ATTRIBUTES = (
+    "open",
+    "high",
+    "low",
+    "close",
+    "open_time",
+    "high_time",
+    "low_time",
+    "close_time",
+    "volume",
+    "quote_volume",
+    "nb_trades",
+    "taker_volume",
+    "taker_quote_volume",
+)
+
+PAIR_ATTRIBUTES = ("coin", "currency", "period")
+
+TIME_ATTRIBUTES = ("open_time", "high_time", "low_time", "close_time")
+
+CSV_COLUMNS = (
+    *PAIR_ATTRIBUTES,
+    "open_time",
+    "close_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "quote_volume",
+    "nb_trades",
+    "taker_volume",
+    "taker_quote_volume",
+    "high_time",
+    "low_time",
+)
+
+# pandas formats csv values by blocks of `100_000 // nb_columns` rows (e.g. a date column is written
+# without time when a whole block is at midnight), chunks are a multiple of it to keep files unchanged
+SAVE_CHUNK_SIZE = 100 * (100_000 // len(CSV_COLUMNS))
+
+ATTRIBUTES_DTYPES = {
+    attribute: np.int64
+    if (attribute in TIME_ATTRIBUTES or attribute == "nb_trades")
+    else np.float64
+    for attribute in AVAILABLE_ATTRIBUTES
+}
+
+# prices and volumes, they can be stored as float32 to halve their memory
+FLOAT_ATTRIBUTES = tuple(
+    name for name, dtype in ATTRIBUTES_DTYPES.items() if dtype is np.float64
+)
+
+Precision = Literal["float64", "float32"]
+
+# attributes of every frame, candles can't be ordered nor resampled without them
+REQUIRED_ATTRIBUTES = ("open_time", "close_time")
+
+# attributes checked when loading datasets, the candles kept don't depend on the loaded columns
+CHECKED_ATTRIBUTES = (
+    "open",
+    "high",
+    "low",
+    "close",
+    "open_time",
+    "high_time",
+    "low_time",
+    "close_time",
+    "volume",
+)
+
+# missing times (e.g. unknown `high_time`) are stored as numpy's NaT integer value
+NAT = np.datetime64("NaT").astype(np.int64)
+
+
+def datetimes_to_epoch(values: Iterable[datetime.datetime | None]) -> np.ndarray:
+    """Convert naive datetimes to int64 epoch nanoseconds, None becomes `NAT`."""
+    return np.asarray(list(values), dtype="datetime64[ns]").astype(np.int64)
+
+
+def get_projected_attributes(columns: Iterable[str] | None) -> tuple[str, ...]:
+    """Get the attributes to load for the columns read by consumers of candles (e.g. strategies, indicators).
+
+    `REQUIRED_ATTRIBUTES` and volume are always loaded, so projected candles are ordered and resampled like
+    complete ones. High and low times are aggregated from high and low prices. Dataset loaders also read
+    `CHECKED_ATTRIBUTES` to sanitize candles, then drop them if they are not projected.
+
+    Args:
+        columns: attributes read from candles, None for every attribute
+
+    Returns:
+        attributes to load, ordered as `AVAILABLE_ATTRIBUTES`
+
+    Raises:
+        ValueError: if a column is not a candle attribute
+    """
+    if columns is None:
+        return AVAILABLE_ATTRIBUTES
+    columns = set(columns)
+    if columns - set(AVAILABLE_ATTRIBUTES):
+        raise ValueError(
+            f"Unknown candle attributes {sorted(columns - set(AVAILABLE_ATTRIBUTES))}."
+        )
+    columns |= {*REQUIRED_ATTRIBUTES, "volume"}
+    if "high_time" in columns:
+        columns.add("high")
+    if "low_time" in columns:
+        columns.add("low")
+    return tuple(name for name in AVAILABLE_ATTRIBUTES if name in columns)
+
+
+def epoch_to_datetimes(values: np.ndarray) -> list[datetime.datetime | None]:
+    """Convert int64 epoch nanoseconds to naive datetimes, `NAT` becomes None."""
+    return (
+        values.view("datetime64[ns]").astype("datetime64[us]").astype(object).tolist()
+    )
+
+
+@dataclass(eq=False)
+class CandleFrame:
+    """Candles stored as a struct of arrays, one numpy array per attribute.
+
+    Every candle of a frame shares the same coin, currency and period.
+    Times are stored as int64 epoch nanoseconds, missing times are `NAT`.
+    Frames loaded with a column projection only hold some attributes, `REQUIRED_ATTRIBUTES` are always kept.
+
+    Attributes:
+        coin: the base coin
+        currency: the currency used to trade the coin
+        period: the time frame of the candles
+        columns: maps attributes of `AVAILABLE_ATTRIBUTES` to their values
+    """
+
+    coin: Coin
+    currency: Coin
+    period: Period
+    columns: dict[str, np.ndarray]
+
+    def __post_init__(self):
+        if (
+            not set(REQUIRED_ATTRIBUTES)
+            <= set(self.columns)
+            <= set(AVAILABLE_ATTRIBUTES)
+        ):
+            raise ValueError(
+                f"Frame columns must be among {list(AVAILABLE_ATTRIBUTES)} and include "
+                f"{list(REQUIRED_ATTRIBUTES)}, found {list(self.columns)}."
+            )
+        if len({len(values) for values in self.columns.values()}) > 1:
+            raise ValueError("All frame columns must have the same length.")
+
+    def __len__(self):
+        return len(self.columns["open_time"])
+
+    def __eq__(self, other):
+        """Frames are equal when they hold the same pair, period, attributes and values."""
+        if not isinstance(other, CandleFrame):
+            return NotImplemented
+        return (
+            Coin(self.coin) == Coin(other.coin)
+            and Coin(self.currency) == Coin(other.currency)
+            and self.period == other.period
+            and list(self.columns) == list(other.columns)
+            and all(
+                np.array_equal(values, other.columns[name], equal_nan=True)
+                if values.dtype.kind == "f"
+                else np.array_equal(values, other.columns[name])
+                for name, values in self.columns.items()
+            )
+        )
+
+    def __getitem__(self, item: slice | np.ndarray | list[int]) -> "CandleFrame":
+        """Select rows, slices return views on the underlying arrays."""
+        return CandleFrame(
+            coin=self.coin,
+            currency=self.currency,
+            period=self.period,
+            columns={name: values[item] for name, values in self.columns.items()},
+        )
+
+    @property
+    def open_time(self) -> np.ndarray:
+        return self.columns["open_time"]
+
+    @property
+    def precision(self) -> Precision:
+        """Float precision of prices and volumes."""
+        for name in FLOAT_ATTRIBUTES:
+            if name in self.columns:
+                return (
+                    "float32" if self.columns[name].dtype == np.float32 else "float64"
+                )
+        return "float64"
+
+    def with_precision(self, precision: Precision) -> "CandleFrame":
+        """Get a frame storing prices and volumes with a float precision, times and trades counts are unchanged.
+
+        float32 values keep 24 significant bits, the relative rounding error is at most 2**-24 (about 6e-8),
+        e.g. less than 0.01 on a price of 100 000. Sums over many candles should be computed in float64.
+
+        Args:
+            precision: 'float64' or 'float32'
+
+        Returns:
+            this frame if it already has the precision, a converted copy otherwise
+        """
+        if precision == self.precision:
+            return self
+        return CandleFrame(
+            coin=self.coin,
+            currency=self.currency,
+            period=self.period,
+            columns={
+                name: values.astype(precision) if name in FLOAT_ATTRIBUTES else values
+                for name, values in self.columns.items()
+            },
+        )
+
+    @classmethod
+    def empty(
+        cls,
+        coin: Coin,
+        currency: Coin,
+        period: Period,
+        attributes: Iterable[str] = AVAILABLE_ATTRIBUTES,
+    ):
+        return cls(
+            coin=coin,
+            currency=currency,
+            period=period,
+            columns={
+                name: np.empty(0, dtype=ATTRIBUTES_DTYPES[name]) for name in attributes
+            },
+        )
+
+    @classmethod
+    def concat(cls, frames: list["CandleFrame"]):
+        """Stack frames one after another, frames must share coin, currency, period and attributes.
+
+        Args:
+            frames: frames to concatenate, at least one is required
+
+        Returns:
+            a new frame holding every row of input frames
+
+        Raises:
+            ValueError: if the input list is empty
+        """
+        if not frames:
+            raise ValueError("Empty frames list.")
+        return cls(
+            coin=frames[0].coin,
+            currency=frames[0].currency,
+            period=frames[0].period,
+            columns={
+                name: np.concatenate([frame.columns[name] for frame in frames])
+                for name in frames[0].columns
+            },
+        )
+
+    def has_attributes(self, attributes: Iterable[str]) -> bool:
+        """Check every attribute is held by the frame."""
+        return all(name in self.columns for name in attributes)
+
+    def require_attributes(
+        self, attributes: Iterable[str] = AVAILABLE_ATTRIBUTES
+    ) -> None:
+        """Check every attribute is held by the frame before it is written, e.g. to a dataset file.
+
+        Raises:
+            ValueError: if an attribute is missing, as in frames loaded with a column projection
+        """
+        missing = [name for name in attributes if name not in self.columns]
+        if missing:
+            raise ValueError(
+                f"Frame misses attributes {missing}, frames loaded with a column projection can't be written."
+            )
+
+    def project(self, attributes: Iterable[str]) -> "CandleFrame":
+        """Get a frame holding some of the attributes of this one, columns are shared.
+
+        Args:
+            attributes: attributes to keep, see `get_projected_attributes`
+
+        Returns:
+            this frame if it holds no other attribute, a frame with the attributes otherwise
+        """
+        attributes = set(attributes)
+        if set(self.columns) <= attributes:
+            return self
+        return CandleFrame(
+            coin=self.coin,
+            currency=self.currency,
+            period=self.period,
+            columns={
+                name: values
+                for name, values in self.columns.items()
+                if name in attributes
+            },
+        )
+
+    def is_sorted(self) -> bool:
+        """Check open times are strictly increasing."""
+        return bool(np.all(np.diff(self.open_time) > 0))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build a dataframe with the csv columns layout, times are datetime64 views on the frame."""
+        return pd.DataFrame(
+            {
+                "coin": self.coin.value,
+                "currency": self.currency.value,
+                "period": self.period.timeframe,
+            }
+            | {
+                name: self.columns[name].view("datetime64[ns]")
+                if name in TIME_ATTRIBUTES
+                else self.columns[name]
+                for name in CSV_COLUMNS[len(PAIR_ATTRIBUTES) :]
+            },
+            index=pd.RangeIndex(len(self)),
+            copy=False,
+        )
+
+    def row(self, index: int) -> dict:
+        """Get the attributes of a single candle as python objects."""
+        return {
+            name: epoch_to_datetimes(values[index : index + 1])[0]
+            if name in TIME_ATTRIBUTES
+            else values[index].item()
+            for name, values in self.columns.items()
+        }
+
+    def rows(self) -> list[dict]:
+        """Get the attributes of every candle as python objects."""
+        values = {
+            name: epoch_to_datetimes(values)
+            if name in TIME_ATTRIBUTES
+            else values.tolist()
+            for name, values in self.columns.items()
+        }
+        return [dict(zip(values, row)) for row in zip(*values.values())]
+
+
+def find_gaps(frame: CandleFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Find the holes of a frame from the deltas between consecutive open times.
+
+    Args:
+        frame: candles sorted by open time
+
+    Returns:
+        open time of the first missing candle of each gap, and open time of the candle ending it
+    """
+    period = pd.Timedelta(frame.period.to_timedelta()).value
+    open_times = frame.open_time
+    holes = np.flatnonzero(open_times[1:] - open_times[:-1] > period)
+    return open_times[holes] + period, open_times[holes + 1]
+
+
+SANITIZE_RULES = (
+    "missing_values",
+    "inconsistent_prices",
+    "inconsistent_times",
+    "zero_volume",
+    "duplicated",
+)
+
+
+@dataclass
+class SanitizeReport:
+    """Number of candles removed by each sanitizing rule, and of candles moved back in order.
+
+    A candle is only counted by the first rule it breaks, in the order of `SANITIZE_RULES`.
+
+    Attributes:
+        missing_values: candles with a NaN value or a missing open / close time
+        inconsistent_prices: candles whose open or close is not between low and high
+        inconsistent_times: candles closed before they open, or with a high / low time out of the candle
+        zero_volume: candles with volume of 0
+        duplicated: candles opened at the same time as a previous valid candle
+        unsorted: kept candles opened before a previous kept candle, moved rather than removed
+    """
+
+    missing_values: int = 0
+    inconsistent_prices: int = 0
+    inconsistent_times: int = 0
+    zero_volume: int = 0
+    duplicated: int = 0
+    unsorted: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of candles removed."""
+        return sum(getattr(self, rule) for rule in SANITIZE_RULES)
+
+
+def sanitize_frame(
+    frame: CandleFrame, rules: Iterable[str] = ("zero_volume", "duplicated")
+) -> CandleFrame:
+    """Remove invalid candles from a frame, rows are sorted by open time.
+
+    Invalid candles are by default :
+        - duplicated candles, the first occurrence of an open time is kept
+        - candles with volume of 0.
+
+    Args:
+        frame: raw candles frame
+        rules: names of the rules of `SANITIZE_RULES` to check
+
+    Returns:
+        filtered frame
+    """
+    return check_frame(frame, rules=rules)[0]
+
+
+def check_frame(
+    frame: CandleFrame,
+    rules: Iterable[str] = SANITIZE_RULES,
+    attributes: Iterable[str] | None = None,
+) -> tuple[CandleFrame, SanitizeReport]:
+    """Remove candles breaking sanitizing rules, every rule is checked at once over the arrays.
+
+    Candles are sorted by open time, duplicates are searched among candles following every other rule.
+    Rules are only checked over the attributes held by the frame, e.g. prices are not checked on a frame
+    without open prices. Checking a fixed set of attributes, e.g. `CHECKED_ATTRIBUTES`, keeps the same
+    candles whatever other attributes the frame holds.
+
+    Args:
+        frame: raw candles frame
+        rules: names of the rules of `SANITIZE_RULES` to check
+        attributes: attributes checked by the rules, None for every attribute of the frame
+
+    Returns:
+        filtered frame, and the number of candles removed by each rule or moved back in order
+
+    Raises:
+        ValueError: if a rule is unknown
+    """
+    rules = set(rules)
+    if rules - set(SANITIZE_RULES):
+        raise ValueError(
+            f"Unknown sanitizing rules {sorted(rules - set(SANITIZE_RULES))}."
+        )
+
+    columns = frame.columns
+    if attributes is not None:
+        attributes = set(attributes)
+        columns = {
+            name: values for name, values in columns.items() if name in attributes
+        }
+    counts = {}
+    valid = np.ones(len(frame), dtype=bool)
+    for rule, find_broken in _SANITIZE_CHECKS.items():
+        if rule in rules and all(
+            name in columns for name in _SANITIZE_ATTRIBUTES.get(rule, ())
+        ):
+            broken = valid & find_broken(columns)
+            counts[rule] = int(np.count_nonzero(broken))
+            valid &= ~broken
+
+    indexes = np.flatnonzero(valid)
+    open_times = frame.open_time[indexes]
+    is_unsorted = bool(np.any(open_times[1:] < open_times[:-1]))
+    if is_unsorted:
+        order = np.argsort(open_times, kind="stable")
+        indexes, open_times = indexes[order], open_times[order]
+    if "duplicated" in rules:
+        first_occurrences = np.append(True, open_times[1:] != open_times[:-1])
+        first_occurrences = first_occurrences[: len(open_times)]
+        counts["duplicated"] = int(np.count_nonzero(~first_occurrences))
+        indexes = indexes[first_occurrences]
+    if is_unsorted:
+        kept_open_times = frame.open_time[np.sort(indexes)]
+        counts["unsorted"] = int(
+            np.count_nonzero(
+                kept_open_times[1:] < np.maximum.accumulate(kept_open_times)[:-1]
+            )
+        )
+
+    if len(indexes) == len(frame) and np.all(indexes[1:] > indexes[:-1]):
+        return frame, SanitizeReport(**counts)  # nothing removed nor moved
+    return frame[indexes], SanitizeReport(**counts)
+
+
+def _find_missing_values(columns: dict[str, np.ndarray]) -> np.ndarray:
+    missing = (columns["open_time"] == NAT) | (columns["close_time"] == NAT)
+    for name in FLOAT_ATTRIBUTES:
+        if name in columns:
+            missing |= np.isnan(columns[name])
+    return missing
+
+
+def _find_inconsistent_prices(columns: dict[str, np.ndarray]) -> np.ndarray:
+    return (columns["low"] > np.minimum(columns["open"], columns["close"])) | (
+        columns["high"] < np.maximum(columns["open"], columns["close"])
+    )
+
+
+def _find_inconsistent_times(columns: dict[str, np.ndarray]) -> np.ndarray:
+    inconsistent = columns["close_time"] <= columns["open_time"]
+    for name in ("high_time", "low_time"):
+        if name not in columns:
+            continue
+        inconsistent |= (columns[name] != NAT) & (
+            (columns[name] < columns["open_time"])
+            | (columns[name] > columns["close_time"])
+        )
+    return inconsistent
+
+
+def _find_zero_volume(columns: dict[str, np.ndarray]) -> np.ndarray:
+    return ~(columns["volume"] > 0)
+
+
+_SANITIZE_CHECKS = {
+    "missing_values": _find_missing_values,
+    "inconsistent_prices": _find_inconsistent_prices,
+    "inconsistent_times": _find_inconsistent_times,
+    "zero_volume": _find_zero_volume,
+}
+
+# rules skipped on frames without these attributes
+_SANITIZE_ATTRIBUTES = {
+    "inconsistent_prices": ("open", "high", "low", "close"),
+    "zero_volume": ("volume",),
+}
+
+
+def save_frame(
+    frame: CandleFrame, filename: Path, chunk_size: int = SAVE_CHUNK_SIZE
+) -> None:
+    """Write a frame to a csv file, one row per candle.
+
+    Large frames are streamed by chunks, the output is the same as writing every row at once.
+
+    Args:
+        frame: candles to be saved
+        filename: csv file to dump candles
+        chunk_size: number of rows converted at once, must be a multiple of pandas csv block size
+
+    Raises:
+        ValueError: if the frame misses attributes, see `CandleFrame.require_attributes`
+    """
+    frame.require_attributes()
+    with open(filename, "w", newline="", encoding="utf-8") as file:
+        for start in range(0, len(frame), chunk_size):
+            frame[start : start + chunk_size].to_dataframe().to_csv(
+                file, index=False, header=start == 0
+            )
+
+
+def update_csv_file(frame: CandleFrame, filename: Path) -> CandleFrame:
+    """Merge new candles into a csv file, new candles replace existing ones with the same open time.
+
+    The file is written next to its destination then moved, readers never see a partial file.
+
+    Args:
+        frame: new candles
+        filename: csv file to update, created if it does not exist
+
+    Returns:
+        every candle stored in the updated file
+    """
+    if filename.is_file():
+        frame = CandleFrame.concat([frame, load_frame_from_file(filename)])
+    _, indexes = np.unique(frame.open_time, return_index=True)
+    frame = frame[indexes]
+    with atomic_write(filename) as tmp_filename:
+        save_frame(frame, tmp_filename)
+    return frame
+
+
+def load_frame_from_file(
+    filename: Path,
+    engine: Literal["c", "pyarrow"] = "c",
+    attributes: Iterable[str] = AVAILABLE_ATTRIBUTES,
+) -> CandleFrame:
+    """Build a frame from file data without creating any candle object.
+
+    Only pair and requested attributes columns are parsed, with explicit dtypes.
+    Rows are sorted by open time and duplicated open times are dropped.
+
+    Args:
+        filename: path to file containing candles infos
+        engine: 'c' parses with pandas, 'pyarrow' parses with pyarrow's multithreaded reader
+        attributes: attributes to parse, other columns are skipped by the parser
+
+    Returns:
+        a frame holding file candles
+    """
+    attributes = tuple(attributes)
+    if engine == "pyarrow":
+        pair, columns = _read_csv_with_pyarrow(filename, attributes=attributes)
+    else:
+        pair, columns = _read_csv_with_pandas(filename, attributes=attributes)
+
+    if pair is None:
+        return CandleFrame.empty(
+            coin=Coin.default_coin(),
+            currency=Coin.default_currency(),
+            period=Period(timeframe="1m"),
+            attributes=attributes,
+        )
+
+    _, indexes = np.unique(columns["open_time"], return_index=True)
+    return CandleFrame(
+        coin=Coin[pair[0]],
+        currency=Coin[pair[1]],
+        period=Period(timeframe=pair[2]),
+        columns={name: values[indexes] for name, values in columns.items()},
+    )
+
+
+def _read_csv_with_pandas(
+    filename: Path, attributes: tuple[str, ...] = AVAILABLE_ATTRIBUTES
+) -> tuple[tuple[str, str, str] | None, dict[str, np.ndarray]]:
+    """Parse a candles csv file into arrays.
+
+    Missing values detection is disabled, empty times are parsed as NaT by numpy.
+
+    Args:
+        filename: path to file containing candles infos
+        attributes: attributes to parse
+
+    Returns:
+        the (coin, currency, period) values of the first row, None if the file is empty
+        candles attributes as arrays
+    """
+    df = pd.read_csv(
+        filename,
+        usecols=[*PAIR_ATTRIBUTES, *attributes],
+        dtype={
+            name: str if name in TIME_ATTRIBUTES else ATTRIBUTES_DTYPES[name]
+            for name in attributes
+        }
+        | {name: str for name in PAIR_ATTRIBUTES},
+        keep_default_na=False,
+    )
+    pair = None if df.empty else tuple(df.loc[0, list(PAIR_ATTRIBUTES)])
+    columns = {
+        name: df[name].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        if name in TIME_ATTRIBUTES
+        else df[name].to_numpy()
+        for name in attributes
+    }
+    return pair, columns
+
+
+def _read_csv_with_pyarrow(
+    filename: Path, attributes: tuple[str, ...] = AVAILABLE_ATTRIBUTES
+) -> tuple[tuple[str, str, str] | None, dict[str, np.ndarray]]:
+    """Parse a candles csv file into arrays with pyarrow.
+
+    Args:
+        filename: path to file containing candles infos
+        attributes: attributes to parse
+
+    Returns:
+        the (coin, currency, period) values of the first row, None if the file is empty
+        candles attributes as arrays
+    """
+    column_types = {name: pa.string() for name in PAIR_ATTRIBUTES} | {
+        name: pa.timestamp("ns")
+        if name in TIME_ATTRIBUTES
+        else pa.from_numpy_dtype(ATTRIBUTES_DTYPES[name])
+        for name in attributes
+    }
+    table = csv.read_csv(
+        filename,
+        convert_options=csv.ConvertOptions(
+            column_types=column_types, include_columns=list(column_types)
+        ),
+    )
+    pair = (
+        None
+        if table.num_rows == 0
+        else tuple(table.column(name)[0].as_py() for name in PAIR_ATTRIBUTES)
+    )
+    columns = {
+        name: table.column(name).to_numpy().astype(ATTRIBUTES_DTYPES[name])
+        for name in attributes
+    }
+    return pair, columns
+
+
+def convert_frame_to_period(frame: CandleFrame, target_period: Period) -> CandleFrame:
+    """Merge close candles into 'bigger' ones.
+
+    A new candle starts at the open time of the first candle not merged yet and is closed by the first candle
+    whose close time reaches its theoretical close time. Candles after the last closed one are dropped.
+
+    Args:
+        frame: candles of any order
+        target_period: period of every new candle
+
+    Returns:
+        a frame with candles of the target period
+
+    Raises:
+        ValueError: if the frame period is lower than target period (e.g. convert "4h" to "1h" is impossible)
+    """
+    if frame.period.to_timedelta() > target_period.to_timedelta():
+        raise ValueError("Cannot convert candles to lower timeframe.")
+
+    if not frame.is_sorted():
+        frame = frame[np.argsort(frame.open_time, kind="stable")]
+
+    resampler = FrameResampler(target_period=target_period)
+    converted = resampler.update(frame)
+    resampler.close()
+    return converted
+
+
+class FrameResampler:
+    """Merge frames streamed in open time order into candles of a bigger period.
+
+    Candles of the last merged candle may be spread over several frames (e.g. a "3d" candle over daily files),
+    they are kept until a frame closes it.
+
+    Aggregations are computed with segment reductions over arrays, merged candles keep:
+        - open / open time of their first candle, close / close time of their last candle
+        - highest high / lowest low, and the open time of the first candle reaching them as high / low time
+        - sums of volumes and number of trades
+
+    Only the attributes held by frames are merged, high and low times need high and low prices.
+
+    Attributes:
+        target_period: period of every new candle
+    """
+
+    def __init__(self, target_period: Period):
+        self.target_period = target_period
+        self._pending: CandleFrame | None = None
+        self._last_open_time: int | None = None
+
+    def update(self, frame: CandleFrame) -> CandleFrame:
+        """Merge the candles of a new frame with the candles kept from previous ones.
+
+        Args:
+            frame: candles sorted by open time, opened after candles of previous frames
+
+        Returns:
+            merged candles closed by this frame
+
+        Raises:
+            ValueError: if the frame period is lower than target period
+        """
+        if frame.period.to_timedelta() > self.target_period.to_timedelta():
+            raise ValueError("Cannot convert candles to lower timeframe.")
+
+        if frame.period.to_timedelta() == self.target_period.to_timedelta():
+            return frame
+
+        if self._last_open_time is not None:  # candles already merged are skipped
+            frame = frame[frame.open_time > self._last_open_time]
+
+        if not len(frame):
+            return CandleFrame.empty(
+                coin=frame.coin,
+                currency=frame.currency,
+                period=self.target_period,
+                attributes=frame.columns,
+            )
+
+        self._last_open_time = frame.open_time[-1]
+        if self._pending is not None:
+            frame = CandleFrame.concat([self._pending, frame])
+            self._pending = None
+
+        starts, start = _find_bucket_starts(
+            close_times=frame.columns["close_time"],
+            theoretical_close_times=frame.open_time
+            + pd.Timedelta(self.target_period.to_timedelta()).value,
+        )
+        if start != len(frame):
+            self._pending = frame[start:]
+        if not len(starts):
+            return CandleFrame.empty(
+                coin=frame.coin,
+                currency=frame.currency,
+                period=self.target_period,
+                attributes=frame.columns,
+            )
+        return self._merge_buckets(frame[:start], starts=starts)
+
+    def close(self) -> None:
+        """Drop candles that could not be merged, no frame will close them."""
+        if self._pending is not None:
+            logger.debug("Last candle could not be closed, won't be kept.")
+        self._pending = None
+
+    def _merge_buckets(self, frame: CandleFrame, starts: np.ndarray) -> CandleFrame:
+        """Merge consecutive candles starting at each of `starts` until the next one."""
+        size = len(frame)
+        lasts = np.append(starts[1:], size) - 1
+        lengths = lasts - starts + 1
+        indexes = np.arange(size)
+
+        def _first_index_of(values: np.ndarray, reduced: np.ndarray) -> np.ndarray:
+            """Index of the first element of each segment equal to its reduced value."""
+            return np.minimum.reduceat(
+                np.where(values == np.repeat(reduced, lengths), indexes, size), starts
+            )
+
+        merged = {
+            "open": lambda: frame.columns["open"][starts],
+            "high": lambda: np.maximum.reduceat(frame.columns["high"], starts),
+            "low": lambda: np.minimum.reduceat(frame.columns["low"], starts),
+            "close": lambda: frame.columns["close"][lasts],
+            "open_time": lambda: frame.open_time[starts],
+            "high_time": lambda: frame.open_time[
+                _first_index_of(frame.columns["high"], columns["high"])
+            ],
+            "low_time": lambda: frame.open_time[
+                _first_index_of(frame.columns["low"], columns["low"])
+            ],
+            "close_time": lambda: frame.columns["close_time"][lasts],
+        }
+        columns = {}
+        for name in AVAILABLE_ATTRIBUTES:  # prices are merged before their times
+            if name not in frame.columns:
+                continue
+            columns[name] = (
+                merged[name]()
+                if name in merged
+                else np.add.reduceat(frame.columns[name], starts)
+            )
+        return CandleFrame(
+            coin=frame.coin,
+            currency=frame.currency,
+            period=self.target_period,
+            columns=columns,
+        )
+
+
+def _find_bucket_starts(
+    close_times: np.ndarray, theoretical_close_times: np.ndarray
+) -> tuple[np.ndarray, int]:
+    """Find the first candle of every merged candle.
+
+    A merged candle opened by candle `ii` is closed by the first candle whose close time reaches
+    `theoretical_close_times[ii]`, the next one opens right after. Bucket starts are guessed a window at a time
+    assuming every bucket has the length of the previous one, guesses are checked at once and the window
+    grows while they are right, so a gap only costs a few searches.
+
+    Args:
+        close_times: close times of candles sorted by open time
+        theoretical_close_times: close time of a merged candle opened by each candle
+
+    Returns:
+        indexes of candles opening a merged candle, and the index of the first candle not merged
+    """
+    size = len(close_times)
+    starts = []
+    start, step, window = 0, 1, 1
+    while start < size:
+        candidates = start + step * np.arange(window)
+        candidates = candidates[candidates < size]
+        nexts = (
+            np.maximum(
+                close_times.searchsorted(theoretical_close_times[candidates]),
+                candidates,
+            )
+            + 1
+        )
+        # candidates[:nb_valid + 1] are bucket starts, each closing right before the next candidate
+        nb_valid = np.argmin(np.append(nexts[:-1] == candidates[1:], False))
+        if nexts[nb_valid] > size:  # last bucket is not closed
+            starts.append(candidates[:nb_valid])
+            start = candidates[nb_valid]
+            break
+        starts.append(candidates[: nb_valid + 1])
+        step = nexts[nb_valid] - candidates[nb_valid]
+        start = nexts[nb_valid]
+        window = window * 2 if nb_valid == len(candidates) - 1 else 1
+    return np.concatenate(starts), int(start)
@@ -0,0 +1,238 @@
+import datetime
+import io
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from athena.core.candle_frame import (
+    AVAILABLE_ATTRIBUTES,
+    CandleFrame,
+    check_frame,
+    datetimes_to_epoch,
+)
+from athena.core.files import atomic_write
+from athena.core.types import Coin, Period
+
+COLUMN_STORE_VERSION = 1
+HEADER_FILENAME = "header.json"
+
+
+class ColumnStoreHeader(BaseModel):
+    """Description of a column store, written after its columns.
+
+    Columns may hold more rows than `nb_candles` after an interrupted append, extra rows are ignored.
+    Each rewrite of the store writes its columns in files of a new generation, the header points readers to the
+    files of the current one.
+
+    Attributes:
+        version: layout version of the store
+        coin: the base coin
+        currency: the currency used to trade the coin
+        timeframe: period of the stored candles
+        nb_candles: number of candles stored in each column
+        generation: number of rewrites of the store, suffix of its column files
+    """
+
+    version: int = COLUMN_STORE_VERSION
+    coin: str
+    currency: str
+    timeframe: str
+    nb_candles: int
+    generation: int = 0
+
+    @classmethod
+    def load(cls, path: Path):
+        """Read the header of a column store, None if the store does not exist yet."""
+        if not (path / HEADER_FILENAME).is_file():
+            return None
+        return cls.model_validate_json((path / HEADER_FILENAME).read_text())
+
+    def save(self, path: Path) -> None:
+        """Write the header of a column store, readers never see a partial file."""
+        with atomic_write(path / HEADER_FILENAME) as tmp_filename:
+            tmp_filename.write_text(self.model_dump_json(indent=2))
+
+
+def save_frame_to_column_store(frame: CandleFrame, path: Path) -> None:
+    """Write candles as one `.npy` file per attribute, replacing any existing store.
+
+    Columns are written as files of a new generation next to the stored ones, then the header switches readers
+    to them at once, so readers never mix columns of both stores. Files of the previous generation are kept for
+    readers that just read the old header, older ones are removed.
+
+    Args:
+        frame: sanitized candles sorted by open time
+        path: directory of the store
+
+    Raises:
+        ValueError: if the frame misses attributes, see `CandleFrame.require_attributes`
+    """
+    frame.require_attributes()
+    path.mkdir(parents=True, exist_ok=True)
+    previous = ColumnStoreHeader.load(path)
+    generation = 0 if previous is None else previous.generation + 1
+    for name in AVAILABLE_ATTRIBUTES:
+        with atomic_write(
+            _get_column_filename(path, name=name, generation=generation)
+        ) as tmp_filename:
+            with open(tmp_filename, "wb") as file:  # np.save appends .npy to names
+                np.save(file, np.ascontiguousarray(frame.columns[name]))
+    ColumnStoreHeader(
+        coin=frame.coin.value,
+        currency=frame.currency.value,
+        timeframe=frame.period.timeframe,
+        nb_candles=len(frame),
+        generation=generation,
+    ).save(path)
+    if previous is not None and previous.generation:
+        for name in AVAILABLE_ATTRIBUTES:
+            _get_column_filename(
+                path, name=name, generation=previous.generation - 1
+            ).unlink(missing_ok=True)
+
+
+def append_frame_to_column_store(frame: CandleFrame, path: Path) -> int:
+    """Extend a column store with new candles, the store is created if it does not exist.
+
+    Candles opened after the last stored one are appended at the end of each column file.
+    Older candles can't be appended, the store is then rewritten with every candle, new candles replacing
+    stored ones with the same open time.
+
+    Args:
+        frame: new candles
+        path: directory of the store
+
+    Returns:
+        the number of candles stored after the update
+
+    Raises:
+        ValueError: if candles don't match the stored pair and period, or miss attributes
+    """
+    frame.require_attributes()
+    frame = check_frame(frame)[0]
+    header = ColumnStoreHeader.load(path)
+    if header is None:
+        save_frame_to_column_store(frame, path)
+        return len(frame)
+    if not len(frame):
+        return header.nb_candles
+    if (
+        frame.coin.value != header.coin
+        or frame.currency.value != header.currency
+        or frame.period.timeframe != header.timeframe
+    ):
+        raise ValueError(
+            f"Can't append {frame.coin.value}/{frame.currency.value} {frame.period.timeframe} candles "
+            f"to a {header.coin}/{header.currency} {header.timeframe} store."
+        )
+
+    stored = load_frame_from_column_store(path)
+    if header.nb_candles and frame.open_time[0] <= stored.open_time[-1]:
+        merged = CandleFrame.concat([frame, stored])
+        _, indexes = np.unique(merged.open_time, return_index=True)
+        merged = merged[indexes]
+        del stored  # release memory maps before replacing files
+        save_frame_to_column_store(merged, path)
+        return len(merged)
+
+    del stored
+    for name in AVAILABLE_ATTRIBUTES:
+        _append_to_npy(
+            _get_column_filename(path, name=name, generation=header.generation),
+            values=frame.columns[name],
+            nb_stored=header.nb_candles,
+        )
+    header.nb_candles += len(frame)
+    header.save(path)
+    return header.nb_candles
+
+
+def load_frame_from_column_store(
+    path: Path,
+    from_date: datetime.datetime | None = None,
+    to_date: datetime.datetime | None = None,
+    attributes: Iterable[str] = AVAILABLE_ATTRIBUTES,
+) -> CandleFrame:
+    """Map the columns of a store in memory, nothing is read until values are accessed.
+
+    Columns are read-only views of the files, processes loading the same store share the page cache.
+
+    Args:
+        path: directory of the store
+        from_date: keep candles opened at or after this date
+        to_date: keep candles opened before this date
+        attributes: attributes to map, files of other attributes are not opened
+
+    Returns:
+        a frame holding the selected candles
+
+    Raises:
+        ValueError: if the store does not exist or has an unknown version
+    """
+    header = ColumnStoreHeader.load(path)
+    if header is None:
+        raise ValueError(f"No column store found at {path}")
+    if header.version != COLUMN_STORE_VERSION:
+        raise ValueError(
+            f"Unsupported column store version {header.version}, expected {COLUMN_STORE_VERSION}"
+        )
+
+    columns = {
+        name: np.load(
+            _get_column_filename(path, name=name, generation=header.generation),
+            mmap_mode="r",
+        )[: header.nb_candles]
+        for name in attributes
+    }
+    start, stop = 0, header.nb_candles
+    if from_date is not None:
+        start = np.searchsorted(
+            columns["open_time"], datetimes_to_epoch([from_date])[0], "left"
+        )
+    if to_date is not None:
+        stop = np.searchsorted(
+            columns["open_time"], datetimes_to_epoch([to_date])[0], "left"
+        )
+    return CandleFrame(
+        coin=Coin[header.coin],
+        currency=Coin[header.currency],
+        period=Period(timeframe=header.timeframe),
+        columns={name: values[start:stop] for name, values in columns.items()},
+    )
+
+
+def _get_column_filename(path: Path, name: str, generation: int) -> Path:
+    """Get the file of a column at a generation of the store, the first one has no suffix."""
+    return path / (f"{name}.npy" if not generation else f"{name}.{generation}.npy")
+
+
+def _append_to_npy(filename: Path, values: np.ndarray, nb_stored: int) -> None:
+    """Write values after the first stored rows of a 1d `.npy` file and grow its shape in place.
+
+    `np.save` pads headers so the shape can grow without moving the data.
+    """
+    with open(filename, "r+b") as fp:
+        version = np.lib.format.read_magic(fp)
+        if version != (1, 0):
+            raise ValueError(f"Unsupported npy version {version} for {filename}")
+        _, _, dtype = np.lib.format.read_array_header_1_0(fp)
+        data_offset = fp.tell()
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header,
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (nb_stored + len(values),),
+            },
+        )
+        if header.tell() != data_offset:
+            raise ValueError(f"Header of {filename} can't grow in place")
+
+        fp.seek(data_offset + nb_stored * dtype.itemsize)
+        fp.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        fp.truncate()
+        fp.seek(0)
+        fp.write(header.getvalue())
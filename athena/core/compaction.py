@@ -0,0 +1,123 @@
+import datetime
+import logging
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from athena.core.candle_frame import CandleFrame, load_frame_from_file, save_frame
+from athena.core.dataset_layout import (
+    COMPACTION_FREQUENCIES,
+    DATE_FORMATS,
+    CompactionFrequency,
+    DatasetLayout,
+    StorageFormat,
+    get_file_frequency,
+)
+from athena.core.files import atomic_write
+from athena.core.manifest import DatasetManifest
+from athena.core.parquet import load_frame_from_parquet, save_frame_to_parquet
+from athena.core.types import Coin, Period
+
+logger = logging.getLogger(__name__)
+
+
+def compact_dataset(
+    dataset: DatasetLayout,
+    coin: Coin,
+    currency: Coin,
+    period: Period,
+    frequency: CompactionFrequency,
+    output_format: StorageFormat | None = None,
+) -> list[Path]:
+    """Merge the files of a dataset into a file per month or per year.
+
+    Compaction is lossless, every candle of replaced files is kept, candles stored in several files are only
+    kept once. Each compacted file is written next to its destination then moved, the manifest is saved
+    with it and replaced files are removed afterwards. An interrupted compaction leaves duplicated candles
+    that readers drop, running it again merges them. Files already compacted at the frequency are left untouched.
+
+    Args:
+        dataset: dataset layout object
+        coin: the base coin
+        currency: the currency used to trade the coin
+        period: candles period
+        frequency: 'month' or 'year'
+        output_format: format of compacted files, defaults to the dataset storage format. Another format
+            rewrites every file of the dataset in it, yearly files stay yearly, and the dataset is then read
+            with that storage format.
+
+    Returns:
+        written compacted files
+
+    Raises:
+        ValueError: if files can't be compacted at the frequency in the output format
+    """
+    output_format = output_format or dataset.storage_format
+    if frequency == "day" or frequency not in COMPACTION_FREQUENCIES.get(
+        output_format, ()
+    ):
+        raise ValueError(
+            f"Can't compact files by {frequency} in the '{output_format}' format."
+        )
+
+    dataset_path = dataset.get_dataset_path(coin=coin, currency=currency, period=period)
+    manifest = DatasetManifest.load(dataset_path)
+    if not manifest.entries:
+        manifest = DatasetManifest.build(dataset_path)
+
+    groups: dict[Path, list[Path]] = defaultdict(list)
+    for filename in sorted(dataset_path.glob("fluctuations_*")):
+        if filename.suffix not in (f".{dataset.storage_format}", f".{output_format}"):
+            continue
+        file_frequency = get_file_frequency(filename)
+        if file_frequency is None:
+            continue  # unknown file
+        group_frequency = frequency
+        if file_frequency == "year" and frequency != "year":
+            if filename.suffix == f".{output_format}":
+                continue  # already compacted at a larger frequency
+            group_frequency = "year"  # only rewritten in the output format
+        date = datetime.datetime.strptime(
+            filename.stem.removeprefix("fluctuations_"), DATE_FORMATS[file_frequency]
+        )
+        groups[
+            dataset_path
+            / f"fluctuations_{date.strftime(DATE_FORMATS[group_frequency])}.{output_format}"
+        ].append(filename)
+
+    compacted_files = []
+    for compacted_file, filenames in groups.items():
+        if filenames == [compacted_file]:
+            continue
+        frame = CandleFrame.concat([_load_file(filename) for filename in filenames])
+        _, indexes = np.unique(frame.open_time, return_index=True)
+        frame = frame[indexes]
+        _save_file(frame, compacted_file)
+        replaced_files = [
+            filename for filename in filenames if filename != compacted_file
+        ]
+        for filename in replaced_files:
+            manifest.remove(filename)
+        manifest.update(filename=compacted_file, frame=frame)
+        manifest.save(dataset_path)
+        for filename in replaced_files:
+            filename.unlink()
+        compacted_files.append(compacted_file)
+        logger.info(f"Compacted {len(filenames)} files into {compacted_file.name}")
+    return compacted_files
+
+
+def _load_file(filename: Path) -> CandleFrame:
+    if filename.suffix == ".parquet":
+        return load_frame_from_parquet(filename)
+    return load_frame_from_file(filename)
+
+
+def _save_file(frame: CandleFrame, filename: Path) -> None:
+    """Write candles in a dataset file, readers never see a partial file."""
+    if filename.suffix == ".parquet":
+        save_frame_to_parquet(frame, filename)
+    else:
+        with atomic_write(filename) as tmp_filename:
+            save_frame(frame, tmp_filename)
@@ -1,27 +1,141 @@
 import datetime
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Literal
 
 from athena.core.types import Coin, Period
 
+StorageFormat = Literal["csv", "parquet", "sqlite"]
+
+CompactionFrequency = Literal["day", "month", "year"]
+
+SQLITE_FILENAME = "candles.sqlite"
+
+DATE_FORMATS: dict[CompactionFrequency, str] = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+
+# file frequencies of each storage format, the default one first
+COMPACTION_FREQUENCIES: dict[str, tuple[CompactionFrequency, ...]] = {
+    "csv": ("day", "month", "year"),
+    "parquet": ("month", "year"),
+}
+
 
 class DatasetLayout:
     """Interface to manage locations of useful files.
 
-    Candles are saved in files by their day
+    With the 'csv' storage format, candles are saved in files by their day.
+    With the 'parquet' storage format, candles are saved in files by their month.
+    Both can be compacted into files holding a month or a year of candles, see `localize_file`.
+    With the 'sqlite' storage format, candles are saved in a single database with a table per pair and period.
     """
 
-    def __init__(self, root_dir: Path):
+    def __init__(self, root_dir: Path, storage_format: StorageFormat = "csv"):
         self.root_dir = root_dir
+        self.storage_format = storage_format
 
     def get_dataset_path(self, coin: Coin, currency: Coin, period: Period) -> Path:
         """Get the path to pair-related market data."""
         return self.root_dir / f"{coin.value}_{currency.value}_{period.timeframe}"
 
+    def get_column_store_path(self, coin: Coin, currency: Coin, period: Period) -> Path:
+        """Get the path to the memory-mappable column store of pair-related market data."""
+        return self.get_dataset_path(coin, currency, period) / "columns"
+
+    def get_pyramid_path(self, coin: Coin, currency: Coin, level: Period) -> Path:
+        """Get the path to the candles of the raw pair-related market data cached at a coarser period.
+
+        Cached levels are kept under the raw dataset, apart from datasets downloaded at the same period.
+        """
+        return (
+            self.get_dataset_path(coin, currency, Period(timeframe="1m"))
+            / "levels"
+            / level.timeframe
+        )
+
+    def get_database_path(self) -> Path:
+        """Get the path to the candles database of the 'sqlite' storage format."""
+        return self.root_dir / SQLITE_FILENAME
+
     def localize_file(
         self, coin: Coin, currency: Coin, period: Period, date: datetime.datetime
-    ):
-        date_str = date.strftime("%Y-%m-%d")
+    ) -> Path:
+        """Get the file holding the candles of a day.
+
+        Days may have been merged into monthly or yearly files by `athena compact`, the first existing file
+        among the default one and the compacted ones is returned. New days go to the default file.
+        """
+        if self.storage_format == "sqlite":
+            return self.get_database_path()
+        candidates = [
+            self.get_compacted_file(coin, currency, period, date, frequency)
+            for frequency in COMPACTION_FREQUENCIES[self.storage_format]
+        ]
+        return next(
+            (filename for filename in candidates if filename.is_file()), candidates[0]
+        )
+
+    def localize_files(
+        self,
+        coin: Coin,
+        currency: Coin,
+        period: Period,
+        dates: Iterable[datetime.datetime],
+    ) -> list[Path]:
+        """Get the existing files holding the candles of days, ordered by date.
+
+        Each day is resolved as by `localize_file`, from a single listing of the dataset directory.
+        """
+        if self.storage_format == "sqlite":
+            database_path = self.get_database_path()
+            return [database_path] if database_path.is_file() else []
+        dataset_path = self.get_dataset_path(coin, currency, period)
+        if not dataset_path.is_dir():
+            return []
+        existing_names = {filename.name for filename in dataset_path.iterdir()}
+        filenames = {}
+        for date in dates:
+            for frequency in COMPACTION_FREQUENCIES[self.storage_format]:
+                filename = self.get_compacted_file(
+                    coin, currency, period, date, frequency
+                )
+                if filename.name in existing_names:
+                    filenames[filename] = None
+                    break
+        return list(filenames)
+
+    def get_compacted_file(
+        self,
+        coin: Coin,
+        currency: Coin,
+        period: Period,
+        date: datetime.datetime,
+        frequency: CompactionFrequency,
+    ) -> Path:
+        """Get the file holding the candles of a date when files are merged by day, month or year."""
         return (
             self.get_dataset_path(coin, currency, period)
-            / f"fluctuations_{date_str}.csv"
+            / f"fluctuations_{date.strftime(DATE_FORMATS[frequency])}.{self.storage_format}"
         )
+
+    def is_compacted(self, filename: Path) -> bool:
+        """Check if a dataset file holds more candles than the default layout puts in a file."""
+        return (
+            get_file_frequency(filename)
+            != COMPACTION_FREQUENCIES[self.storage_format][0]
+        )
+
+
+def get_file_frequency(filename: Path) -> CompactionFrequency | None:
+    """Get the time range of candles held by a dataset file from its name, None if the name is unknown."""
+    date_str = filename.stem.removeprefix("fluctuations_")
+    for frequency, date_format in DATE_FORMATS.items():
+        try:
+            datetime.datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+        return frequency
+    return None
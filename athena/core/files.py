@@ -0,0 +1,25 @@
+import contextlib
+from collections.abc import Iterator
+from pathlib import Path
+
+
+@contextlib.contextmanager
+def atomic_write(filename: Path) -> Iterator[Path]:
+    """Write a file next to its destination then move it, readers never see a partial file.
+
+    The parent directory is created if needed, the temporary file is removed if writing it fails.
+
+    Args:
+        filename: destination file
+
+    Yields:
+        the temporary file to write
+    """
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp_filename = filename.with_name(filename.name + ".tmp")
+    try:
+        yield tmp_filename
+    except BaseException:
+        tmp_filename.unlink(missing_ok=True)
+        raise
+    tmp_filename.replace(filename)
@@ -1,15 +1,59 @@
 import datetime
 import logging
-from functools import cached_property
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property, partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    field_serializer,
+    field_validator,
+    model_validator,
+)
 
-from athena.core.candle import sanitize_candles, load_candles_from_file
+from athena.core.candle import (
+    candles_to_frame,
+    frame_to_candle,
+    frame_to_candles,
+)
+from athena.core.candle_frame import (
+    ATTRIBUTES_DTYPES,
+    AVAILABLE_ATTRIBUTES,
+    CHECKED_ATTRIBUTES,
+    FLOAT_ATTRIBUTES,
+    TIME_ATTRIBUTES,
+    CandleFrame,
+    FrameResampler,
+    Precision,
+    check_frame,
+    convert_frame_to_period,
+    datetimes_to_epoch,
+    get_projected_attributes,
+    load_frame_from_file,
+    sanitize_frame,
+    save_frame,
+)
 from athena.core.market_entities import Candle
+from athena.core.column_store import load_frame_from_column_store
 from athena.core.dataset_layout import DatasetLayout
+from athena.core.ipc import (
+    SharedFrame,
+    SharedFrameHandle,
+    load_frame_from_ipc,
+    save_frame_to_ipc,
+)
+from athena.core.manifest import DatasetManifest
+from athena.core.parquet import load_frame_from_parquet
+from athena.core.pyramid import CandlePyramid, get_pyramid_level
+from athena.core.sqlite import iter_frames_from_sqlite
 from athena.core.types import Coin, Period
 
 logger = logging.getLogger(__name__)
@@ -18,115 +62,296 @@ logger = logging.getLogger(__name__)
 class Fluctuations(BaseModel):
     """Collection of candles.
 
+    Candles are stored column-wise in a `CandleFrame`, `Candle` objects are only built on demand.
+    New candles can be added in place with `append` and `extend`, e.g. from a live feed.
+
     Attributes:
-        candles: list of candles ordered by their open_time attribute.
+        frame: candles attributes as arrays, ordered by their open_time attribute.
         coin: the base coin
         currency: the currency used to trade the coin
         period: candles time period (e.g. '1d' or '4h')
+        provenance: origin of candles trusted without validation (e.g. 'split 3 train'), None if validated,
+            neither compared nor serialized
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True, use_enum_values=True)
 
-    candles: list[Candle]
+    frame: CandleFrame
     coin: Coin
     currency: Coin
     period: Period
+    provenance: str | None = Field(default=None, exclude=True)
+
+    # columns with spare capacity once candles were added, the frame is a view on them
+    _buffers: dict[str, np.ndarray] | None = PrivateAttr(default=None)
 
     @field_validator("period", mode="before")
     @classmethod
     def parse_period(cls, value: Any) -> Period:
         return Period(timeframe=value) if isinstance(value, str) else value
 
+    @field_serializer("frame")
+    def serialize_frame(self, frame: CandleFrame) -> dict[str, list]:
+        return {name: values.tolist() for name, values in frame.columns.items()}
+
+    @cached_property
+    def candles(self) -> list[Candle]:
+        """Candles ordered by their open_time attribute, built from the frame."""
+        return frame_to_candles(self.frame)
+
     @cached_property
-    def candles_mapping(self):
-        """Maps a date to a candle's index with the same `open_time`."""
-        return {candle.open_time: ii for ii, candle in enumerate(self.candles)}
+    def time_index(self) -> pd.DatetimeIndex:
+        """Candles open times, shares memory with the frame."""
+        return pd.DatetimeIndex(
+            self.frame.open_time.view("datetime64[ns]"), copy=False, name="open_time"
+        )
 
     def __len__(self):
-        return len(self.candles)
+        return len(self.frame)
+
+    def __eq__(self, other):
+        """Fluctuations are equal when they hold the same candles, provenance and spare capacity are ignored."""
+        if not isinstance(other, Fluctuations):
+            return NotImplemented
+        return (
+            self.frame == other.frame
+            and Coin(self.coin) == Coin(other.coin)
+            and Coin(self.currency) == Coin(other.currency)
+            and self.period == other.period
+        )
+
+    def __copy__(self):
+        """Shallow copy, e.g. `model_copy`, candles added later to the copy or this instance are not shared."""
+        copied = super().__copy__()
+        copied._buffers = None
+        if "candles" in copied.__dict__:
+            copied.__dict__["candles"] = list(copied.__dict__["candles"])
+        return copied
 
     @classmethod
     def from_candles(cls, candles: list[Candle]):
-        sanitized_candles = sanitize_candles(candles)
-        sorted_candles = sorted(sanitized_candles, key=lambda candle: candle.open_time)
+        return cls.from_frame(sanitize_frame(candles_to_frame(candles)))
+
+    @classmethod
+    def from_frame(cls, frame: CandleFrame):
         return cls(
-            candles=sorted_candles,
-            period=candles[0].period if candles else Period(timeframe="1m"),
-            coin=candles[0].coin if candles else Coin.default_coin(),
-            currency=candles[0].currency if candles else Coin.default_currency(),
+            frame=frame,
+            period=frame.period,
+            coin=frame.coin,
+            currency=frame.currency,
         )
 
-    @model_validator(mode="after")
-    def check_candles_period_coin_currency_unicity(self):
-        """Check candles have the same period."""
-        if not self.candles:
-            return
-        periods, coins, currencies = list(
-            zip(
-                *[
-                    (candle.period, candle.coin, candle.currency)
-                    for candle in self.candles
-                ]
-            )
-        )
+    @classmethod
+    def from_trusted_frame(cls, frame: CandleFrame, provenance: str):
+        """Build fluctuations from a frame already sorted and sanitized, nothing is validated.
 
-        if len(set(periods)) > 1:
-            periods_str = (
-                "[" + ", ".join([period.timeframe for period in set(periods)]) + "]"
-            )
-            raise ValueError(
-                f"All candles must have the same period, found {periods_str}."
-            )
+        Meant for frames derived from validated ones (loader output, slices, splits).
 
-        if len(set(coins)) > 1:
-            coins_str = "[" + ", ".join([coin.value for coin in set(coins)]) + "]"
-            raise ValueError(f"All candles must have the same coin, found {coins_str}.")
+        Args:
+            frame: sanitized candles sorted by open time
+            provenance: where the frame comes from
 
-        if len(set(currencies)) > 1:
-            currencies_str = (
-                "[" + ", ".join([coin.value for coin in set(currencies)]) + "]"
-            )
-            raise ValueError(
-                f"All candles must have the same currency, found {currencies_str}."
-            )
+        Returns:
+            fluctuations holding the frame
+        """
+        return cls.model_construct(
+            frame=frame,
+            coin=Coin(frame.coin).value,
+            currency=Coin(frame.currency).value,
+            period=frame.period,
+            provenance=provenance,
+        )
+
+    @model_validator(mode="after")
+    def check_frame_consistency(self):
+        """Check the frame matches fluctuations attributes and is ordered by open time."""
+        if (
+            self.frame.period != self.period
+            or Coin(self.frame.coin).value != Coin(self.coin).value
+            or Coin(self.frame.currency).value != Coin(self.currency).value
+        ):
+            raise ValueError("Frame period, coin and currency must match fluctuations.")
 
-        # check candle's list size equals unique indexes size
-        if len(self.candles) != len(set(self.candles_mapping.values())):
+        if not self.frame.is_sorted():
             raise ValueError("Inconsistent candles mapping.")
 
         return self
 
     def get_candle(self, open_time: datetime.datetime) -> Candle:
-        return self.candles[self.candles_mapping.get(open_time)]
+        """Get the candle opened at `open_time`.
+
+        Raises:
+            ValueError: if no candle is opened at `open_time`
+        """
+        indexes = self._find_indexes([open_time])
+        if not len(indexes):
+            raise ValueError(f"No candle opened at {open_time}.")
+        return frame_to_candle(self.frame, int(indexes[0]))
+
+    def between(
+        self, from_date: datetime.datetime, to_date: datetime.datetime
+    ) -> "Fluctuations":
+        """Get candles opened between two dates, the frame is a view on this one.
+
+        Args:
+            from_date: lower bound date, included
+            to_date: upper bound date, excluded
+
+        Returns:
+            fluctuations sharing this frame arrays
+        """
+        start, stop = np.searchsorted(
+            self.frame.open_time, datetimes_to_epoch([from_date, to_date])
+        ).tolist()
+        return Fluctuations.from_trusted_frame(
+            self.frame[start : max(start, stop)],
+            provenance=f"between {from_date} and {to_date}",
+        )
+
+    def at(self, open_times: list[datetime.datetime]) -> "Fluctuations":
+        """Get candles opened at given times, times without candle are ignored.
+
+        Args:
+            open_times: open times of the candles
+
+        Returns:
+            fluctuations holding the candles found, ordered by open time
+        """
+        return Fluctuations.from_trusted_frame(
+            self.frame[self._find_indexes(open_times)], provenance="at"
+        )
+
+    def _find_indexes(self, open_times: list[datetime.datetime]) -> np.ndarray:
+        """Get the sorted and unique indexes of candles opened at given times."""
+        epochs = np.unique(datetimes_to_epoch(open_times))
+        indexes = np.searchsorted(self.frame.open_time, epochs)
+        found = indexes < len(self)
+        found[found] = self.frame.open_time[indexes[found]] == epochs[found]
+        return indexes[found]
+
+    def append(self, candles: Candle | list[Candle]) -> None:
+        """Add candles opened after the last one in place, see `extend`."""
+        self.extend(
+            candles_to_frame([candles] if isinstance(candles, Candle) else candles)
+        )
+
+    def extend(self, frame: CandleFrame) -> None:
+        """Add candles opened after the last one in place, in amortized constant time per candle.
+
+        Columns are copied once in buffers whose capacity doubles when they are full, the frame becomes a view on
+        them. Frames and series got before are unchanged. Built candles are extended with the new candles only
+        and the time index is a new view on the buffers.
+
+        Args:
+            frame: new candles, they are sanitized and stored with the attributes and precision of the frame
+
+        Raises:
+            ValueError: if candles don't match fluctuations, miss attributes or open before the last candle
+        """
+        frame = _check_new_candles(frame, self.frame)
+        if not len(frame):
+            return
+
+        size = len(self)
+        new_size = size + len(frame)
+        if self._buffers is None or new_size > len(self._buffers["open_time"]):
+            capacity = max(2 * size, new_size)
+            buffers = {}
+            for name, values in self.frame.columns.items():
+                buffers[name] = np.empty(capacity, dtype=values.dtype)
+                buffers[name][:size] = values
+            self._buffers = buffers
+        for name, buffer in self._buffers.items():
+            buffer[size:new_size] = frame.columns[name]
+
+        self.frame = CandleFrame(
+            coin=self.frame.coin,
+            currency=self.frame.currency,
+            period=self.frame.period,
+            columns={name: buffer[:new_size] for name, buffer in self._buffers.items()},
+        )
+        self.__dict__.pop("time_index", None)
+        if "candles" in self.__dict__:
+            self.__dict__["candles"].extend(frame_to_candles(self.frame[size:]))
+
+    @property
+    def precision(self) -> Precision:
+        """Float precision of prices and volumes."""
+        return self.frame.precision
+
+    def with_precision(self, precision: Precision) -> "Fluctuations":
+        """Get fluctuations storing prices and volumes with a float precision, see `CandleFrame.with_precision`."""
+        if precision == self.precision:
+            return self
+        return self.from_trusted_frame(
+            self.frame.with_precision(precision), provenance=f"{precision} precision"
+        )
 
     def get_series(self, attribute_name: str) -> pd.Series:
-        """Get the time series of attribute `name` from candles."""
+        """Get the time series of attribute `name` from candles.
+
+        The series is indexed by candles open times and is a view on the frame, no data is copied.
+
+        Raises:
+            ValueError: if the attribute is unknown or was not loaded, see `load_from_dataset` columns
+        """
         if not Candle.is_available_attribute(attribute_name):
             raise ValueError("Trying to access unavailable attribute.")
-        return pd.Series(
-            [getattr(candle, attribute_name) for candle in self.candles],
-            index=[candle.open_time for candle in self.candles],
-        )
+        if attribute_name not in self.frame.columns:
+            raise ValueError(
+                f"Attribute `{attribute_name}` was not loaded, loaded attributes are {list(self.frame.columns)}."
+            )
+        values = self.frame.columns[attribute_name]
+        if attribute_name in TIME_ATTRIBUTES:
+            values = values.view("datetime64[ns]")
+        return pd.Series(values, index=self.time_index, copy=False)
 
     def save(self, path: Path) -> None:
         """Save fluctuations to disk.
 
-        Fluctuations are saved as a pandas dataframe where each row is a candle.
+        Fluctuations are saved as a csv file where each row is a candle, the frame is written in bulk.
         We don't need to save the period for now as it can be inferred from candles.
-        A future improvement is to create a local sql database to store candles.
+        Datasets can also be stored in a sqlite database, see `athena.core.sqlite`.
 
         Args:
             path: csv file to dump fluctuations
+
+        Raises:
+            ValueError: if fluctuations were loaded with a column projection
         """
+        self.frame.require_attributes()
         if path.is_dir():
             path = path / "fluctuations.csv"
 
-        if not self.candles:  # don't save anything
+        if not len(self):  # don't save anything
             return
 
         path.parent.mkdir(parents=True, exist_ok=True)
-        df = pd.concat([candle.to_dataframe() for candle in self.candles])
-        df.to_csv(path.as_posix(), index=False)
+        save_frame(self.frame, path)
+
+    def save_ipc(self, filename: Path) -> None:
+        """Save fluctuations as an arrow IPC file, it can be memory-mapped by `load_from_ipc`."""
+        save_frame_to_ipc(self.frame, filename)
+
+    @classmethod
+    def load_from_ipc(cls, filename: Path):
+        """Map fluctuations saved by `save_ipc`, candles are not copied nor validated again."""
+        return cls.from_trusted_frame(
+            load_frame_from_ipc(filename), provenance="load_from_ipc"
+        )
+
+    def share(self) -> SharedFrame:
+        """Publish fluctuations in shared memory, workers attach to them with `from_shared`.
+
+        Returns:
+            the published frame, its picklable `handle` is sent to workers and it must be closed by the caller
+        """
+        return SharedFrame(self.frame)
+
+    @classmethod
+    def from_shared(cls, handle: SharedFrameHandle):
+        """Attach to fluctuations published by `share` in another process, candles are not copied."""
+        return cls.from_trusted_frame(handle.attach(), provenance="from_shared")
 
     @classmethod
     def load_from_dataset(
@@ -137,9 +362,23 @@ class Fluctuations(BaseModel):
         target_period: Period = None,
         from_date: datetime.datetime | None = None,
         to_date: datetime.datetime | None = None,
+        engine: Literal["c", "pyarrow"] = "c",
+        workers: int = 1,
+        cache: bool = True,
+        precision: Precision = "float64",
+        columns: Iterable[str] | None = None,
     ):
         """Retrieve candles from a dataset interface.
 
+        Files are read and decoded concurrently when `workers` is greater than 1, then concatenated in order.
+        Candles are streamed through a single resampler, merged candles may span several files (e.g. "3d").
+        Each file is first converted to the coarsest level of the candle pyramid the target period can be
+        converted from, see `get_pyramid_level`. With `cache`, files of this level are read from the pyramid,
+        raw files are only parsed to build missing or stale levels.
+        With `columns`, only the attributes they need are kept in memory, see `get_projected_attributes`.
+        Candles are sanitized over `CHECKED_ATTRIBUTES`, read whatever the columns, so the same candles are
+        kept with or without projection.
+
         Args:
             dataset: dataset layout object
             coin: coin to be loaded
@@ -147,26 +386,610 @@ class Fluctuations(BaseModel):
             target_period: target period
             from_date: keep candles after this date, defaults to 1900-01-01
             to_date: keep candles before this date, defaults to today
+            engine: csv parser used to read csv dataset files
+            workers: number of processes reading files
+            cache: read candles from pre-aggregated levels stored next to the dataset
+            precision: float precision of prices and volumes, 'float32' halves their memory,
+                see `CandleFrame.with_precision`
+            columns: attributes read from candles (e.g. `Strategy.required_columns`), None for every attribute
 
         Returns:
             merged candles as a single fluctuations instance.
-        """
-        from_date = from_date or datetime.datetime(1900, 1, 1)
-        to_date = to_date or datetime.datetime.today()
-        dates = [
-            from_date + datetime.timedelta(days=ii)
-            for ii in range((to_date - from_date).days + 1)
-        ]
 
-        all_candles = []
-        for date in dates:
-            filename = dataset.localize_file(
-                coin=coin, currency=currency, date=date, period=Period(timeframe="1m")
+        Raises:
+            ValueError: if a column is not a candle attribute
+        """
+        attributes = get_projected_attributes(columns)
+        read_attributes = get_projected_attributes([*attributes, *CHECKED_ATTRIBUTES])
+        if dataset.storage_format == "sqlite":  # a single indexed range query
+            frames = list(
+                _resample_frames(
+                    _iter_sqlite_frames(
+                        dataset=dataset,
+                        coin=coin,
+                        currency=currency,
+                        from_date=from_date,
+                        to_date=to_date,
+                        attributes=read_attributes,
+                    ),
+                    target_period=target_period,
+                    precision=precision,
+                )
+            )
+        else:
+            filenames, from_day, to_day = _list_dataset_files(
+                dataset=dataset,
+                coin=coin,
+                currency=currency,
+                target_period=target_period,
+                from_date=from_date,
+                to_date=to_date,
+                engine=engine,
+                cache=cache,
             )
-            if filename.is_file():
-                all_candles.extend(
-                    load_candles_from_file(
-                        filename=filename, target_period=target_period
+            load_file = partial(
+                _load_dataset_file,
+                from_date=from_day,
+                to_date=to_day,
+                engine=engine,
+                attributes=read_attributes,
+                level=_get_level(target_period),
+            )
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    frames = list(
+                        _resample_frames(
+                            executor.map(
+                                load_file,
+                                filenames,
+                                chunksize=max(len(filenames) // (4 * workers), 1),
+                            ),
+                            target_period=target_period,
+                            precision=precision,
+                        )
+                    )
+            else:
+                frames = list(
+                    _resample_frames(
+                        map(load_file, filenames),
+                        target_period=target_period,
+                        precision=precision,
                     )
                 )
-        return cls.from_candles(all_candles)
+
+        if not frames:
+            return cls.from_candles([])
+        frame, report = check_frame(
+            CandleFrame.concat(frames), attributes=CHECKED_ATTRIBUTES
+        )
+        if report.total or report.unsorted:
+            logger.debug(f"Sanitized candles from dataset: {report}")
+        return cls.from_trusted_frame(
+            frame.project(attributes), provenance="load_from_dataset"
+        )
+
+    @classmethod
+    def load_from_column_store(
+        cls,
+        dataset: DatasetLayout,
+        coin: Coin,
+        currency: Coin,
+        target_period: Period | None = None,
+        from_date: datetime.datetime | None = None,
+        to_date: datetime.datetime | None = None,
+        columns: Iterable[str] | None = None,
+    ):
+        """Retrieve candles from the column store of a dataset, see `athena.core.column_store`.
+
+        Columns are memory-mapped, loading is nearly free and backtests running in parallel share the same
+        pages. Candles are only copied when converted to the target period.
+
+        Args:
+            dataset: dataset layout object
+            coin: coin to be loaded
+            currency: currency to base the coin
+            target_period: target period
+            from_date: keep candles opened at or after this date
+            to_date: keep candles opened before this date
+            columns: attributes read from candles, None for every attribute, see `load_from_dataset`
+
+        Returns:
+            stored candles as a single fluctuations instance.
+        """
+        frame = load_frame_from_column_store(
+            dataset.get_column_store_path(
+                coin=coin, currency=currency, period=Period(timeframe="1m")
+            ),
+            from_date=from_date,
+            to_date=to_date,
+            attributes=get_projected_attributes(columns),
+        )
+        if target_period is not None:
+            frame = convert_frame_to_period(frame, target_period=target_period)
+        return cls.from_trusted_frame(frame, provenance="load_from_column_store")
+
+    @classmethod
+    def iter_chunks(
+        cls,
+        dataset: DatasetLayout,
+        coin: Coin,
+        currency: Coin,
+        target_period: Period | None = None,
+        from_date: datetime.datetime | None = None,
+        to_date: datetime.datetime | None = None,
+        chunk_size: int = 100_000,
+        lookback: int = 0,
+        engine: Literal["c", "pyarrow"] = "c",
+        cache: bool = True,
+        precision: Precision = "float64",
+        columns: Iterable[str] | None = None,
+    ) -> Iterator["FluctuationsChunk"]:
+        """Stream candles from a dataset interface as chunks ordered by open time.
+
+        Files are read one at a time, so memory is bounded by the chunk size and the largest file rather than
+        the whole date range. Concatenating the new candles of every chunk gives `load_from_dataset` output.
+
+        Args:
+            dataset: dataset layout object
+            coin: coin to be loaded
+            currency: currency to base the coin
+            target_period: target period
+            from_date: keep candles after this date, defaults to 1900-01-01
+            to_date: keep candles before this date, defaults to today
+            chunk_size: number of new candles per chunk, the last chunk may be smaller
+            lookback: number of candles of the previous chunk repeated at the start of each chunk,
+                so indicators can warm up
+            engine: csv parser used to read csv dataset files
+            cache: read candles from pre-aggregated levels stored next to the dataset
+            precision: float precision of prices and volumes, see `CandleFrame.with_precision`
+            columns: attributes read from candles, None for every attribute, see `load_from_dataset`
+
+        Yields:
+            chunks of at most `chunk_size + lookback` candles
+
+        Raises:
+            ValueError: if the lookback is negative, the chunk size is not positive or a column is not a
+                candle attribute
+        """
+        if chunk_size < 1 or lookback < 0:
+            raise ValueError(
+                f"Expected a positive chunk size and lookback, got {chunk_size} and {lookback}"
+            )
+        attributes = get_projected_attributes(columns)
+        read_attributes = get_projected_attributes([*attributes, *CHECKED_ATTRIBUTES])
+        if dataset.storage_format == "sqlite":
+            raw_frames = _iter_sqlite_frames(
+                dataset=dataset,
+                coin=coin,
+                currency=currency,
+                from_date=from_date,
+                to_date=to_date,
+                attributes=read_attributes,
+            )
+        else:
+            filenames, from_day, to_day = _list_dataset_files(
+                dataset=dataset,
+                coin=coin,
+                currency=currency,
+                target_period=target_period,
+                from_date=from_date,
+                to_date=to_date,
+                engine=engine,
+                cache=cache,
+            )
+            raw_frames = (
+                _load_dataset_file(
+                    filename,
+                    from_date=from_day,
+                    to_date=to_day,
+                    engine=engine,
+                    attributes=read_attributes,
+                    level=_get_level(target_period),
+                )
+                for filename in filenames
+            )
+        frames = _resample_frames(
+            raw_frames, target_period=target_period, precision=precision
+        )
+
+        # candles not yielded yet are `pending[start:]`, frames are only concatenated when a file is read
+        pending: CandleFrame | None = None
+        start = 0
+        last_open_time = None
+        previous_tail = None
+        for frame in frames:
+            frame, report = check_frame(frame, attributes=CHECKED_ATTRIBUTES)
+            frame = frame.project(attributes)
+            if report.total or report.unsorted:
+                logger.debug(f"Sanitized candles from dataset: {report}")
+            if last_open_time is not None:  # drop candles repeated across files
+                frame = frame[
+                    np.searchsorted(frame.open_time, last_open_time, "right") :
+                ]
+            if not len(frame):
+                continue
+            last_open_time = frame.open_time[-1]
+            pending = (
+                frame
+                if pending is None or start == len(pending)
+                else CandleFrame.concat([pending[start:], frame])
+            )
+            start = 0
+
+            while len(pending) - start >= chunk_size:
+                chunk, previous_tail = _make_chunk(
+                    pending[start : start + chunk_size],
+                    previous_tail=previous_tail,
+                    lookback=lookback,
+                )
+                yield chunk
+                start += chunk_size
+
+        if pending is not None and start < len(pending):
+            yield _make_chunk(pending[start:], previous_tail=previous_tail, lookback=0)[
+                0
+            ]
+
+
+@dataclass(frozen=True)
+class FluctuationsChunk:
+    """Chunk of candles streamed by `Fluctuations.iter_chunks`.
+
+    Attributes:
+        fluctuations: candles of the chunk, starting with the lookback candles
+        lookback: number of leading candles already yielded by the previous chunk
+    """
+
+    fluctuations: Fluctuations
+    lookback: int
+
+    @property
+    def new_candles(self) -> int:
+        return len(self.fluctuations) - self.lookback
+
+
+class RollingFluctuations:
+    """Last candles of a live feed kept in fixed-capacity ring buffers.
+
+    Each column is preallocated with twice the capacity and every candle is written at its ring position and
+    at the same position in the second half, so the window of last candles is always a contiguous slice.
+    Memory and the cost of adding a candle don't depend on the number of candles received.
+
+    Frames, series and fluctuations got from the window are views on the buffers, later updates overwrite
+    them, they must be copied to be kept.
+
+    Args:
+        coin: the base coin
+        currency: the currency used to trade the coin
+        period: candles time period
+        capacity: number of last candles kept
+        attributes: attributes of kept candles, see `get_projected_attributes`
+        precision: float precision of prices and volumes
+
+    Raises:
+        ValueError: if the capacity is not positive
+    """
+
+    def __init__(
+        self,
+        coin: Coin,
+        currency: Coin,
+        period: Period,
+        capacity: int,
+        attributes: Iterable[str] = AVAILABLE_ATTRIBUTES,
+        precision: Precision = "float64",
+    ):
+        if capacity < 1:
+            raise ValueError(f"Expected a positive capacity, got {capacity}")
+        self.capacity = capacity
+        self._buffers = {
+            name: np.empty(
+                2 * capacity,
+                dtype=precision
+                if name in FLOAT_ATTRIBUTES
+                else ATTRIBUTES_DTYPES[name],
+            )
+            for name in attributes
+        }
+        self._window = CandleFrame(
+            coin=coin,
+            currency=currency,
+            period=period,
+            columns={name: buffer[:0] for name, buffer in self._buffers.items()},
+        )
+        self._nb_received = 0
+
+    @classmethod
+    def from_fluctuations(cls, fluctuations: Fluctuations, capacity: int):
+        """Start a window with the last candles of fluctuations, with their attributes and precision."""
+        rolling = cls(
+            coin=Coin(fluctuations.coin),
+            currency=Coin(fluctuations.currency),
+            period=fluctuations.period,
+            capacity=capacity,
+            attributes=fluctuations.frame.columns,
+            precision=fluctuations.precision,
+        )
+        rolling.extend(fluctuations.frame)
+        return rolling
+
+    @property
+    def frame(self) -> CandleFrame:
+        """Candles of the window ordered by open time, as views on the buffers."""
+        return self._window
+
+    @property
+    def time_index(self) -> pd.DatetimeIndex:
+        """Candles open times, shares memory with the buffers."""
+        return pd.DatetimeIndex(
+            self._window.open_time.view("datetime64[ns]"), copy=False, name="open_time"
+        )
+
+    def __len__(self):
+        return len(self._window)
+
+    def __getitem__(self, item: slice | np.ndarray | list[int]) -> CandleFrame:
+        """Select candles of the window by position, slices are views on the buffers."""
+        return self._window[item]
+
+    def to_fluctuations(self) -> Fluctuations:
+        """Get the window as fluctuations without copy, e.g. to compute strategy signals."""
+        return Fluctuations.from_trusted_frame(self._window, provenance="rolling")
+
+    def get_series(self, attribute_name: str) -> pd.Series:
+        """Get the time series of an attribute over the window, see `Fluctuations.get_series`."""
+        return self.to_fluctuations().get_series(attribute_name)
+
+    def get_candle(self, open_time: datetime.datetime) -> Candle:
+        """Get the candle of the window opened at `open_time`, see `Fluctuations.get_candle`."""
+        return self.to_fluctuations().get_candle(open_time)
+
+    def between(
+        self, from_date: datetime.datetime, to_date: datetime.datetime
+    ) -> Fluctuations:
+        """Get candles of the window opened between two dates, see `Fluctuations.between`."""
+        return self.to_fluctuations().between(from_date, to_date)
+
+    def append(self, candles: Candle | list[Candle]) -> None:
+        """Add candles opened after the last one, see `extend`."""
+        self.extend(
+            candles_to_frame([candles] if isinstance(candles, Candle) else candles)
+        )
+
+    def extend(self, frame: CandleFrame) -> None:
+        """Add candles opened after the last one, the oldest candles leave the window.
+
+        Args:
+            frame: new candles, they are sanitized and stored with the attributes and precision of the window
+
+        Raises:
+            ValueError: if candles don't match the window, miss attributes or open before the last candle
+        """
+        frame = _check_new_candles(frame, self._window)
+        frame = frame[max(len(frame) - self.capacity, 0) :]
+        if not len(frame):
+            return
+
+        positions = (self._nb_received + np.arange(len(frame))) % self.capacity
+        for name, buffer in self._buffers.items():
+            buffer[positions] = frame.columns[name]
+            buffer[positions + self.capacity] = frame.columns[name]
+        self._nb_received += len(frame)
+
+        size = min(len(self._window) + len(frame), self.capacity)
+        start = (self._nb_received - size) % self.capacity
+        self._window = CandleFrame(
+            coin=self._window.coin,
+            currency=self._window.currency,
+            period=self._window.period,
+            columns={
+                name: buffer[start : start + size]
+                for name, buffer in self._buffers.items()
+            },
+        )
+
+
+def _check_new_candles(frame: CandleFrame, stored: CandleFrame) -> CandleFrame:
+    """Sanitize candles added after stored ones, see `Fluctuations.extend`.
+
+    Raises:
+        ValueError: if candles don't match stored ones, miss attributes or open before the last stored candle
+    """
+    if (
+        frame.period != stored.period
+        or Coin(frame.coin).value != Coin(stored.coin).value
+        or Coin(frame.currency).value != Coin(stored.currency).value
+    ):
+        raise ValueError("Frame period, coin and currency must match fluctuations.")
+    if not frame.has_attributes(stored.columns):
+        raise ValueError(
+            f"Expected candles with attributes {list(stored.columns)}, found {list(frame.columns)}."
+        )
+    frame, report = check_frame(frame)
+    if report.total or report.unsorted:
+        logger.debug(f"Sanitized new candles: {report}")
+    if len(frame) and len(stored) and frame.open_time[0] <= stored.open_time[-1]:
+        raise ValueError("New candles must open after the last candle of fluctuations.")
+    return frame
+
+
+def _load_dataset_file(
+    filename: Path,
+    from_date: datetime.datetime,
+    to_date: datetime.datetime,
+    engine: Literal["c", "pyarrow"],
+    attributes: tuple[str, ...] = AVAILABLE_ATTRIBUTES,
+    level: Period | None = None,
+) -> CandleFrame:
+    """Read the candles of a dataset file.
+
+    With a level, the whole file is converted to it before candles are filtered by date, as the candle pyramid
+    does, so loading with or without cache merges candles at the same bounds. Cached level files are already
+    at the level and are kept as is.
+
+    Args:
+        filename: csv file of a day, parquet file of a month or cached level file
+        from_date: keep candles opened at or after this date
+        to_date: keep candles opened before this date
+        engine: csv parser used to read csv files
+        attributes: attributes to read
+        level: pyramid level to convert file candles to, see `get_pyramid_level`
+
+    Returns:
+        file candles as a frame
+    """
+    if filename.suffix == ".parquet" and level is None:
+        return load_frame_from_parquet(
+            filename, from_date=from_date, to_date=to_date, attributes=attributes
+        )
+    if filename.suffix == ".parquet":
+        frame = load_frame_from_parquet(filename, attributes=attributes)
+    else:
+        frame = load_frame_from_file(
+            filename=filename, engine=engine, attributes=attributes
+        )
+    if level is not None:
+        frame = convert_frame_to_period(frame, target_period=level)
+    # compacted csv and parquet files hold more days than requested
+    start, stop = np.searchsorted(
+        frame.open_time, datetimes_to_epoch([from_date, to_date]), "left"
+    )
+    return frame if (start, stop) == (0, len(frame)) else frame[start:stop]
+
+
+def _make_chunk(
+    frame: CandleFrame, previous_tail: CandleFrame | None, lookback: int
+) -> tuple[FluctuationsChunk, CandleFrame | None]:
+    """Prepend the tail of the previous chunk to new candles.
+
+    Returns:
+        the chunk and the tail of its candles to repeat in the next chunk
+    """
+    if previous_tail is not None and len(previous_tail):
+        frame = CandleFrame.concat([previous_tail, frame])
+        nb_repeated = len(previous_tail)
+    else:
+        nb_repeated = 0
+    chunk = FluctuationsChunk(
+        fluctuations=Fluctuations.from_trusted_frame(frame, provenance="iter_chunks"),
+        lookback=nb_repeated,
+    )
+    return chunk, frame[len(frame) - min(lookback, len(frame)) :]
+
+
+def _get_dataset_days(
+    from_date: datetime.datetime | None, to_date: datetime.datetime | None
+) -> list[datetime.datetime]:
+    """Get the midnight of every day of candles to load, see `Fluctuations.load_from_dataset`."""
+    from_date = from_date or datetime.datetime(1900, 1, 1)
+    to_date = to_date or datetime.datetime.today()
+    return [
+        datetime.datetime.combine(
+            (from_date + datetime.timedelta(days=ii)).date(), datetime.time()
+        )
+        for ii in range((to_date - from_date).days + 1)
+    ]
+
+
+def _iter_sqlite_frames(
+    dataset: DatasetLayout,
+    coin: Coin,
+    currency: Coin,
+    from_date: datetime.datetime | None,
+    to_date: datetime.datetime | None,
+    attributes: tuple[str, ...] = AVAILABLE_ATTRIBUTES,
+) -> Iterator[CandleFrame]:
+    """Read the candles of the days to load from the dataset database, see `Fluctuations.load_from_dataset`."""
+    dates = _get_dataset_days(from_date, to_date)
+    if not dates:
+        return iter(())
+    return iter_frames_from_sqlite(
+        dataset.get_database_path(),
+        coin=coin,
+        currency=currency,
+        period=Period(timeframe="1m"),
+        from_date=dates[0],
+        to_date=dates[-1] + datetime.timedelta(days=1),
+        attributes=attributes,
+    )
+
+
+def _list_dataset_files(
+    dataset: DatasetLayout,
+    coin: Coin,
+    currency: Coin,
+    target_period: Period | None,
+    from_date: datetime.datetime | None,
+    to_date: datetime.datetime | None,
+    engine: Literal["c", "pyarrow"],
+    cache: bool,
+) -> tuple[list[Path], datetime.datetime, datetime.datetime]:
+    """List the dataset files holding candles between two dates, see `Fluctuations.load_from_dataset`.
+
+    Returns:
+        existing files ordered by date, and the first and last days to read (last one excluded)
+    """
+    dates = _get_dataset_days(from_date, to_date)
+    if not dates:
+        return [], from_date, from_date
+
+    # parquet files hold a month of candles, only the requested days are read
+    from_day, to_day = dates[0], dates[-1] + datetime.timedelta(days=1)
+
+    dataset_path = dataset.get_dataset_path(
+        coin=coin, currency=currency, period=Period(timeframe="1m")
+    )
+    manifest = DatasetManifest.load(dataset_path)
+    if manifest.entries:
+        filenames = [
+            filename
+            for filename in manifest.get_files(
+                dataset_path, from_date=from_day, to_date=to_day
+            )
+            if filename.suffix == f".{dataset.storage_format}" and filename.is_file()
+        ]
+    else:  # datasets without manifest are resolved from a listing of their directory
+        filenames = dataset.localize_files(
+            coin=coin, currency=currency, period=Period(timeframe="1m"), dates=dates
+        )
+
+    level = _get_level(target_period)
+    if cache and level is not None:
+        filenames = CandlePyramid(
+            dataset=dataset, coin=coin, currency=currency, engine=engine
+        ).get_level_files(filenames, level=level)
+    return filenames, from_day, to_day
+
+
+def _get_level(target_period: Period | None) -> Period | None:
+    """Get the pyramid level dataset files are converted to before candles are merged across files."""
+    return None if target_period is None else get_pyramid_level(target_period)
+
+
+def _resample_frames(
+    frames: Iterable[CandleFrame],
+    target_period: Period | None,
+    precision: Precision = "float64",
+) -> Iterator[CandleFrame]:
+    """Convert frames of consecutive dataset files to the target period.
+
+    Candles are aggregated in float64 before prices and volumes are converted to the precision.
+
+    Args:
+        frames: frames ordered by open time, consumed as they are read
+        target_period: aggregate candles to this period
+        precision: float precision of yielded prices and volumes
+
+    Yields:
+        non-empty converted frames
+    """
+    resampler = (
+        None if target_period is None else FrameResampler(target_period=target_period)
+    )
+    for frame in frames:
+        if resampler is not None:
+            frame = resampler.update(frame)
+        if len(frame):
+            yield frame.with_precision(precision)
+    if resampler is not None:
+        resampler.close()
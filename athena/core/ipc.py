@@ -0,0 +1,179 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import get_args
+
+import pyarrow as pa
+
+from athena.core.candle_frame import (
+    ATTRIBUTES_DTYPES,
+    AVAILABLE_ATTRIBUTES,
+    FLOAT_ATTRIBUTES,
+    REQUIRED_ATTRIBUTES,
+    CandleFrame,
+    Precision,
+)
+from athena.core.files import atomic_write
+from athena.core.types import Coin, Period
+
+# shared memory blocks attached by this process, they must outlive frames built on them
+_ATTACHED_MEMORIES: dict[str, SharedMemory] = {}
+
+
+def get_ipc_schema(
+    precision: Precision = "float64", attributes: Iterable[str] = AVAILABLE_ATTRIBUTES
+) -> pa.Schema:
+    """Get the IPC schema of frames, prices and volumes keep their float precision.
+
+    Times are kept as int64 epochs, arrow buffers are then plain numpy arrays without nulls.
+
+    Args:
+        precision: float precision of prices and volumes
+        attributes: attributes held by frames, e.g. loaded with a column projection
+    """
+    attributes = set(attributes)
+    return pa.schema(
+        [
+            pa.field(
+                name,
+                pa.from_numpy_dtype(precision if name in FLOAT_ATTRIBUTES else dtype),
+            )
+            for name, dtype in ATTRIBUTES_DTYPES.items()
+            if name in attributes
+        ]
+    )
+
+
+def frame_to_ipc_table(frame: CandleFrame) -> pa.Table:
+    """Convert a frame to an arrow table without copy, the pair is stored in the schema metadata.
+
+    Only the attributes held by the frame are stored.
+    """
+    schema = get_ipc_schema(frame.precision, attributes=frame.columns)
+    return pa.table(
+        {name: frame.columns[name] for name in schema.names},
+        schema=schema.with_metadata(
+            {
+                "coin": frame.coin.value,
+                "currency": frame.currency.value,
+                "period": frame.period.timeframe,
+            }
+        ),
+    )
+
+
+def ipc_table_to_frame(table: pa.Table) -> CandleFrame:
+    """Convert an arrow table written by `frame_to_ipc_table` back to a frame, columns share arrow buffers.
+
+    Raises:
+        ValueError: if the table doesn't match the IPC schema of any precision
+    """
+    if not set(REQUIRED_ATTRIBUTES) <= set(table.column_names) or not any(
+        table.schema.equals(get_ipc_schema(precision, attributes=table.column_names))
+        for precision in get_args(Precision)
+    ):
+        raise ValueError(f"Unexpected candles schema: {table.schema}")
+    metadata = {
+        key.decode(): value.decode() for key, value in table.schema.metadata.items()
+    }
+    table = table.combine_chunks()
+    return CandleFrame(
+        coin=Coin[metadata["coin"]],
+        currency=Coin[metadata["currency"]],
+        period=Period(timeframe=metadata["period"]),
+        columns={
+            name: table.column(name).chunk(0).to_numpy(zero_copy_only=True)
+            if table.num_rows
+            else table.column(name).to_numpy()
+            for name in table.column_names
+        },
+    )
+
+
+def save_frame_to_ipc(frame: CandleFrame, filename: Path) -> None:
+    """Write a frame to an arrow IPC file, readers never see a partial file.
+
+    Args:
+        frame: candles to save
+        filename: destination file
+    """
+    table = frame_to_ipc_table(frame)
+    with atomic_write(filename) as tmp_filename:
+        with pa.OSFile(str(tmp_filename), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def load_frame_from_ipc(filename: Path) -> CandleFrame:
+    """Map an arrow IPC file in memory, columns are read-only views of the file.
+
+    Args:
+        filename: file written by `save_frame_to_ipc`
+
+    Returns:
+        a frame holding every candle of the file
+    """
+    with pa.memory_map(str(filename), "r") as source:
+        return ipc_table_to_frame(pa.ipc.open_file(source).read_all())
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable reference to a frame published in shared memory, see `SharedFrame`.
+
+    Attributes:
+        name: name of the shared memory block
+        size: number of bytes of the IPC stream in the block
+    """
+
+    name: str
+    size: int
+
+    def attach(self) -> CandleFrame:
+        """Map the published frame in this process without copying its columns.
+
+        The block stays attached until the process exits, columns are read-only.
+        """
+        if self.name not in _ATTACHED_MEMORIES:
+            _ATTACHED_MEMORIES[self.name] = SharedMemory(name=self.name)
+        buffer = pa.py_buffer(_ATTACHED_MEMORIES[self.name].buf)[: self.size]
+        return ipc_table_to_frame(pa.ipc.open_stream(buffer).read_all())
+
+
+class SharedFrame:
+    """Frame published once in POSIX shared memory as an arrow IPC stream.
+
+    Workers receive the small `handle` and attach to the same memory instead of unpickling candles.
+    The publisher owns the block, it is released by `close` or when leaving the context manager.
+
+    Args:
+        frame: candles to publish
+    """
+
+    def __init__(self, frame: CandleFrame):
+        table = frame_to_ipc_table(frame)
+        size = _get_ipc_stream_size(table)
+        self._memory = SharedMemory(create=True, size=max(size, 1))
+        sink = pa.FixedSizeBufferWriter(pa.py_buffer(self._memory.buf))
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.handle = SharedFrameHandle(name=self._memory.name, size=size)
+
+    def close(self) -> None:
+        """Release the shared memory block, frames attached by workers must not be used anymore."""
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _get_ipc_stream_size(table: pa.Table) -> int:
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.size()
@@ -0,0 +1,210 @@
+import datetime
+import math
+from collections.abc import Iterable
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from athena.core.candle_frame import (
+    CandleFrame,
+    Precision,
+    get_projected_attributes,
+)
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.types import Coin, Period
+
+LAZY_BLOCK_DAYS = 30
+
+
+class LazyFluctuations:
+    """Handle on the candles of a dataset between two dates, candles are only loaded when accessed.
+
+    The days of the range are split in blocks, a block is loaded with `Fluctuations.load_from_dataset` the first
+    time one of its candles or columns is accessed, then kept in memory. Accessing a column a block was not
+    loaded with reloads the block with it.
+
+    Blocks start at the first day of the range and hold a whole number of target periods, candles merged block
+    by block are the ones merged by loading the whole range at once, unless a gap of the dataset crosses a
+    block bound. Candles kept in a block don't depend on the columns it is loaded with, so positions counted
+    on blocks loaded with few columns are positions in blocks reloaded with more.
+
+    Counting candles (`len`, and so `create_ccpv_splits`) loads every block of the range up front, with
+    open and close times and volumes only, as the number of sanitized and merged candles is not recorded in
+    dataset manifests.
+
+    Args:
+        dataset: dataset layout object
+        coin: coin to be loaded
+        currency: currency to base the coin
+        from_date: first day of candles
+        to_date: last day of candles, included
+        target_period: target period
+        engine: csv parser used to read csv dataset files
+        cache: read candles from pre-aggregated levels stored next to the dataset
+        precision: float precision of prices and volumes, see `CandleFrame.with_precision`
+        block_days: approximate number of days of each block
+
+    Raises:
+        ValueError: if the dates are not ordered
+    """
+
+    def __init__(
+        self,
+        dataset: DatasetLayout,
+        coin: Coin,
+        currency: Coin,
+        from_date: datetime.datetime,
+        to_date: datetime.datetime,
+        target_period: Period | None = None,
+        engine: Literal["c", "pyarrow"] = "c",
+        cache: bool = True,
+        precision: Precision = "float64",
+        block_days: int = LAZY_BLOCK_DAYS,
+    ):
+        if to_date < from_date:
+            raise ValueError(f"Expected ordered dates, got {from_date} and {to_date}")
+        self.dataset = dataset
+        self.coin = coin
+        self.currency = currency
+        self.period = target_period or Period(timeframe="1m")
+        self.target_period = target_period
+        self.engine = engine
+        self.cache = cache
+        self.precision = precision
+
+        # dataset files are read by whole days, as in `Fluctuations.load_from_dataset`
+        self.from_day = datetime.datetime.combine(from_date.date(), datetime.time())
+        self.to_day = datetime.datetime.combine(
+            to_date.date(), datetime.time()
+        ) + datetime.timedelta(days=1)
+        period_days = _get_period_days(self.period)
+        self.block_length = datetime.timedelta(
+            days=period_days * max(round(block_days / period_days), 1)
+        )
+        self._blocks: dict[int, CandleFrame] = {}
+
+    @property
+    def nb_blocks(self) -> int:
+        return math.ceil((self.to_day - self.from_day) / self.block_length)
+
+    @property
+    def loaded_blocks(self) -> list[int]:
+        """Indexes of blocks held in memory."""
+        return sorted(self._blocks)
+
+    def __len__(self):
+        """Count candles of the range, blocks not loaded yet are loaded with open and close times and volumes."""
+        return int(self._get_offsets()[-1])
+
+    def between(
+        self,
+        from_date: datetime.datetime,
+        to_date: datetime.datetime,
+        columns: Iterable[str] | None = None,
+    ) -> Fluctuations:
+        """Get candles opened between two dates, only blocks overlapping the dates are loaded.
+
+        Args:
+            from_date: lower bound date, included
+            to_date: upper bound date, excluded
+            columns: attributes read from candles, None for every attribute
+
+        Returns:
+            candles of the range opened between the dates
+        """
+        first = max(math.floor((from_date - self.from_day) / self.block_length), 0)
+        last = min(
+            math.ceil((to_date - self.from_day) / self.block_length), self.nb_blocks
+        )
+        frames = [
+            self._get_block(index, columns=columns) for index in range(first, last)
+        ]
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return Fluctuations.from_candles([])
+        return Fluctuations.from_trusted_frame(
+            CandleFrame.concat(frames), provenance="lazy"
+        ).between(from_date, to_date)
+
+    def take(
+        self, indexes: Iterable[int], columns: Iterable[str] | None = None
+    ) -> Fluctuations:
+        """Get candles at sorted positions of the range, only blocks holding them are loaded with the columns.
+
+        Args:
+            indexes: sorted positions of candles in the range
+            columns: attributes read from candles, None for every attribute
+
+        Returns:
+            candles at the positions
+        """
+        indexes = np.asarray(indexes, dtype=np.int64)
+        offsets = self._get_offsets()
+        frames = []
+        for index in np.unique(np.searchsorted(offsets, indexes, "right") - 1):
+            selected = indexes[
+                (indexes >= offsets[index]) & (indexes < offsets[index + 1])
+            ]
+            frames.append(
+                self._get_block(index, columns=columns)[selected - offsets[index]]
+            )
+        if not frames:
+            return Fluctuations.from_candles([])
+        return Fluctuations.from_trusted_frame(
+            CandleFrame.concat(frames), provenance="lazy take"
+        )
+
+    def get_series(self, attribute_name: str) -> pd.Series:
+        """Get the time series of an attribute over the whole range, other columns are not loaded."""
+        return self.materialize(columns=[attribute_name]).get_series(attribute_name)
+
+    def materialize(self, columns: Iterable[str] | None = None) -> Fluctuations:
+        """Load every block of the range, see `between`."""
+        return self.between(self.from_day, self.to_day, columns=columns)
+
+    def _get_offsets(self) -> np.ndarray:
+        """Get the position of the first candle of each block in the range, followed by the number of candles.
+
+        Blocks are counted as loaded with any columns, see `Fluctuations.load_from_dataset` sanitizing.
+        """
+        return np.cumsum(
+            [0]
+            + [
+                len(self._get_block(index, columns=()))
+                for index in range(self.nb_blocks)
+            ]
+        )
+
+    def _get_block(self, index: int, columns: Iterable[str] | None) -> CandleFrame:
+        """Get the candles of a block, loaded with at least the attributes needed by the columns."""
+        attributes = get_projected_attributes(columns)
+        frame = self._blocks.get(index)
+        if frame is not None and frame.has_attributes(attributes):
+            return frame
+        if frame is not None:  # reload with the columns already loaded
+            attributes = get_projected_attributes([*frame.columns, *attributes])
+
+        from_date = self.from_day + index * self.block_length
+        to_date = min(from_date + self.block_length, self.to_day)
+        self._blocks[index] = Fluctuations.load_from_dataset(
+            dataset=self.dataset,
+            coin=self.coin,
+            currency=self.currency,
+            target_period=self.target_period,
+            from_date=from_date,
+            to_date=to_date - datetime.timedelta(days=1),
+            engine=self.engine,
+            cache=self.cache,
+            precision=self.precision,
+            columns=attributes,
+        ).frame
+        return self._blocks[index]
+
+
+def _get_period_days(period: Period) -> int:
+    """Get the smallest number of days holding a whole number of periods (e.g. 1 for '4h', 5 for '5h')."""
+    day = datetime.timedelta(days=1) // datetime.timedelta(microseconds=1)
+    period = period.to_timedelta() // datetime.timedelta(microseconds=1)
+    return math.lcm(day, period) // day
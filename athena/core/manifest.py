@@ -0,0 +1,212 @@
+import datetime
+import hashlib
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel, computed_field
+
+from athena.core.candle_frame import (
+    CandleFrame,
+    epoch_to_datetimes,
+    find_gaps,
+    load_frame_from_file,
+    sanitize_frame,
+)
+from athena.core.files import atomic_write
+from athena.core.parquet import load_frame_from_parquet
+from athena.core.types import Period
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class ManifestEntry(BaseModel):
+    """Summary of a dataset file.
+
+    Attributes:
+        filename: name of the file in the dataset directory
+        nb_candles: number of candles stored in the file
+        first_open_time: open time of the earliest candle
+        last_open_time: open time of the latest candle
+        checksum: sha256 of the file content
+        days: number of candles of each day covered by the file
+        source_checksum: sha256 of the file the candles were aggregated from, cached levels only
+        timeframe: period of the candles stored in the file
+        gaps: missing candles inside the file, as [first missing open time, next open time) ranges
+    """
+
+    filename: str
+    nb_candles: int
+    first_open_time: datetime.datetime
+    last_open_time: datetime.datetime
+    checksum: str
+    days: dict[datetime.date, int]
+    source_checksum: str | None = None
+    timeframe: str = "1m"
+    gaps: list[tuple[datetime.datetime, datetime.datetime]] = []
+
+
+class DatasetManifest(BaseModel):
+    """Index of the files of a dataset directory, readers don't need to probe every day.
+
+    Attributes:
+        entries: file summaries mapped by their filename
+    """
+
+    entries: dict[str, ManifestEntry] = {}
+
+    @computed_field
+    @property
+    def date_ranges(self) -> list[tuple[datetime.date, datetime.date]]:
+        """Contiguous ranges of days with candles, bounds are included."""
+        days = sorted({day for entry in self.entries.values() for day in entry.days})
+        date_ranges = []
+        for day in days:
+            if date_ranges and (day - date_ranges[-1][1]) == datetime.timedelta(days=1):
+                date_ranges[-1] = (date_ranges[-1][0], day)
+            else:
+                date_ranges.append((day, day))
+        return date_ranges
+
+    @classmethod
+    def load(cls, path: Path):
+        """Read the manifest of a dataset directory, empty if it does not exist yet."""
+        if not (path / MANIFEST_FILENAME).is_file():
+            return cls()
+        return cls.model_validate_json((path / MANIFEST_FILENAME).read_text())
+
+    @classmethod
+    def build(cls, path: Path):
+        """Create the manifest of a dataset directory from the files it contains."""
+        manifest = cls()
+        for filename in sorted(path.glob("fluctuations_*")):
+            if filename.suffix == ".parquet":
+                frame = load_frame_from_parquet(filename)
+            else:
+                frame = sanitize_frame(load_frame_from_file(filename))
+            manifest.update(filename=filename, frame=frame)
+        return manifest
+
+    def save(self, path: Path) -> None:
+        """Write the manifest in a dataset directory, readers never see a partial file."""
+        with atomic_write(path / MANIFEST_FILENAME) as tmp_filename:
+            tmp_filename.write_text(self.model_dump_json(indent=2))
+
+    def update(
+        self, filename: Path, frame: CandleFrame, source_checksum: str | None = None
+    ) -> None:
+        """Record the candles just written to a dataset file.
+
+        Args:
+            filename: the dataset file
+            frame: every candle stored in the file
+            source_checksum: sha256 of the file the candles were aggregated from
+        """
+        if not len(frame):
+            self.remove(filename)
+            return
+        days, counts = np.unique(
+            frame.open_time.view("datetime64[ns]").astype("datetime64[D]"),
+            return_counts=True,
+        )
+        first_open_time, last_open_time = epoch_to_datetimes(frame.open_time[[0, -1]])
+        gap_starts, gap_ends = find_gaps(frame)
+        self.entries[filename.name] = ManifestEntry(
+            filename=filename.name,
+            nb_candles=len(frame),
+            first_open_time=first_open_time,
+            last_open_time=last_open_time,
+            checksum=compute_checksum(filename),
+            days={day.item(): int(count) for day, count in zip(days, counts.tolist())},
+            source_checksum=source_checksum,
+            timeframe=frame.period.timeframe,
+            gaps=list(
+                zip(epoch_to_datetimes(gap_starts), epoch_to_datetimes(gap_ends))
+            ),
+        )
+
+    def remove(self, filename: Path) -> None:
+        """Forget a dataset file."""
+        self.entries.pop(filename.name, None)
+
+    def count_candles(self, filename: Path, day: datetime.date) -> int:
+        """Number of candles of a day recorded for a dataset file."""
+        entry = self.entries.get(filename.name)
+        return 0 if entry is None else entry.days.get(day, 0)
+
+    def get_coverage(self, day: datetime.date) -> float:
+        """Ratio of the candles of a day stored in the dataset, 1 when no candle is missing."""
+        return sum(
+            entry.days.get(day, 0)
+            * Period(timeframe=entry.timeframe).to_timedelta()
+            / datetime.timedelta(days=1)
+            for entry in self.entries.values()
+        )
+
+    def get_gaps(
+        self, from_date: datetime.datetime, to_date: datetime.datetime
+    ) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        """List missing candles between two dates, without reading dataset files.
+
+        Gaps inside files come from the entries, gaps between files and at the bounds are deduced from file ranges.
+
+        Args:
+            from_date: lower bound date, included
+            to_date: upper bound date, excluded
+
+        Returns:
+            [first missing open time, next open time) ranges, ordered by date
+        """
+        gaps = []
+        next_open_time = from_date  # open time of the next expected candle
+        for entry in sorted(
+            self.entries.values(), key=lambda entry: entry.first_open_time
+        ):
+            if entry.last_open_time < from_date or entry.first_open_time >= to_date:
+                continue
+            for gap_start, gap_end in [
+                (next_open_time, entry.first_open_time),
+                *entry.gaps,
+            ]:
+                gap_start, gap_end = (
+                    max(gap_start, next_open_time),
+                    min(gap_end, to_date),
+                )
+                if gap_start < gap_end:
+                    gaps.append((gap_start, gap_end))
+            next_open_time = max(
+                next_open_time,
+                entry.last_open_time + Period(timeframe=entry.timeframe).to_timedelta(),
+            )
+        if next_open_time < to_date:
+            gaps.append((next_open_time, to_date))
+        return gaps
+
+    def get_files(
+        self, path: Path, from_date: datetime.datetime, to_date: datetime.datetime
+    ) -> list[Path]:
+        """List dataset files holding candles opened between two dates.
+
+        Args:
+            path: the dataset directory
+            from_date: lower bound date, included
+            to_date: upper bound date, excluded
+
+        Returns:
+            files ordered by their first candle open time
+        """
+        return [
+            path / entry.filename
+            for entry in sorted(
+                self.entries.values(), key=lambda entry: entry.first_open_time
+            )
+            if entry.last_open_time >= from_date and entry.first_open_time < to_date
+        ]
+
+
+def compute_checksum(filename: Path) -> str:
+    """Compute the sha256 of a file by blocks."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,147 @@
+import datetime
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from athena.core.candle_frame import (
+    ATTRIBUTES_DTYPES,
+    AVAILABLE_ATTRIBUTES,
+    FLOAT_ATTRIBUTES,
+    TIME_ATTRIBUTES,
+    CandleFrame,
+    Precision,
+)
+from athena.core.files import atomic_write
+from athena.core.types import Coin, Period
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def get_arrow_schema(precision: Precision = "float64") -> pa.Schema:
+    """Get the typed arrow schema of frames, prices and volumes keep their float precision."""
+    return pa.schema(
+        [
+            pa.field(
+                name,
+                pa.timestamp("ns")
+                if name in TIME_ATTRIBUTES
+                else pa.from_numpy_dtype(
+                    precision if name in FLOAT_ATTRIBUTES else dtype
+                ),
+            )
+            for name, dtype in ATTRIBUTES_DTYPES.items()
+        ]
+    )
+
+
+def frame_to_arrow_table(frame: CandleFrame) -> pa.Table:
+    """Convert a frame to a typed arrow table, the pair is stored in the schema metadata."""
+    schema = get_arrow_schema(frame.precision)
+    return pa.table(
+        {
+            name: frame.columns[name].view("datetime64[ns]")
+            if name in TIME_ATTRIBUTES
+            else frame.columns[name]
+            for name in schema.names
+        },
+        schema=schema.with_metadata(
+            {
+                "coin": frame.coin.value,
+                "currency": frame.currency.value,
+                "period": frame.period.timeframe,
+            }
+        ),
+    )
+
+
+def arrow_table_to_frame(table: pa.Table) -> CandleFrame:
+    """Convert an arrow table written by `frame_to_arrow_table`, or some of its columns, back to a frame."""
+    metadata = {
+        key.decode(): value.decode() for key, value in table.schema.metadata.items()
+    }
+    return CandleFrame(
+        coin=Coin[metadata["coin"]],
+        currency=Coin[metadata["currency"]],
+        period=Period(timeframe=metadata["period"]),
+        columns={
+            name: table.column(name).to_numpy()
+            if name in FLOAT_ATTRIBUTES
+            else table.column(name).to_numpy().astype(ATTRIBUTES_DTYPES[name])
+            for name in table.column_names
+        },
+    )
+
+
+def save_frame_to_parquet(frame: CandleFrame, filename: Path) -> None:
+    """Write a frame to a compressed parquet file, with one row group per day of candles.
+
+    Row groups hold `open_time` statistics, readers can skip days they don't need.
+    The file is written next to its destination then moved, readers never see a partial file.
+
+    Args:
+        frame: candles sorted by open time
+        filename: parquet file to dump candles
+
+    Raises:
+        ValueError: if the frame misses attributes, see `CandleFrame.require_attributes`
+    """
+    frame.require_attributes()
+    with atomic_write(filename) as tmp_filename:
+        pq.write_table(
+            frame_to_arrow_table(frame),
+            tmp_filename,
+            row_group_size=max(
+                int(datetime.timedelta(days=1) / frame.period.to_timedelta()), 1
+            ),
+            compression=PARQUET_COMPRESSION,
+        )
+
+
+def update_parquet_file(frame: CandleFrame, filename: Path) -> CandleFrame:
+    """Merge new candles into a parquet file, new candles replace existing ones with the same open time.
+
+    Args:
+        frame: new candles
+        filename: parquet file to update, created if it does not exist
+
+    Returns:
+        every candle stored in the updated file
+    """
+    if filename.is_file():
+        frame = CandleFrame.concat([frame, load_frame_from_parquet(filename)])
+    _, indexes = np.unique(frame.open_time, return_index=True)
+    frame = frame[indexes]
+    save_frame_to_parquet(frame, filename)
+    return frame
+
+
+def load_frame_from_parquet(
+    filename: Path,
+    from_date: datetime.datetime | None = None,
+    to_date: datetime.datetime | None = None,
+    attributes: Iterable[str] = AVAILABLE_ATTRIBUTES,
+) -> CandleFrame:
+    """Read candles from a parquet file, only row groups overlapping the dates are read.
+
+    Files are stored column-wise, columns of other attributes are not read nor decompressed.
+
+    Args:
+        filename: parquet file containing candles
+        from_date: keep candles opened at or after this date
+        to_date: keep candles opened before this date
+        attributes: attributes to read
+
+    Returns:
+        a frame holding the selected candles
+    """
+    filters = []
+    if from_date is not None:
+        filters.append(("open_time", ">=", from_date))
+    if to_date is not None:
+        filters.append(("open_time", "<", to_date))
+    return arrow_table_to_frame(
+        pq.read_table(filename, columns=list(attributes), filters=filters or None)
+    )
@@ -0,0 +1,147 @@
+from pathlib import Path
+from typing import Literal
+
+from athena.core.candle_frame import (
+    CandleFrame,
+    convert_frame_to_period,
+    load_frame_from_file,
+)
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.manifest import DatasetManifest, compute_checksum
+from athena.core.parquet import load_frame_from_parquet, save_frame_to_parquet
+from athena.core.types import Coin, Period
+
+PYRAMID_PERIODS = tuple(
+    Period(timeframe=timeframe) for timeframe in ("5m", "15m", "1h", "4h", "1d")
+)
+
+
+def get_pyramid_level(target_period: Period) -> Period | None:
+    """Get the coarsest cached level candles can be converted from to reach the target period.
+
+    Args:
+        target_period: period of the candles to load
+
+    Returns:
+        the level period, None if candles must be converted from raw ones
+    """
+    levels = [
+        level
+        for level in PYRAMID_PERIODS
+        if not target_period.to_timedelta() % level.to_timedelta()
+    ]
+    return levels[-1] if levels else None
+
+
+class CandlePyramid:
+    """Cache of raw candles aggregated to coarser periods, stored under the raw dataset.
+
+    Each level has its own directory and manifest, apart from any dataset downloaded at the same period.
+
+    Each raw dataset file has one parquet file per level, built by converting the whole raw file to the level.
+    Candles are merged file by file, as raw files are when loaded without cache, so both give the same candles.
+    Levels record the checksum of the raw file they come from and are rebuilt when it changes, checksums of raw
+    files are read from the raw dataset manifest when it has an entry for them.
+
+    Attributes:
+        dataset: dataset layout object
+        coin: the base coin
+        currency: the currency used to trade the coin
+        engine: csv parser used to read raw csv files
+    """
+
+    def __init__(
+        self,
+        dataset: DatasetLayout,
+        coin: Coin,
+        currency: Coin,
+        engine: Literal["c", "pyarrow"] = "c",
+    ):
+        self.dataset = dataset
+        self.coin = coin
+        self.currency = currency
+        self.engine = engine
+        self._manifests: dict[Period, DatasetManifest] = {}
+        self._updated_levels: set[Period] = set()
+
+    def get_level_files(self, filenames: list[Path], level: Period) -> list[Path]:
+        """Get the cached files of raw dataset files at a level, missing and stale files are built.
+
+        Args:
+            filenames: raw dataset files
+            level: one of the pyramid periods
+
+        Returns:
+            parquet files holding the candles of each raw file at the level
+        """
+        raw_manifest = DatasetManifest.load(
+            self.dataset.get_dataset_path(
+                coin=self.coin, currency=self.currency, period=Period(timeframe="1m")
+            )
+        )
+        level_files = []
+        for filename in filenames:
+            entry = raw_manifest.entries.get(filename.name)
+            level_files.append(
+                self._get_level_file(
+                    filename,
+                    level=level,
+                    source_checksum=(
+                        compute_checksum(filename) if entry is None else entry.checksum
+                    ),
+                )
+            )
+        for updated_level in self._updated_levels:
+            self._get_manifest(updated_level).save(self._get_level_path(updated_level))
+        self._updated_levels.clear()
+        return level_files
+
+    def _get_level_file(
+        self, filename: Path, level: Period, source_checksum: str
+    ) -> Path:
+        """Get the cached file of a raw dataset file at a level, stale finer levels are built from the same parse."""
+        stale_levels = [
+            finer_level
+            for finer_level in PYRAMID_PERIODS[: PYRAMID_PERIODS.index(level) + 1]
+            if not self._is_fresh(
+                filename, level=finer_level, source_checksum=source_checksum
+            )
+        ]
+        level_file = self._get_level_path(level) / f"{filename.stem}.parquet"
+        if level not in stale_levels:
+            return level_file
+
+        raw_frame = self._load_raw_file(filename)
+        for stale_level in stale_levels:
+            stale_file = self._get_level_path(stale_level) / f"{filename.stem}.parquet"
+            frame = convert_frame_to_period(raw_frame, target_period=stale_level)
+            save_frame_to_parquet(frame, stale_file)
+            self._get_manifest(stale_level).update(
+                stale_file, frame=frame, source_checksum=source_checksum
+            )
+            self._updated_levels.add(stale_level)
+        return level_file
+
+    def _is_fresh(self, filename: Path, level: Period, source_checksum: str) -> bool:
+        level_file = self._get_level_path(level) / f"{filename.stem}.parquet"
+        entry = self._get_manifest(level).entries.get(level_file.name)
+        return (
+            entry is not None
+            and entry.source_checksum == source_checksum
+            and level_file.is_file()
+        )
+
+    def _load_raw_file(self, filename: Path) -> CandleFrame:
+        if filename.suffix == ".parquet":
+            return load_frame_from_parquet(filename)
+        return load_frame_from_file(filename=filename, engine=self.engine)
+
+    def _get_level_path(self, level: Period) -> Path:
+        return self.dataset.get_pyramid_path(
+            coin=self.coin, currency=self.currency, level=level
+        )
+
+    def _get_manifest(self, level: Period) -> DatasetManifest:
+        if level not in self._manifests:
+            self._manifests[level] = DatasetManifest.load(self._get_level_path(level))
+        return self._manifests[level]
@@ -0,0 +1,153 @@
+import datetime
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+from athena.core.candle_frame import (
+    ATTRIBUTES_DTYPES,
+    AVAILABLE_ATTRIBUTES,
+    CandleFrame,
+    datetimes_to_epoch,
+)
+from athena.core.types import Coin, Period
+
+SQLITE_BATCH_SIZE = 100_000
+
+# open_time is the primary key, candles are clustered by open time and range reads use the index
+_COLUMN_DEFINITIONS = ", ".join(
+    f"{name} INTEGER PRIMARY KEY"
+    if name == "open_time"
+    else f"{name} {'INTEGER' if ATTRIBUTES_DTYPES[name] is np.int64 else 'REAL'} NOT NULL"
+    for name in AVAILABLE_ATTRIBUTES
+)
+
+
+def get_table_name(coin: Coin, currency: Coin, period: Period) -> str:
+    """Get the name of the table holding a pair candles at a period."""
+    return f"{coin.value}_{currency.value}_{period.timeframe}"
+
+
+def connect(filename: Path) -> sqlite3.Connection:
+    """Open a candles database in WAL mode, readers are not blocked while candles are written."""
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(filename)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def save_frame_to_sqlite(frame: CandleFrame, filename: Path) -> None:
+    """Insert candles in the table of their pair and period, candles replace stored ones with the same open time.
+
+    Args:
+        frame: candles to insert
+        filename: database file, created if it does not exist
+
+    Raises:
+        ValueError: if the frame misses attributes, see `CandleFrame.require_attributes`
+    """
+    frame.require_attributes()
+    table = get_table_name(frame.coin, frame.currency, frame.period)
+    with connect(filename) as connection:
+        connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" ({_COLUMN_DEFINITIONS})'
+        )
+        connection.executemany(
+            f'INSERT OR REPLACE INTO "{table}" ({", ".join(AVAILABLE_ATTRIBUTES)}) '
+            f"VALUES ({', '.join('?' * len(AVAILABLE_ATTRIBUTES))})",
+            zip(*(frame.columns[name].tolist() for name in AVAILABLE_ATTRIBUTES)),
+        )
+    connection.close()
+
+
+def iter_frames_from_sqlite(
+    filename: Path,
+    coin: Coin,
+    currency: Coin,
+    period: Period,
+    from_date: datetime.datetime | None = None,
+    to_date: datetime.datetime | None = None,
+    batch_size: int = SQLITE_BATCH_SIZE,
+    attributes: Iterable[str] = AVAILABLE_ATTRIBUTES,
+) -> Iterator[CandleFrame]:
+    """Read candles opened between two dates by batches, ordered by open time.
+
+    Args:
+        filename: database file
+        coin: the base coin
+        currency: the currency used to trade the coin
+        period: candles period
+        from_date: keep candles opened at or after this date
+        to_date: keep candles opened before this date
+        batch_size: maximum number of candles of each frame
+        attributes: attributes to select, other columns are not converted to python objects
+
+    Yields:
+        non-empty frames of consecutive candles
+    """
+    table = get_table_name(coin, currency, period)
+    attributes = tuple(attributes)
+    if not filename.is_file():
+        return
+    connection = connect(filename)
+    try:
+        if not connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone():
+            return
+        cursor = connection.execute(
+            f'SELECT {", ".join(attributes)} FROM "{table}" '
+            "WHERE open_time >= ? AND open_time < ? ORDER BY open_time",
+            _get_epoch_bounds(from_date, to_date),
+        )
+        while rows := cursor.fetchmany(batch_size):
+            yield CandleFrame(
+                coin=coin,
+                currency=currency,
+                period=period,
+                columns={
+                    name: np.asarray(values, dtype=ATTRIBUTES_DTYPES[name])
+                    for name, values in zip(attributes, zip(*rows))
+                },
+            )
+    finally:
+        connection.close()
+
+
+def count_sqlite_candles(
+    filename: Path,
+    coin: Coin,
+    currency: Coin,
+    period: Period,
+    from_date: datetime.datetime,
+    to_date: datetime.datetime,
+) -> int:
+    """Count the candles opened between two dates with an indexed query, 0 if the table does not exist."""
+    if not filename.is_file():
+        return 0
+    connection = connect(filename)
+    try:
+        return connection.execute(
+            f'SELECT COUNT(*) FROM "{get_table_name(coin, currency, period)}" '
+            "WHERE open_time >= ? AND open_time < ?",
+            _get_epoch_bounds(from_date, to_date),
+        ).fetchone()[0]
+    except sqlite3.OperationalError:  # no such table
+        return 0
+    finally:
+        connection.close()
+
+
+def _get_epoch_bounds(
+    from_date: datetime.datetime | None, to_date: datetime.datetime | None
+) -> tuple[int, int]:
+    return (
+        int(datetimes_to_epoch([from_date])[0])
+        if from_date is not None
+        else int(np.iinfo(np.int64).min),
+        int(datetimes_to_epoch([to_date])[0])
+        if to_date is not None
+        else int(np.iinfo(np.int64).max),
+    )
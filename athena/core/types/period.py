@@ -9,24 +9,45 @@ UNITS = {
 
 
 class Period:
-    """Helper to convert time frame to time unit and value."""
+    """Helper to convert time frame to time unit and value.
 
-    def __init__(
-        self,
+    Periods are interned, every period with the same time frame is the same instance.
+    """
+
+    _instances: dict[str, "Period"] = {}
+
+    __slots__ = ("timeframe", "value", "unit", "unit_full", "_timedelta")
+
+    def __new__(
+        cls,
         timeframe: str | None = None,
         value: int | None = None,
         unit: str | None = None,
     ):
-        (self.timeframe, self.value, self.unit) = _fill_missing_attributes(
-            timeframe, value, unit
-        )
-        self.unit_full = UNITS[self.unit]
+        if timeframe in cls._instances:
+            return cls._instances[timeframe]
+        (timeframe, value, unit) = _fill_missing_attributes(timeframe, value, unit)
+        if timeframe not in cls._instances:
+            period = super().__new__(cls)
+            (period.timeframe, period.value, period.unit) = (timeframe, value, unit)
+            period.unit_full = UNITS[unit]
+            period._timedelta = datetime.timedelta(**{period.unit_full: value})
+            cls._instances[timeframe] = period
+        return cls._instances[timeframe]
+
+    def __reduce__(self):
+        return Period, (self.timeframe,)
 
-    def to_timedelta(self):
-        return datetime.timedelta(**{self.unit_full: self.value})
+    def __repr__(self):
+        return f"Period(timeframe={self.timeframe!r})"
+
+    def to_timedelta(self) -> datetime.timedelta:
+        return self._timedelta
 
     def __eq__(self, other):
-        return self.timeframe == other.timeframe
+        return self is other or (
+            isinstance(other, Period) and self.timeframe == other.timeframe
+        )
 
     def __hash__(self):
         return hash(self.timeframe)
@@ -7,7 +7,7 @@ from athena.settings import Settings
 from athena.core.fluctuations import Fluctuations
 from athena.core.dataset_layout import DatasetLayout
 from athena.entrypoints.utils import load_config
-from athena.performance.report import build_and_save_trading_report
+from athena.performance.report import REPORT_COLUMNS, build_and_save_trading_report
 from athena.performance.trading_session import TradingSession
 from athena.tradingtools.strategies import init_strategy
 
@@ -34,10 +34,32 @@ from athena.tradingtools.strategies import init_strategy
     type=Path,
     help="Location of raw market data.",
 )
+@click.option(
+    "--storage-format",
+    default="csv",
+    type=click.Choice(["csv", "parquet", "sqlite"]),
+    help="Format of raw market data files.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes loading raw market data files.",
+)
+@click.option(
+    "--engine",
+    default="pyarrow",
+    type=click.Choice(["c", "pyarrow"]),
+    help="Parser of csv market data files, pyarrow parses files with several threads.",
+)
 def backtest(
     config_path: Path,
     output_dir: Path,
     root_dir: Path,
+    storage_format: str,
+    workers: int,
+    engine: str,
 ):
     """Run a trading algorithm on a dataset and save its performance results.
 
@@ -45,6 +67,9 @@ def backtest(
         config_path: path to configuration
         output_dir: directory to save the performance results
         root_dir: raw market data location
+        storage_format: raw market data files format
+        workers: number of processes loading raw market data files
+        engine: parser of csv market data files
     """
 
     output_dir.mkdir(exist_ok=True, parents=True)
@@ -54,14 +79,6 @@ def backtest(
     strategy_config = StrategyConfig.model_validate(config.get("strategy"))
     session_config = TradingSessionConfig.model_validate(config.get("session"))
 
-    fluctuations = Fluctuations.load_from_dataset(
-        dataset=DatasetLayout(root_dir=root_dir or Settings().raw_data_directory),
-        coin=data_config.coin,
-        currency=data_config.currency,
-        target_period=data_config.period,
-        from_date=data_config.from_date,
-        to_date=data_config.to_date,
-    )
     strategy = init_strategy(
         strategy_name=strategy_config.name, strategy_params=strategy_config.parameters
     )
@@ -73,6 +90,22 @@ def backtest(
         config=session_config,
     )
 
+    fluctuations = Fluctuations.load_from_dataset(
+        dataset=DatasetLayout(
+            root_dir=root_dir or Settings().raw_data_directory,
+            storage_format=storage_format,
+        ),
+        coin=data_config.coin,
+        currency=data_config.currency,
+        target_period=data_config.period,
+        from_date=data_config.from_date,
+        to_date=data_config.to_date,
+        workers=workers,
+        engine=engine,
+        precision=data_config.precision,
+        columns=trading_session.required_columns + REPORT_COLUMNS,
+    )
+
     trades, _ = trading_session.get_trades_from_fluctuations(fluctuations=fluctuations)
 
     build_and_save_trading_report(
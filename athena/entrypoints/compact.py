@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import click
+
+from athena.core.compaction import compact_dataset
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.types import Coin, Period
+from athena.settings import Settings
+
+
+@click.command()
+@click.option("--coin", required=True, type=str, help="The coin to be compacted.")
+@click.option(
+    "--currency", required=True, type=str, help="The currency used to trade the coin."
+)
+@click.option(
+    "--timeframe",
+    default="1m",
+    type=str,
+    help="The base timeframe of each candle (e.g. '1m' or '4h').",
+)
+@click.option(
+    "--root-dir",
+    "-r",
+    default=Settings().raw_data_directory,
+    type=Path,
+    help="Location of raw market data.",
+)
+@click.option(
+    "--storage-format",
+    default="csv",
+    type=click.Choice(["csv", "parquet"]),
+    help="Format of raw market data files.",
+)
+@click.option(
+    "--frequency",
+    default="month",
+    type=click.Choice(["month", "year"]),
+    help="Merge candles into a file per month or per year.",
+)
+@click.option(
+    "--output-format",
+    default=None,
+    type=click.Choice(["csv", "parquet"]),
+    help="Format of compacted files, defaults to the storage format. Another format rewrites the whole dataset.",
+)
+def compact(
+    coin: str,
+    currency: str,
+    timeframe: str,
+    root_dir: Path,
+    storage_format: str,
+    frequency: str,
+    output_format: str | None,
+):
+    """Merge the raw market data files of a pair into monthly or yearly files.
+
+    Args:
+        coin: the base coin
+        currency: the quote currency
+        timeframe: timeframe of candles to compact
+        root_dir: raw market data location
+        storage_format: raw market data files format
+        frequency: time range of candles held by each compacted file
+        output_format: format of compacted files
+    """
+    compacted_files = compact_dataset(
+        dataset=DatasetLayout(root_dir=root_dir, storage_format=storage_format),
+        coin=Coin[coin.upper()],
+        currency=Coin[currency.upper()],
+        period=Period(timeframe=timeframe),
+        frequency=frequency,
+        output_format=output_format,
+    )
+    click.echo(f"Compacted {len(compacted_files)} files.")
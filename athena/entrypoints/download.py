@@ -39,6 +39,18 @@ from athena.client.fetch import download_daily_market_candles
     is_flag=True,
     help="Remove existing candles if set.",
 )
+@click.option(
+    "--storage-format",
+    default="csv",
+    type=click.Choice(["csv", "parquet", "sqlite"]),
+    help="Save candles in daily csv files, in monthly parquet files or in a sqlite database.",
+)
+@click.option(
+    "--column-store",
+    default=False,
+    is_flag=True,
+    help="Also append downloaded candles to a memory-mappable column store.",
+)
 def download(
     coin: str,
     currency: str,
@@ -47,6 +59,8 @@ def download(
     timeframe: str,
     output_dir: Path,
     overwrite: bool,
+    storage_format: str,
+    column_store: bool,
 ):
     download_daily_market_candles(
         coin=coin.upper(),
@@ -56,4 +70,6 @@ def download(
         timeframe=timeframe,
         output_dir=output_dir,
         overwrite=overwrite,
+        storage_format=storage_format,
+        column_store=column_store,
     )
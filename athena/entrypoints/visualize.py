@@ -13,9 +13,12 @@ from athena.settings import Settings
 from athena.core.fluctuations import Fluctuations
 from athena.core.dataset_layout import DatasetLayout
 from athena.entrypoints.utils import load_config
-from athena.tradingtools.indicators import build_indicator
+from athena.tradingtools.indicators import build_indicator, get_indicator_columns
 from athena.tradingtools.indicators.common import IndicatorLine
 
+# candles attributes drawn by the figure
+FIGURE_COLUMNS = ("open", "high", "low", "close", "open_time")
+
 
 def _generate_random_rgb():
     """Create a color from random numbers.
@@ -110,6 +113,16 @@ def _build_indicator_lines(
     return indicators_lines
 
 
+def _get_required_columns(config: IndicatorsConfig) -> tuple[str, ...]:
+    """Get the candles attributes read by the figure and the indicators of a configuration."""
+    columns = FIGURE_COLUMNS
+    for indicator_config in config.indicators:
+        columns += get_indicator_columns(
+            name=indicator_config.name, parameters=indicator_config.parameters
+        )
+    return columns
+
+
 @click.command()
 @click.option(
     "--data-config-path",
@@ -139,11 +152,33 @@ def _build_indicator_lines(
     type=Path,
     help="Location of raw market data.",
 )
+@click.option(
+    "--storage-format",
+    default="csv",
+    type=click.Choice(["csv", "parquet", "sqlite"]),
+    help="Format of raw market data files.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes loading raw market data files.",
+)
+@click.option(
+    "--engine",
+    default="pyarrow",
+    type=click.Choice(["c", "pyarrow"]),
+    help="Parser of csv market data files, pyarrow parses files with several threads.",
+)
 def visualize(
     data_config_path: Path,
     indicators_config_path: Path,
     output_path: Path,
     root_dir: Path,
+    storage_format: str,
+    workers: int,
+    engine: str,
 ):
     """Plot indicators on market data and save the resulting chart.
 
@@ -152,6 +187,9 @@ def visualize(
         indicators_config_path: path to indicators configuration,
         output_path: directory to save the performance results
         root_dir: raw market data location
+        storage_format: raw market data files format
+        workers: number of processes loading raw market data files
+        engine: parser of csv market data files
     """
 
     output_path.parent.mkdir(exist_ok=True, parents=True)
@@ -161,12 +199,19 @@ def visualize(
     )
 
     fluctuations = Fluctuations.load_from_dataset(
-        dataset=DatasetLayout(root_dir=root_dir or Settings().raw_data_directory),
+        dataset=DatasetLayout(
+            root_dir=root_dir or Settings().raw_data_directory,
+            storage_format=storage_format,
+        ),
         coin=data_config.coin,
         currency=data_config.currency,
         target_period=data_config.period,
         from_date=data_config.from_date,
         to_date=data_config.to_date,
+        workers=workers,
+        engine=engine,
+        precision=data_config.precision,
+        columns=_get_required_columns(indicators_config),
     )
 
     indicators_lines = _build_indicator_lines(
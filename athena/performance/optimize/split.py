@@ -3,6 +3,7 @@ from dataclasses import dataclass
 import numpy as np
 
 from athena.core.fluctuations import Fluctuations
+from athena.core.lazy_fluctuations import LazyFluctuations
 
 
 @dataclass
@@ -14,29 +15,38 @@ class Split:
 
 
 class SplitGenerator:
-    """Stores a collection of `Split` associated to an instance of `Fluctuations`.`"""
+    """Stores a collection of `Split` associated to an instance of `Fluctuations`.`
 
-    def __init__(self, fluctuations: Fluctuations, splits: list[Split]):
+    Splits of a `LazyFluctuations` handle are loaded when retrieved, blocks of candles are shared by splits.
+    """
+
+    def __init__(
+        self, fluctuations: Fluctuations | LazyFluctuations, splits: list[Split]
+    ):
         self.fluctuations = fluctuations
         self.splits = splits
 
     def get_split(self, index: int):
-        """Retrieve train and test fluctuations."""
+        """Retrieve train and test fluctuations.
+
+        Splits hold sorted indexes of validated fluctuations, their candles are not validated again.
+        """
         return (
-            Fluctuations.from_candles(
-                [
-                    self.fluctuations.candles[ii]
-                    for ii in self.splits[index].train_indexes
-                ]
+            self._take(
+                self.splits[index].train_indexes, provenance=f"split {index} train"
             ),
-            Fluctuations.from_candles(
-                [
-                    self.fluctuations.candles[ii]
-                    for ii in self.splits[index].test_indexes
-                ]
+            self._take(
+                self.splits[index].test_indexes, provenance=f"split {index} test"
             ),
         )
 
+    def _take(self, indexes: list[int], provenance: str) -> Fluctuations:
+        if isinstance(self.fluctuations, LazyFluctuations):
+            return self.fluctuations.take(indexes)
+        return Fluctuations.from_trusted_frame(
+            self.fluctuations.frame[indexes], provenance=provenance
+        )
+
 
 def _create_cross_validation_divisions(
     nb_divisions: int, nb_test: int
@@ -109,7 +119,7 @@ def _division_to_split(division: list[int], total_size: int, purge_size: int):
 
 
 def create_ccpv_splits(
-    fluctuations: Fluctuations,
+    fluctuations: Fluctuations | LazyFluctuations,
     test_size: float = 0.2,
     test_samples: int = 1,
     purge_factor: float = 0,
@@ -117,7 +127,8 @@ def create_ccpv_splits(
     """Create the Combinatorial Purged Cross Validation Splits of the fluctuations.
 
     Args:
-        fluctuations: market data
+        fluctuations: market data, every block of a lazy handle is loaded to count candles, with their times
+            and volumes only
         test_size: the overall ratio of candles to be put in test
         test_samples: number of test samples
         purge_factor: the ratio of purged indexes before and after test split to avoid leakage between train and test
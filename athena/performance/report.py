@@ -4,6 +4,7 @@ import plotly.graph_objects as go
 from jinja2 import Environment, PackageLoader, select_autoescape
 from plotly.subplots import make_subplots
 
+from athena.core.candle_frame import epoch_to_datetimes
 from athena.core.fluctuations import Fluctuations
 from athena.core.market_entities import Position
 from athena.performance.models import (
@@ -15,6 +16,9 @@ from athena.tradingtools.metrics.metrics import (
     trades_to_wealth,
 )
 
+# candles attributes drawn by the report
+REPORT_COLUMNS = ("open", "high", "low", "close", "open_time")
+
 
 def _plot_trades_on_fluctuations(trades: list[Position], fluctuations: Fluctuations):
     """Draw trades on fluctuations and save them along the wealth curve.
@@ -85,11 +89,12 @@ def _plot_trades_on_fluctuations(trades: list[Position], fluctuations: Fluctuati
         col=1,
     )
 
-    # add the wealth over time curve to the plot
+    # add the wealth over time curve to the plot, no candle object is built
+    start_time, end_time = epoch_to_datetimes(fluctuations.frame.open_time[[0, -1]])
     wealth, time = trades_to_wealth(
         trades=trades,
-        start_time=fluctuations.candles[0].open_time,
-        end_time=fluctuations.candles[-1].open_time,
+        start_time=start_time,
+        end_time=end_time,
     )
     fig.add_trace(
         go.Scatter(
@@ -1,5 +1,9 @@
+from collections.abc import Iterable
+
 from athena.configs import TradingSessionConfig
-from athena.core.fluctuations import Fluctuations
+from athena.core.candle import frame_to_candle
+from athena.core.candle_frame import CandleFrame
+from athena.core.fluctuations import Fluctuations, FluctuationsChunk
 from athena.core.market_entities import (
     Portfolio,
     Position,
@@ -21,6 +25,17 @@ class TradingSession:
         config: session configuration
     """
 
+    # candles attributes read to open and close positions
+    REQUIRED_COLUMNS = (
+        "high",
+        "low",
+        "close",
+        "open_time",
+        "high_time",
+        "low_time",
+        "close_time",
+    )
+
     def __init__(
         self,
         coin: Coin,
@@ -95,6 +110,13 @@ class TradingSession:
             self.trades.append(trade)
             self.portfolio.update_from_trade(trade=trade)
 
+    @property
+    def required_columns(self) -> tuple[str, ...]:
+        """Candles attributes read by the session and its strategy, see `Fluctuations.load_from_dataset`."""
+        return tuple(
+            dict.fromkeys(self.REQUIRED_COLUMNS + self.strategy.required_columns)
+        )
+
     def get_trades_from_fluctuations(
         self, fluctuations: Fluctuations
     ) -> tuple[list[Trade], Portfolio]:
@@ -108,12 +130,48 @@ class TradingSession:
         """
 
         self._reset_state()
+        self._apply_signals(
+            fluctuations.frame, self.strategy.get_aligned_signals(fluctuations)
+        )
+        return self.trades, self.portfolio
+
+    def get_trades_from_chunks(
+        self, chunks: Iterable[FluctuationsChunk]
+    ) -> tuple[list[Trade], Portfolio]:
+        """Apply the trading strategy on market data streamed by chunks, see `Fluctuations.iter_chunks`.
+
+        Position and portfolio are kept from one chunk to the next, signals are computed on each chunk
+        including its lookback candles.
 
-        for candle, signal in self.strategy.get_signals(fluctuations):
-            self._check_position_exit_signal(candle=candle)
-            if signal == Signal.BUY:
-                self._buy_signal(candle=candle)
-            elif signal == Signal.SELL:
-                self._sell_signal(candle=candle)
+        Args:
+            chunks: consecutive chunks of candles, mocks a market
 
+        Returns:
+            market movement as a list of trades
+        """
+        self._reset_state()
+        for chunk in chunks:
+            signals = self.strategy.get_aligned_signals(chunk.fluctuations)
+            self._apply_signals(
+                chunk.fluctuations.frame[chunk.lookback :], signals[chunk.lookback :]
+            )
         return self.trades, self.portfolio
+
+    def _apply_signals(self, frame: CandleFrame, signals: list[Signal]):
+        """Update position, trades and portfolio from candles signals.
+
+        Candles are scanned on the frame arrays, a `Candle` with datetime attributes is only built when it
+        may open or close a position.
+        """
+        highs = frame.columns["high"].tolist()
+        lows = frame.columns["low"].tolist()
+        for index, signal in enumerate(signals):
+            if self.position is not None and (
+                highs[index] >= self.position.take_profit
+                or lows[index] <= self.position.stop_loss
+            ):
+                self._check_position_exit_signal(candle=frame_to_candle(frame, index))
+            if signal == Signal.BUY and self.position is None:
+                self._buy_signal(candle=frame_to_candle(frame, index))
+            elif signal == Signal.SELL and self.position is not None:
+                self._sell_signal(candle=frame_to_candle(frame, index))
@@ -1,7 +1,9 @@
 from dataclasses import asdict
 
+import numpy as np
 import pytest
 
+from athena.core.candle_frame import CandleFrame
 from athena.core.market_entities import Candle
 
 
@@ -17,3 +19,17 @@ def assert_candles_equal(candle_a: Candle, candle_b: Candle):
         b_dict.pop(key)
 
     assert a_dict == pytest.approx(b_dict)
+
+
+def assert_frames_equal(frame: CandleFrame, expected: CandleFrame):
+    assert len(frame) == len(expected)
+    assert list(frame.columns) == list(expected.columns)
+    for name, values in expected.columns.items():
+        assert np.array_equal(frame.columns[name], values, equal_nan=True), name
+
+
+def assert_frames_close(frame: CandleFrame, expected: CandleFrame):
+    # csv parsing may round the last digit of floats
+    assert len(frame) == len(expected)
+    for name, values in expected.columns.items():
+        assert np.allclose(frame.columns[name], values, rtol=1e-15), name
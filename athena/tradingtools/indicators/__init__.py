@@ -1,8 +1,10 @@
+import inspect
 from functools import partial
 from typing import Any
 
 from jedi.inference.gradual.typing import Callable
 
+from athena.core.candle_frame import AVAILABLE_ATTRIBUTES
 from athena.tradingtools.indicators.momentum.rsi import rsi, stochastic_rsi
 from athena.tradingtools.indicators.trend.ichimoku import ichimoku
 from athena.tradingtools.indicators.trend.macd import macd
@@ -20,6 +22,17 @@ TECHNICAL_INDICATORS = {
     "stochastic_rsi": stochastic_rsi,
 }
 
+# candles attributes read by each indicator, besides the attribute given by a `column` parameter,
+# indicators added without declaration read every attribute
+INDICATORS_COLUMNS = {
+    "exponential_moving_average": (),
+    "ichimoku": ("high", "low"),
+    "macd": ("close",),
+    "rsi": ("close",),
+    "simple_moving_average": (),
+    "stochastic_rsi": ("close",),
+}
+
 
 def build_indicator(name: str, parameters: dict[str, Any]) -> Callable:
     """Build a function that can be applied of any kind of data.
@@ -38,3 +51,26 @@ def build_indicator(name: str, parameters: dict[str, Any]) -> Callable:
         raise NotImplementedError(f"Indicator `{name}` is currently not implemented.")
 
     return partial(TECHNICAL_INDICATORS[name], **parameters)
+
+
+def get_indicator_columns(name: str, parameters: dict[str, Any]) -> tuple[str, ...]:
+    """Get the candles attributes an indicator reads, see `Fluctuations.load_from_dataset` columns.
+
+    Args:
+        name: name of the indicator, should be in TECHNICAL_INDICATORS
+        parameters: set of parameters to build the indicator
+
+    Returns:
+        attributes read by the indicator
+
+    Raises:
+        NotImplementedError: if the indicator name is unknown
+    """
+    if name not in TECHNICAL_INDICATORS:
+        raise NotImplementedError(f"Indicator `{name}` is currently not implemented.")
+
+    columns = INDICATORS_COLUMNS.get(name, AVAILABLE_ATTRIBUTES)
+    column = inspect.signature(TECHNICAL_INDICATORS[name]).parameters.get("column")
+    if column is None:
+        return columns
+    return columns + (parameters.get("column", column.default),)
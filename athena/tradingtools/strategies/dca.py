@@ -8,6 +8,10 @@ from athena.core.types import Signal
 from athena.tradingtools.strategies.strategy import Strategy
 
 
+NANOSECONDS_PER_MINUTE = 60 * 10**9
+MINUTES_PER_DAY = 24 * 60
+
+
 class Weekday(Enum):
     monday = 0
     tuesday = 1
@@ -35,6 +39,8 @@ class StrategyDCAModel(BaseModel):
 
 
 class StrategyDCA(Strategy):
+    required_columns = ("open_time",)
+
     def __init__(
         self,
         config: StrategyDCAModel,
@@ -51,16 +57,11 @@ class StrategyDCA(Strategy):
         Returns:
             strategy buy / sell / wait signals
         """
-        signals = []
-
-        for open_time in fluctuations.get_series("open_time"):
-            is_weekday = (open_time.weekday() == self.config.weekday.value) or (
-                self.config.weekday == Weekday.every_day
-            )
-            is_hour = open_time.hour == self.config.hour
-            is_minute = open_time.minute == self.config.minute
-            if is_weekday and is_hour and is_minute:
-                signals.append(Signal.BUY)
-            else:
-                signals.append(Signal.WAIT)
-        return signals
+        # open times stay int64 epochs, 1970-01-01 was a thursday
+        minutes = fluctuations.frame.open_time // NANOSECONDS_PER_MINUTE
+        is_time = (
+            minutes % MINUTES_PER_DAY == self.config.hour * 60 + self.config.minute
+        )
+        if self.config.weekday != Weekday.every_day:
+            is_time &= (minutes // MINUTES_PER_DAY + 3) % 7 == self.config.weekday.value
+        return [Signal.BUY if is_buy else Signal.WAIT for is_buy in is_time.tolist()]
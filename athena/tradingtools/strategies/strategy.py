@@ -1,15 +1,24 @@
 import re
 from typing import Iterable
 
+from athena.core.candle import frame_to_candles
+from athena.core.candle_frame import AVAILABLE_ATTRIBUTES
 from athena.core.fluctuations import Fluctuations
 from athena.core.market_entities import Candle
 from athena.core.types import Signal
 
 
 class Strategy:
-    """Abstract class for trading strategies."""
+    """Abstract class for trading strategies.
+
+    Attributes:
+        name: strategy name, built from the class name
+        required_columns: candles attributes read by `compute_signals`, only these columns are loaded
+            (e.g. `Fluctuations.load_from_dataset(columns=...)`). Strategies read every attribute by default.
+    """
 
     name: str
+    required_columns: tuple[str, ...] = AVAILABLE_ATTRIBUTES
 
     def __init__(
         self,
@@ -17,34 +26,55 @@ class Strategy:
         self.name = "_".join(_split_uppercase_words(self.__class__.__name__)).lower()
 
     def get_signals(
-        self, fluctuations: Fluctuations
+        self, fluctuations: Fluctuations, lookback: int = 0
     ) -> Iterable[tuple[Candle, Signal]]:
         """Get the strategy signals associated to input fluctuations.
 
         Args:
             fluctuations: collection of candles
+            lookback: number of leading candles only used to compute signals (e.g. repeated from a previous
+                chunk), no signal is yielded for them
 
         Yields:
             a mapping of signal for each date as a dictionary
 
+        Raises:
+            ValueError: if signals are inconsistent with fluctuations
+        """
+        signals = self.get_aligned_signals(fluctuations=fluctuations)
+        candles = (
+            frame_to_candles(fluctuations.frame[lookback:])
+            if lookback
+            else fluctuations.candles
+        )
+        for candle, signal in zip(
+            candles,
+            signals[lookback:],
+        ):
+            yield candle, signal
+
+    def get_aligned_signals(self, fluctuations: Fluctuations) -> list[Signal]:
+        """Get one strategy signal per candle of input fluctuations, no candle object is built.
+
+        Args:
+            fluctuations: collection of candles
+
+        Returns:
+            signals ordered as candles, padded with WAIT at the beginning
+
         Raises:
             ValueError: if signals are inconsistent with fluctuations
         """
         signals = self.compute_signals(fluctuations=fluctuations)
 
         # TODO : check for some decorator to check size of compute_signals() ?
-        if len(signals) > len(fluctuations.candles):
+        if len(signals) > len(fluctuations):
             raise ValueError(
-                f"The strategy `{self.name}` produced too many signals, expected {len(fluctuations.candles)}, got {len(signals)}"
+                f"The strategy `{self.name}` produced too many signals, expected {len(fluctuations)}, got {len(signals)}"
             )
 
         # fill signals with WAIT at the beginning
-        signals = [Signal.WAIT] * (len(fluctuations.candles) - len(signals)) + signals
-        for candle, signal in zip(
-            fluctuations.candles,
-            signals,
-        ):
-            yield candle, signal
+        return [Signal.WAIT] * (len(fluctuations) - len(signals)) + list(signals)
 
     def compute_signals(self, fluctuations: Fluctuations) -> list[Signal]:
         """Compute the signals associated to fluctuations based on a strategy.
@@ -2,9 +2,14 @@ import datetime
 
 import pytest
 
+from athena.core.candle import candles_to_frame
+from athena.core.candle_frame import CandleFrame, save_frame
+from athena.core.dataset_layout import DatasetLayout
 from athena.core.fluctuations import Fluctuations
 from athena.core.market_entities import Candle, Position
+from athena.core.parquet import update_parquet_file
 from athena.core.types import Coin, Period
+from athena.testing.generate import generate_candles
 
 
 @pytest.fixture(autouse=True)
@@ -62,6 +67,47 @@ def sample_fluctuations():
     return _sample_fluctuations
 
 
+@pytest.fixture
+def save_days():
+    """Write generated BTC/USDT minute candles in a dataset, one file per day (merged in month parquet files)."""
+
+    def _save_days(
+        dataset: DatasetLayout,
+        start_date: datetime.datetime,
+        nb_days: int = 1,
+        day_length: datetime.timedelta = datetime.timedelta(days=1),
+    ) -> CandleFrame:
+        frame = candles_to_frame(
+            generate_candles(
+                from_date=start_date,
+                to_date=start_date + datetime.timedelta(days=nb_days),
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+            )
+        )
+        saved = []
+        for day in range(nb_days):
+            date = start_date + datetime.timedelta(days=day)
+            day_frame = frame[
+                day * 1440 : day * 1440 + day_length // datetime.timedelta(minutes=1)
+            ]
+            filename = dataset.localize_file(
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+                period=Period(timeframe="1m"),
+                date=date,
+            )
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            if dataset.storage_format == "parquet":
+                update_parquet_file(day_frame, filename)
+            else:
+                save_frame(day_frame, filename)
+            saved.append(day_frame)
+        return CandleFrame.concat(saved)
+
+    return _save_days
+
+
 @pytest.fixture
 def sample_trades():
     """Returns 3 closed positions.
@@ -1,9 +1,12 @@
 import datetime
 import logging
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from athena.core.candle import (
+    Candle,
     convert_candles_to_period,
     sanitize_candles,
     merge_candles,
@@ -120,3 +123,31 @@ def test_load_candles_from_file(tmp_path):
         load_candles_from_file(tmp_path / "fluctuations.csv"), candles
     ):
         assert_candles_equal(candle, expected_candle)
+
+
+def test_candle_coercion_and_equality():
+    candle = generate_candles(size=1)[0]
+    coerced = Candle(
+        coin=candle.coin.value,
+        currency=candle.currency.value,
+        period=candle.period.timeframe,
+        open_time=pd.Timestamp(candle.open_time),
+        close_time=pd.Timestamp(candle.close_time),
+        open=candle.open,
+        high=candle.high,
+        low=candle.low,
+        close=candle.close,
+        volume=candle.volume,
+        quote_volume=candle.quote_volume,
+        nb_trades=candle.nb_trades,
+        taker_volume=candle.taker_volume,
+        taker_quote_volume=candle.taker_quote_volume,
+        high_time=pd.NaT,
+        low_time=np.nan,
+    )
+    candle.high_time = candle.low_time = None
+
+    assert coerced == candle
+    assert coerced.period is Period(timeframe=candle.period.timeframe)
+    assert type(coerced.open_time) is datetime.datetime
+    assert not hasattr(coerced, "__dict__")
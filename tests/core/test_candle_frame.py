@@ -0,0 +1,258 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from athena.core.candle import candles_to_frame, frame_to_candles, merge_candles
+from athena.core.candle_frame import (
+    AVAILABLE_ATTRIBUTES,
+    NAT,
+    CandleFrame,
+    FrameResampler,
+    SanitizeReport,
+    check_frame,
+    find_gaps,
+    convert_frame_to_period,
+    datetimes_to_epoch,
+    epoch_to_datetimes,
+    load_frame_from_file,
+    sanitize_frame,
+)
+from athena.core.fluctuations import Fluctuations
+from athena.core.types import Coin, Period
+from athena.testing.equality import assert_candles_equal
+from athena.testing.generate import generate_candles
+
+
+def test_datetimes_to_epoch_round_trip():
+    dates = [datetime.datetime(2020, 1, 1), None, datetime.datetime(2020, 1, 1, 0, 1)]
+
+    epochs = datetimes_to_epoch(dates)
+
+    assert epochs.dtype == np.int64
+    assert epochs[1] == NAT
+    assert epoch_to_datetimes(epochs) == dates
+
+
+def test_candles_to_frame_round_trip():
+    candles = generate_candles(size=10, coin=Coin.BTC, currency=Coin.USDT)
+
+    frame = candles_to_frame(candles)
+
+    assert len(frame) == 10
+    assert set(frame.columns) == set(AVAILABLE_ATTRIBUTES)
+    assert frame.coin == Coin.BTC
+    for candle, expected in zip(frame_to_candles(frame), candles):
+        assert_candles_equal(candle, expected)
+
+
+def test_candle_frame_slice_is_a_view():
+    frame = candles_to_frame(generate_candles(size=10))
+
+    sliced = frame[2:5]
+
+    assert len(sliced) == 3
+    assert np.shares_memory(sliced.columns["close"], frame.columns["close"])
+
+
+def test_candle_frame_concat():
+    frame = candles_to_frame(generate_candles(size=10))
+
+    concatenated = CandleFrame.concat([frame[:4], frame[4:]])
+
+    assert len(concatenated) == 10
+    assert np.array_equal(concatenated.open_time, frame.open_time)
+    assert concatenated.is_sorted()
+
+
+def test_candle_frame_eq():
+    candles = generate_candles(size=10)
+    frame = candles_to_frame(candles)
+
+    assert frame == candles_to_frame(candles)
+    assert frame == CandleFrame.concat([frame[:4], frame[4:]])
+    assert frame != frame[1:]
+    assert frame != frame.with_precision("float32")
+    assert Fluctuations.from_candles(candles) == Fluctuations.from_candles(candles)
+
+
+def test_candle_frame_empty():
+    frame = CandleFrame.empty(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+
+    assert len(frame) == 0
+    assert frame_to_candles(frame) == []
+
+
+def test_candle_frame_inconsistent_columns():
+    with pytest.raises(ValueError, match="same length"):
+        CandleFrame(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            columns={
+                name: np.zeros(2 if name == "open" else 3)
+                for name in AVAILABLE_ATTRIBUTES
+            },
+        )
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_load_frame_from_file(tmp_path, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    candles = generate_candles(size=10, coin=Coin.BTC, currency=Coin.USDT)
+    Fluctuations.from_candles(candles).save(tmp_path / "fluctuations.csv")
+
+    frame = load_frame_from_file(tmp_path / "fluctuations.csv", engine=engine)
+
+    assert frame.coin == Coin.BTC
+    assert frame.currency == Coin.USDT
+    assert frame.period == Period(timeframe="1m")
+    assert all(frame.columns["high_time"] == NAT)
+    for candle, expected in zip(frame_to_candles(frame), candles):
+        assert_candles_equal(candle, expected)
+
+
+def test_sanitize_frame():
+    candles = generate_candles(size=5)
+    candles[2].volume = 0
+    frame = candles_to_frame(candles[::-1] + candles[:1])
+
+    sanitized = sanitize_frame(frame)
+
+    assert len(sanitized) == 4
+    assert sanitized.is_sorted()
+    assert all(sanitized.columns["volume"] > 0)
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "1h", "4h"])
+def test_convert_frame_to_period(timeframe):
+    candles = generate_candles(
+        period=Period(timeframe="1m"),
+        from_date=datetime.datetime(2020, 1, 1),
+        to_date=datetime.datetime(2020, 1, 2),
+    )
+    target_period = Period(timeframe=timeframe)
+    bucket_size = int(target_period.to_timedelta() / datetime.timedelta(minutes=1))
+
+    converted = convert_frame_to_period(
+        candles_to_frame(candles[::-1]), target_period=target_period
+    )
+
+    assert converted.period == target_period
+    assert len(converted) == len(candles) // bucket_size
+    for candle, ii in zip(
+        frame_to_candles(converted), range(0, len(candles), bucket_size)
+    ):
+        expected = merge_candles(candles[ii : ii + bucket_size])
+        expected.period = target_period
+        assert_candles_equal(candle, expected)
+
+
+def test_convert_frame_to_period_drops_unclosed_candle():
+    candles = generate_candles(
+        period=Period(timeframe="1m"),
+        from_date=datetime.datetime(2020, 1, 1),
+        to_date=datetime.datetime(2020, 1, 1, hour=2, minute=30),
+    )
+
+    converted = convert_frame_to_period(
+        candles_to_frame(candles), target_period=Period(timeframe="1h")
+    )
+
+    assert len(converted) == 2
+    assert (
+        epoch_to_datetimes(converted.columns["close_time"])[-1]
+        == candles[119].close_time
+    )
+
+
+def test_convert_frame_to_period_wrong_timeframe():
+    frame = CandleFrame.empty(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="4h")
+    )
+
+    with pytest.raises(ValueError, match="Cannot convert candles to lower timeframe"):
+        convert_frame_to_period(frame, target_period=Period(timeframe="1h"))
+
+
+def test_frame_resampler_carries_candles_across_frames():
+    frame = candles_to_frame(
+        generate_candles(
+            period=Period(timeframe="1m"),
+            from_date=datetime.datetime(2020, 1, 1),
+            to_date=datetime.datetime(2020, 1, 1, hour=10, minute=30),
+        )
+    )
+    target_period = Period(timeframe="4h")
+    resampler = FrameResampler(target_period=target_period)
+
+    converted = CandleFrame.concat(
+        [resampler.update(frame[ii : ii + 90]) for ii in range(0, len(frame), 90)]
+    )
+    resampler.close()
+
+    expected = convert_frame_to_period(frame, target_period=target_period)
+    assert len(converted) == 2
+    for name in AVAILABLE_ATTRIBUTES:
+        assert np.allclose(converted.columns[name], expected.columns[name])
+
+
+def test_check_frame():
+    frame = candles_to_frame(generate_candles(size=10))
+    frame.columns["close"][1] = np.nan
+    frame.columns["low"][2] = frame.columns["high"][2] + 1
+    frame.columns["high_time"][3] = frame.columns["close_time"][3] + 1
+    frame.columns["volume"][4] = 0
+    frame = frame[[9, 8, 7, 6, 5, 4, 3, 2, 1, 0, 7]]
+
+    checked, report = check_frame(frame)
+
+    assert report == SanitizeReport(
+        missing_values=1,
+        inconsistent_prices=1,
+        inconsistent_times=1,
+        zero_volume=1,
+        duplicated=1,
+        unsorted=5,
+    )
+    assert report.total == 5
+    assert len(checked) == 6
+    assert checked.is_sorted()
+
+
+def test_check_frame_counts_unsorted_candles():
+    frame = candles_to_frame(generate_candles(size=10))
+
+    checked, report = check_frame(frame[[0, 1, 2, 7, 3, 4, 5, 6, 8, 9]])
+
+    assert report == SanitizeReport(unsorted=4)
+    assert report.total == 0
+    assert checked == frame
+
+
+def test_check_frame_valid_frame_is_kept():
+    frame = candles_to_frame(generate_candles(size=10))
+
+    checked, report = check_frame(frame)
+
+    assert checked is frame
+    assert report.total == 0
+
+
+def test_check_frame_unknown_rule():
+    frame = candles_to_frame(generate_candles(size=10))
+
+    with pytest.raises(ValueError, match="Unknown sanitizing rules"):
+        check_frame(frame, rules=["negative_prices"])
+
+
+def test_find_gaps():
+    frame = candles_to_frame(generate_candles(size=10))
+
+    gap_starts, gap_ends = find_gaps(frame[np.r_[0:3, 5:6, 9:10]])
+
+    assert gap_starts.tolist() == frame.open_time[[3, 6]].tolist()
+    assert gap_ends.tolist() == frame.open_time[[5, 9]].tolist()
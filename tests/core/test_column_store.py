@@ -0,0 +1,92 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from athena.core.candle import candles_to_frame
+from athena.core.column_store import (
+    ColumnStoreHeader,
+    append_frame_to_column_store,
+    load_frame_from_column_store,
+    save_frame_to_column_store,
+)
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.types import Coin, Period
+from athena.testing.generate import generate_candles
+
+
+def test_save_and_load_column_store(tmp_path):
+    frame = candles_to_frame(generate_candles(size=100))
+
+    save_frame_to_column_store(frame, tmp_path)
+    loaded = load_frame_from_column_store(tmp_path)
+
+    assert isinstance(loaded.open_time.base, np.memmap)
+    assert not loaded.open_time.flags.writeable
+    assert loaded.coin == frame.coin
+    assert loaded.period == frame.period
+    for name, values in frame.columns.items():
+        assert np.array_equal(loaded.columns[name], values)
+
+
+def test_append_frame_to_column_store(tmp_path):
+    frame = candles_to_frame(generate_candles(size=100))
+
+    assert append_frame_to_column_store(frame[:60], tmp_path) == 60
+    assert append_frame_to_column_store(frame[60:], tmp_path) == 100
+    loaded = load_frame_from_column_store(tmp_path)
+    assert np.load(tmp_path / "open.npy").shape == (100,)
+    for name, values in frame.columns.items():
+        assert np.array_equal(loaded.columns[name], values)
+
+    # older candles are merged by rewriting the store in files of a new generation
+    assert append_frame_to_column_store(frame[40:70], tmp_path) == 100
+    assert load_frame_from_column_store(tmp_path).is_sorted()
+    assert (tmp_path / "open.npy").is_file() and (tmp_path / "open.1.npy").is_file()
+    assert append_frame_to_column_store(frame[:10], tmp_path) == 100
+    assert not (tmp_path / "open.npy").is_file()
+    assert ColumnStoreHeader.load(tmp_path).generation == 2
+    loaded = load_frame_from_column_store(tmp_path)
+    for name, values in frame.columns.items():
+        assert np.array_equal(loaded.columns[name], values)
+
+
+def test_append_frame_to_column_store_fails_on_pair(tmp_path):
+    append_frame_to_column_store(
+        candles_to_frame(generate_candles(size=10, coin=Coin.BTC)), tmp_path
+    )
+
+    with pytest.raises(ValueError):
+        append_frame_to_column_store(
+            candles_to_frame(generate_candles(size=10, coin=Coin.ETH)), tmp_path
+        )
+
+
+def test_load_from_column_store(tmp_path):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    frame = candles_to_frame(
+        generate_candles(
+            from_date=start_date, to_date=start_date + datetime.timedelta(days=1)
+        )
+    )
+    save_frame_to_column_store(
+        frame,
+        dataset.get_column_store_path(
+            coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+        ),
+    )
+
+    fluctuations = Fluctuations.load_from_column_store(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+        from_date=start_date + datetime.timedelta(hours=2),
+        to_date=start_date + datetime.timedelta(hours=6),
+    )
+
+    assert len(fluctuations) == 4
+    assert fluctuations.candles[0].open_time == start_date + datetime.timedelta(hours=2)
+    assert fluctuations.candles[0].open == frame.columns["open"][120]
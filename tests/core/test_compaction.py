@@ -0,0 +1,283 @@
+import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from athena.core.candle_frame import (
+    CandleFrame,
+    load_frame_from_file,
+    save_frame,
+    update_csv_file,
+)
+from athena.core.compaction import compact_dataset
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.manifest import DatasetManifest
+from athena.core.types import Coin, Period
+from athena.testing.equality import assert_frames_close
+from athena.testing.generate import generate_candles
+
+START_DATE = datetime.datetime(2020, 1, 30)
+
+
+def _load(dataset: DatasetLayout, **kwargs) -> Fluctuations:
+    return Fluctuations.load_from_dataset(
+        dataset=dataset, coin=Coin.BTC, currency=Coin.USDT, cache=False, **kwargs
+    )
+
+
+def test_compact_dataset_by_month(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    save_days(dataset, START_DATE, nb_days=4)
+    expected = _load(dataset)
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+
+    compacted_files = compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="month",
+    )
+
+    assert [filename.name for filename in compacted_files] == [
+        "fluctuations_2020-01.csv",
+        "fluctuations_2020-02.csv",
+    ]
+    assert sorted(filename.name for filename in dataset_path.glob("*.csv")) == [
+        "fluctuations_2020-01.csv",
+        "fluctuations_2020-02.csv",
+    ]
+    assert sorted(DatasetManifest.load(dataset_path).entries) == [
+        "fluctuations_2020-01.csv",
+        "fluctuations_2020-02.csv",
+    ]
+    assert (
+        dataset.localize_file(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            date=START_DATE + datetime.timedelta(days=1),
+        ).name
+        == "fluctuations_2020-01.csv"
+    )
+    assert_frames_close(_load(dataset).frame, expected.frame)
+    assert (
+        len(
+            _load(
+                dataset,
+                from_date=START_DATE + datetime.timedelta(days=1),
+                to_date=START_DATE + datetime.timedelta(days=2),
+            )
+        )
+        == 2 * 1440
+    )
+    # already compacted files are left untouched
+    assert not compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="month",
+    )
+
+
+def test_compact_dataset_by_year_to_parquet(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    save_days(dataset, START_DATE, nb_days=4)
+    expected = _load(dataset)
+
+    compacted_files = compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="year",
+        output_format="parquet",
+    )
+
+    parquet_dataset = DatasetLayout(tmp_path, storage_format="parquet")
+    assert [filename.name for filename in compacted_files] == [
+        "fluctuations_2020.parquet"
+    ]
+    assert (
+        parquet_dataset.localize_file(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            date=START_DATE,
+        )
+        == compacted_files[0]
+    )
+    assert_frames_close(_load(parquet_dataset).frame, expected.frame)
+
+
+def test_compact_dataset_rewrites_dataset_to_output_format(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    save_days(dataset, datetime.datetime(2019, 12, 30), nb_days=4)
+    expected = _load(dataset)
+    compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="year",
+    )
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+
+    compacted_files = compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="month",
+        output_format="parquet",
+    )
+
+    assert [filename.name for filename in compacted_files] == [
+        "fluctuations_2019.parquet",
+        "fluctuations_2020.parquet",
+    ]
+    assert not list(dataset_path.glob("*.csv"))
+    assert sorted(DatasetManifest.load(dataset_path).entries) == [
+        "fluctuations_2019.parquet",
+        "fluctuations_2020.parquet",
+    ]
+    assert_frames_close(
+        _load(DatasetLayout(tmp_path, storage_format="parquet")).frame, expected.frame
+    )
+
+
+def test_compact_dataset_is_lossless(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    frame = save_days(dataset, START_DATE, nb_days=2)
+    first_day = dataset.localize_file(
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        date=START_DATE,
+    )
+    day_frame = frame[np.arange(1440)]  # a copy
+    day_frame.columns["volume"][:10] = 0  # candles readers drop
+    day_frame.columns["close"][10:20] = day_frame.columns["high"][10:20] + 1
+    save_frame(CandleFrame.concat([day_frame, day_frame[:5]]), first_day)
+
+    (compacted_file,) = compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="month",
+    )
+
+    compacted = load_frame_from_file(compacted_file)
+    assert len(compacted) == 2 * 1440  # duplicated candles are only kept once
+    assert_frames_close(compacted[:1440], day_frame)
+    assert_frames_close(compacted[1440:], frame[1440:])
+
+
+def test_compact_dataset_interrupted(tmp_path, mocker, save_days):
+    dataset = DatasetLayout(tmp_path)
+    save_days(dataset, START_DATE, nb_days=3)
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+    DatasetManifest.build(dataset_path).save(dataset_path)
+    unlink = Path.unlink
+
+    def unlink_then_interrupt(filename, *args, **kwargs):
+        unlink(filename, *args, **kwargs)
+        raise KeyboardInterrupt
+
+    mocker.patch.object(
+        Path, "unlink", autospec=True, side_effect=unlink_then_interrupt
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        compact_dataset(
+            dataset,
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            frequency="month",
+        )
+
+    assert len(_load(dataset)) == 3 * 1440
+
+
+def test_localize_files(tmp_path, mocker, save_days):
+    dataset = DatasetLayout(tmp_path)
+    save_days(dataset, START_DATE, nb_days=4)
+    compact_dataset(
+        dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        frequency="year",
+    )
+    day_file = dataset.get_compacted_file(
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        period=Period(timeframe="1m"),
+        date=START_DATE + datetime.timedelta(days=2),
+        frequency="day",
+    )
+    save_frame(
+        Fluctuations.from_candles(
+            generate_candles(
+                size=10,
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+                from_date=START_DATE + datetime.timedelta(days=2),
+            )
+        ).frame,
+        day_file,
+    )
+    dates = [START_DATE + datetime.timedelta(days=day) for day in range(5)]
+    is_file_spy = mocker.spy(Path, "is_file")
+
+    filenames = dataset.localize_files(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m"), dates=dates
+    )
+
+    assert is_file_spy.call_count == 0
+    assert [filename.name for filename in filenames] == [
+        "fluctuations_2020.csv",
+        "fluctuations_2020-02-01.csv",
+    ]
+    assert filenames == list(
+        dict.fromkeys(
+            dataset.localize_file(
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+                period=Period(timeframe="1m"),
+                date=date,
+            )
+            for date in dates[:4]
+        )
+    )
+
+
+def test_compact_dataset_fails_on_frequency(tmp_path):
+    with pytest.raises(ValueError):
+        compact_dataset(
+            DatasetLayout(tmp_path),
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            frequency="day",
+        )
+
+
+def test_update_csv_file(tmp_path):
+    fluctuations = Fluctuations.from_candles(generate_candles(size=100))
+
+    update_csv_file(fluctuations.frame[:60], tmp_path / "candles.csv")
+    frame = update_csv_file(fluctuations.frame[40:], tmp_path / "candles.csv")
+
+    assert_frames_close(frame, fluctuations.frame)
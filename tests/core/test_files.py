@@ -0,0 +1,18 @@
+import pytest
+
+from athena.core.files import atomic_write
+
+
+def test_atomic_write(tmp_path):
+    filename = tmp_path / "directory" / "file.txt"
+
+    with atomic_write(filename) as tmp_filename:
+        tmp_filename.write_text("first")
+        assert not filename.exists()
+    with pytest.raises(RuntimeError):
+        with atomic_write(filename) as tmp_filename:
+            tmp_filename.write_text("partial")
+            raise RuntimeError()
+
+    assert filename.read_text() == "first"
+    assert list(filename.parent.iterdir()) == [filename]
@@ -5,11 +5,16 @@ import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
 
-from athena.core.fluctuations import Fluctuations
+from athena.core.candle import candles_to_frame
+from athena.core.candle_frame import save_frame
+from athena.core.fluctuations import Fluctuations, RollingFluctuations
 from athena.core.dataset_layout import DatasetLayout
+from athena.core.column_store import save_frame_to_column_store
+from athena.core.parquet import save_frame_to_parquet
+from athena.core.sqlite import save_frame_to_sqlite
 from athena.core.types import Coin, Period
 from athena.testing.equality import assert_candles_equal
-from athena.testing.generate import generate_candles
+from athena.testing.generate import generate_candles, generate_fluctuations
 
 
 def test_fluctuations_from_candles():
@@ -33,6 +38,44 @@ def test_fluctuations_get_candle():
     )
 
 
+def test_fluctuations_get_candle_missing():
+    candles = generate_candles(size=2, period=Period(timeframe="4h"))
+
+    with pytest.raises(ValueError, match="No candle opened at"):
+        Fluctuations.from_candles(candles=candles).get_candle(
+            open_time=candles[0].open_time + datetime.timedelta(hours=1)
+        )
+
+
+def test_fluctuations_between():
+    candles = generate_candles(size=10, period=Period(timeframe="1h"))
+    fluctuations = Fluctuations.from_candles(candles=candles)
+
+    window = fluctuations.between(
+        candles[2].open_time, candles[5].open_time + datetime.timedelta(minutes=30)
+    )
+
+    assert window.candles == candles[2:6]
+    assert np.shares_memory(window.frame.open_time, fluctuations.frame.open_time)
+    assert not len(fluctuations.between(candles[5].open_time, candles[2].open_time))
+
+
+def test_fluctuations_at():
+    candles = generate_candles(size=10, period=Period(timeframe="1h"))
+    fluctuations = Fluctuations.from_candles(candles=candles)
+
+    found = fluctuations.at(
+        [
+            candles[7].open_time,
+            candles[1].open_time,
+            candles[1].open_time + datetime.timedelta(minutes=1),
+            candles[9].open_time + datetime.timedelta(hours=1),
+        ]
+    )
+
+    assert found.candles == [candles[1], candles[7]]
+
+
 def test_fluctuations_fails_on_coins():
     with pytest.raises(ValueError, match="All candles must have the same coin"):
         Fluctuations.from_candles(
@@ -104,20 +147,10 @@ def test_fluctuations_save_to_file(tmp_path):
     )
 
 
-def test_load_from_dataset(tmp_path):
+def test_load_from_dataset(tmp_path, save_days):
     start_date = datetime.datetime(2020, 1, 1)
-    Fluctuations.from_candles(
-        generate_candles(
-            from_date=start_date,
-            to_date=start_date + datetime.timedelta(hours=12),
-        )
-    ).save(
-        DatasetLayout(tmp_path).localize_file(
-            coin=Coin.BTC,
-            currency=Coin.USDT,
-            period=Period(timeframe="1m"),
-            date=start_date,
-        )
+    save_days(
+        DatasetLayout(tmp_path), start_date, day_length=datetime.timedelta(hours=12)
     )
     fluctuations = Fluctuations.load_from_dataset(
         dataset=DatasetLayout(tmp_path),
@@ -144,3 +177,406 @@ def test_load_fluctuations_get_series(tmp_path):
 
     with pytest.raises(ValueError, match="Trying to access unavailable attribute"):
         fluctuations.get_series("this_attribute_does_not_exist")
+
+
+def test_fluctuations_get_series_is_a_view():
+    fluctuations = Fluctuations.from_candles(
+        candles=generate_candles(size=10, period=Period(timeframe="1m"))
+    )
+
+    assert np.shares_memory(
+        fluctuations.get_series("close").to_numpy(), fluctuations.frame.columns["close"]
+    )
+    assert fluctuations.get_series("open_time").dtype == "datetime64[ns]"
+    assert (fluctuations.get_series("open").index == fluctuations.time_index).all()
+
+
+@pytest.mark.parametrize("timeframe", ["1m", "1h", "1d"])
+def test_fluctuations_save_matches_per_candle_dataframes(tmp_path, timeframe):
+    candles = generate_fluctuations(
+        size=30,
+        period=Period(timeframe=timeframe),
+        include_high_time=True,
+    ).candles
+    pd.concat([candle.to_dataframe() for candle in candles]).to_csv(
+        tmp_path / "expected.csv", index=False
+    )
+
+    Fluctuations.from_candles(candles).save(tmp_path / "fluctuations.csv")
+    save_frame(candles_to_frame(candles), tmp_path / "chunked.csv", chunk_size=6250)
+
+    expected = (tmp_path / "expected.csv").read_bytes()
+    assert (tmp_path / "fluctuations.csv").read_bytes() == expected
+    assert (tmp_path / "chunked.csv").read_bytes() == expected
+
+
+def test_load_from_parquet_dataset(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path, storage_format="parquet")
+    start_date = datetime.datetime(2020, 1, 30)
+    save_days(dataset, start_date, nb_days=4)
+
+    loaded = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+        from_date=start_date + datetime.timedelta(days=1),
+        to_date=start_date + datetime.timedelta(days=2),
+    )
+
+    assert (
+        dataset.localize_file(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            date=start_date,
+        ).name
+        == "fluctuations_2020-01.parquet"
+    )
+    assert len(loaded) == 48
+    assert loaded.candles[0].open_time == start_date + datetime.timedelta(days=1)
+
+
+def test_load_from_dataset_with_workers(tmp_path, save_days):
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(DatasetLayout(tmp_path), start_date, nb_days=3)
+
+    sequential = Fluctuations.load_from_dataset(
+        dataset=DatasetLayout(tmp_path),
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+    parallel = Fluctuations.load_from_dataset(
+        dataset=DatasetLayout(tmp_path),
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+        workers=2,
+    )
+
+    assert len(parallel) == 72
+    assert parallel == sequential
+
+
+def test_load_from_dataset_period_across_files(tmp_path, save_days):
+    start_date = datetime.datetime(2020, 1, 1)
+    frame = save_days(DatasetLayout(tmp_path), start_date, nb_days=7)
+
+    fluctuations = Fluctuations.load_from_dataset(
+        dataset=DatasetLayout(tmp_path),
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="3d"),
+    )
+
+    assert len(fluctuations) == 2
+    assert fluctuations.period == Period(timeframe="3d")
+    assert fluctuations.candles[1].open_time == start_date + datetime.timedelta(days=3)
+    assert fluctuations.candles[1].volume == pytest.approx(
+        frame.columns["volume"][3 * 1440 : 6 * 1440].sum()
+    )
+
+
+def test_fluctuations_from_trusted_frame(mocker):
+    frame = Fluctuations.from_candles(generate_candles(size=10)).frame
+    validator_spy = mocker.spy(Fluctuations, "check_frame_consistency")
+
+    trusted = Fluctuations.from_trusted_frame(frame[2:8], provenance="slice")
+
+    assert validator_spy.call_count == 0
+    assert trusted.provenance == "slice"
+    assert len(trusted) == 6
+    assert trusted.candles == Fluctuations.from_frame(frame[2:8]).candles
+    assert trusted == Fluctuations.from_frame(frame[2:8])
+    assert trusted.model_dump() == Fluctuations.from_frame(frame[2:8]).model_dump()
+
+
+@pytest.mark.parametrize("lookback", [0, 5])
+def test_fluctuations_iter_chunks(tmp_path, save_days, lookback):
+    save_days(DatasetLayout(tmp_path), datetime.datetime(2020, 1, 1), nb_days=3)
+    parameters = dict(
+        dataset=DatasetLayout(tmp_path),
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+
+    chunks = list(
+        Fluctuations.iter_chunks(**parameters, chunk_size=20, lookback=lookback)
+    )
+    loaded = Fluctuations.load_from_dataset(**parameters)
+
+    assert [chunk.new_candles for chunk in chunks] == [20, 20, 20, 12]
+    assert [chunk.lookback for chunk in chunks] == [0] + [lookback] * 3
+    assert (
+        sum((chunk.fluctuations.candles[chunk.lookback :] for chunk in chunks), [])
+        == loaded.candles
+    )
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert (
+            chunk.fluctuations.candles[: chunk.lookback]
+            == (previous.fluctuations.candles[len(previous.fluctuations) - lookback :])
+        )
+
+
+def test_fluctuations_iter_chunks_raises(tmp_path):
+    with pytest.raises(ValueError):
+        next(
+            Fluctuations.iter_chunks(
+                dataset=DatasetLayout(tmp_path),
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+                chunk_size=0,
+            )
+        )
+
+
+def test_load_from_dataset_float32(tmp_path, save_days):
+    save_days(DatasetLayout(tmp_path), datetime.datetime(2020, 1, 1))
+    parameters = dict(
+        dataset=DatasetLayout(tmp_path),
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+
+    expected = Fluctuations.load_from_dataset(**parameters)
+    fluctuations = Fluctuations.load_from_dataset(**parameters, precision="float32")
+
+    assert fluctuations.precision == "float32"
+    assert fluctuations.frame.columns["close"].dtype == np.float32
+    assert fluctuations.frame.open_time.dtype == np.int64
+    assert fluctuations.frame.columns["nb_trades"].dtype == np.int64
+    for name, values in expected.frame.columns.items():
+        assert np.allclose(
+            fluctuations.frame.columns[name], values, rtol=2**-24, atol=0
+        )
+    assert expected.with_precision("float64") is expected
+    assert np.array_equal(
+        expected.with_precision("float32").frame.columns["volume"],
+        fluctuations.frame.columns["volume"],
+    )
+
+
+@pytest.mark.parametrize("storage_format", ["csv", "parquet", "sqlite"])
+def test_load_from_dataset_columns(tmp_path, save_days, storage_format):
+    start_date = datetime.datetime(2020, 1, 1)
+    dataset = DatasetLayout(tmp_path, storage_format=storage_format)
+    if storage_format == "sqlite":
+        save_frame_to_sqlite(
+            candles_to_frame(
+                generate_candles(
+                    from_date=start_date,
+                    to_date=start_date + datetime.timedelta(days=2),
+                    coin=Coin.BTC,
+                    currency=Coin.USDT,
+                )
+            ),
+            dataset.get_database_path(),
+        )
+    else:
+        save_days(dataset, start_date, nb_days=2)
+    parameters = dict(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+
+    expected = Fluctuations.load_from_dataset(**parameters)
+    fluctuations = Fluctuations.load_from_dataset(
+        **parameters, columns=["close", "high_time"]
+    )
+
+    assert list(fluctuations.frame.columns) == [
+        "high",
+        "close",
+        "open_time",
+        "high_time",
+        "close_time",
+        "volume",
+    ]
+    assert len(fluctuations) == len(expected) == 48
+    for name, values in fluctuations.frame.columns.items():
+        assert np.allclose(
+            values, expected.frame.columns[name], rtol=1e-15, atol=0
+        ), name
+    candle = fluctuations.candles[0]
+    assert candle.close == expected.candles[0].close
+    assert candle.open is None and candle.nb_trades is None and candle.low_time is None
+    assert fluctuations.get_candle(candle.open_time) == candle
+    with pytest.raises(ValueError):
+        fluctuations.get_series("open")
+    with pytest.raises(ValueError):
+        Fluctuations.load_from_dataset(**parameters, columns=["unknown"])
+
+
+@pytest.mark.parametrize("timeframe", [None, "1h"])
+def test_load_from_dataset_columns_invalid_candles(tmp_path, save_days, timeframe):
+    start_date = datetime.datetime(2020, 1, 1)
+    dataset = DatasetLayout(tmp_path)
+    frame = save_days(dataset, start_date, nb_days=4)
+    for day in range(4):
+        day_frame = frame[np.arange(day * 1440, (day + 1) * 1440)]
+        bad = np.arange(10) * 60 + 59  # closes of hours above their highs
+        day_frame.columns["close"][bad] = day_frame.columns["high"][bad] * 2
+        save_frame(
+            day_frame,
+            dataset.localize_file(
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+                period=Period(timeframe="1m"),
+                date=start_date + datetime.timedelta(days=day),
+            ),
+        )
+    parameters = dict(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=timeframe and Period(timeframe=timeframe),
+    )
+
+    expected = Fluctuations.load_from_dataset(**parameters)
+    projected = Fluctuations.load_from_dataset(**parameters, columns=["open_time"])
+    chunks = list(
+        Fluctuations.iter_chunks(**parameters, chunk_size=1000, columns=["open_time"])
+    )
+
+    assert len(expected) < (4 * 1440 if timeframe is None else 4 * 24)
+    assert list(projected.frame.columns) == ["open_time", "close_time", "volume"]
+    assert np.array_equal(projected.frame.open_time, expected.frame.open_time)
+    assert np.array_equal(
+        np.concatenate([chunk.fluctuations.frame.open_time for chunk in chunks]),
+        expected.frame.open_time,
+    )
+
+
+def test_save_projected_fluctuations(tmp_path):
+    fluctuations = generate_fluctuations(size=50)
+    projected = Fluctuations.from_trusted_frame(
+        fluctuations.frame.project(["open_time", "close_time", "close"]),
+        provenance="test",
+    )
+
+    projected.save_ipc(tmp_path / "fluctuations.arrow")
+    with projected.share() as shared:
+        attached = Fluctuations.from_shared(shared.handle)
+
+        assert attached.frame == projected.frame
+    assert (
+        Fluctuations.load_from_ipc(tmp_path / "fluctuations.arrow").frame
+        == projected.frame
+    )
+    with pytest.raises(ValueError):
+        projected.save(tmp_path / "fluctuations.csv")
+    with pytest.raises(ValueError):
+        save_frame_to_parquet(projected.frame, tmp_path / "fluctuations.parquet")
+    with pytest.raises(ValueError):
+        save_frame_to_column_store(projected.frame, tmp_path / "store")
+    with pytest.raises(ValueError):
+        save_frame_to_sqlite(projected.frame, tmp_path / "candles.db")
+
+
+def test_fluctuations_extend():
+    candles = generate_candles(size=100, coin=Coin.BTC, currency=Coin.USDT)
+    expected = Fluctuations.from_candles(candles)
+    fluctuations = Fluctuations.from_trusted_frame(
+        expected.frame[:10], provenance="test"
+    )
+    first_candles = fluctuations.candles
+    window = fluctuations.between(candles[0].open_time, candles[5].open_time)
+
+    capacities = set()
+    for candle in candles[10:50]:
+        fluctuations.append(candle)
+        capacities.add(len(fluctuations._buffers["open_time"]))
+    fluctuations.extend(expected.frame[50:])
+
+    assert capacities == {20, 40, 80}
+    assert len(fluctuations) == 100
+    for name, values in fluctuations.frame.columns.items():
+        assert np.array_equal(values, expected.frame.columns[name])
+    assert fluctuations.candles is first_candles
+    assert fluctuations.candles == expected.candles
+    assert fluctuations.time_index.equals(expected.time_index)
+    assert len(window) == 5
+
+    with pytest.raises(ValueError):
+        fluctuations.append(candles[-1])
+    with pytest.raises(ValueError):
+        fluctuations.extend(
+            candles_to_frame(generate_candles(size=1, period=Period(timeframe="1h")))
+        )
+
+
+def test_fluctuations_extend_copies():
+    expected = Fluctuations.from_candles(
+        generate_candles(size=40, coin=Coin.BTC, currency=Coin.USDT)
+    )
+    fluctuations = Fluctuations.from_trusted_frame(
+        expected.frame[:10], provenance="test"
+    )
+    fluctuations.extend(expected.frame[10:20])
+    assert len(fluctuations.candles) == 20
+    copied = fluctuations.model_copy()
+
+    fluctuations.extend(expected.frame[20:30])
+    copied.extend(expected.frame[30:35])
+
+    assert fluctuations.frame == expected.frame[:30]
+    assert fluctuations.candles == expected.candles[:30]
+    assert copied.frame == expected.frame[np.r_[0:20, 30:35]]
+    assert copied.candles == expected.candles[:20] + expected.candles[30:35]
+
+
+def test_fluctuations_extend_equality():
+    expected = Fluctuations.from_candles(
+        generate_candles(size=40, coin=Coin.BTC, currency=Coin.USDT)
+    )
+    fluctuations = Fluctuations.from_trusted_frame(
+        expected.frame[:10], provenance="test"
+    )
+    fluctuations.extend(expected.frame[10:])
+    other = Fluctuations.from_trusted_frame(expected.frame[:20], provenance="test")
+    other.extend(expected.frame[20:])
+
+    assert fluctuations == other
+    assert fluctuations == Fluctuations.from_frame(expected.frame)
+    assert fluctuations != Fluctuations.from_frame(expected.frame[:39])
+
+
+def test_rolling_fluctuations():
+    candles = generate_candles(size=100, coin=Coin.BTC, currency=Coin.USDT)
+    expected = Fluctuations.from_candles(candles)
+    rolling = RollingFluctuations.from_fluctuations(
+        Fluctuations.from_trusted_frame(expected.frame[:10], provenance="test"),
+        capacity=30,
+    )
+    buffers = dict(rolling._buffers)
+
+    nb_candles = 10
+    for size in (1, 7, 45, 2, 35):
+        rolling.extend(expected.frame[nb_candles : nb_candles + size])
+        nb_candles += size
+        window = expected.frame[max(nb_candles - 30, 0) : nb_candles]
+        assert len(rolling) == len(window)
+        for name, values in rolling.frame.columns.items():
+            assert np.array_equal(values, window.columns[name]), name
+            assert values.flags.c_contiguous
+            assert np.shares_memory(values, buffers[name])
+    rolling.append(generate_candles(size=101, coin=Coin.BTC, currency=Coin.USDT)[-1])
+
+    assert all(rolling._buffers[name] is buffer for name, buffer in buffers.items())
+    assert len(rolling) == 30
+    assert rolling.get_series("close").index.equals(rolling.time_index)
+    assert rolling.get_candle(candles[-1].open_time) == candles[-1]
+    assert len(rolling.between(candles[80].open_time, candles[90].open_time)) == 10
+    assert np.array_equal(rolling[-2:].open_time, rolling.frame.open_time[-2:])
+
+    with pytest.raises(ValueError):
+        rolling.append(candles[-1])
+    with pytest.raises(ValueError):
+        RollingFluctuations(
+            coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m"), capacity=0
+        )
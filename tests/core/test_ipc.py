@@ -0,0 +1,58 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from athena.core.candle import candles_to_frame
+from athena.core.fluctuations import Fluctuations
+from athena.core.ipc import SharedFrameHandle, load_frame_from_ipc, save_frame_to_ipc
+from athena.testing.generate import generate_candles, generate_fluctuations
+
+
+def _sum_volume(handle: SharedFrameHandle) -> float:
+    return float(Fluctuations.from_shared(handle).frame.columns["volume"].sum())
+
+
+@pytest.mark.parametrize("precision", ["float64", "float32"])
+def test_save_and_load_frame_ipc(tmp_path, precision):
+    frame = candles_to_frame(generate_candles(size=100)).with_precision(precision)
+
+    save_frame_to_ipc(frame, tmp_path / "candles.arrow")
+    loaded = load_frame_from_ipc(tmp_path / "candles.arrow")
+
+    assert loaded.precision == precision
+    assert loaded.coin == frame.coin
+    assert loaded.period == frame.period
+    assert not loaded.open_time.flags.writeable
+    for name, values in frame.columns.items():
+        assert np.array_equal(loaded.columns[name], values)
+
+
+def test_fluctuations_save_and_load_ipc(tmp_path):
+    fluctuations = generate_fluctuations(size=50)
+
+    fluctuations.save_ipc(tmp_path / "fluctuations.arrow")
+    loaded = Fluctuations.load_from_ipc(tmp_path / "fluctuations.arrow")
+
+    assert loaded.provenance == "load_from_ipc"
+    assert loaded.candles == fluctuations.candles
+
+
+def test_fluctuations_share(tmp_path):
+    fluctuations = generate_fluctuations(size=50)
+
+    with fluctuations.share() as shared:
+        handle = pickle.loads(pickle.dumps(shared.handle))
+        attached = Fluctuations.from_shared(handle)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            volumes = list(executor.map(_sum_volume, [shared.handle] * 2))
+
+        assert attached.candles == fluctuations.candles
+        assert volumes == [fluctuations.frame.columns["volume"].sum()] * 2
+
+    float32 = fluctuations.with_precision("float32")
+    with float32.share() as shared:
+        attached = Fluctuations.from_shared(shared.handle)
+        assert attached.precision == "float32"
+        assert attached.frame == float32.frame
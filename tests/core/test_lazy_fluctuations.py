@@ -0,0 +1,115 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from athena.core.candle_frame import save_frame
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.lazy_fluctuations import LazyFluctuations
+from athena.core.types import Coin, Period
+from athena.performance.optimize.split import create_ccpv_splits
+from athena.testing.equality import assert_frames_equal
+
+START_DATE = datetime.datetime(2020, 1, 1)
+NB_DAYS = 10
+
+
+@pytest.fixture
+def dataset(tmp_path, save_days) -> DatasetLayout:
+    dataset = DatasetLayout(tmp_path)
+    save_days(dataset, START_DATE, nb_days=NB_DAYS)
+    return dataset
+
+
+@pytest.mark.parametrize("timeframe", ["1m", "1h", "3d"])
+def test_lazy_fluctuations_between(dataset, timeframe):
+    parameters = dict(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe=timeframe),
+        from_date=START_DATE,
+        to_date=START_DATE + datetime.timedelta(days=NB_DAYS - 1),
+    )
+    expected = Fluctuations.load_from_dataset(**parameters)
+    lazy = LazyFluctuations(**parameters, block_days=2)
+    from_date = START_DATE + datetime.timedelta(days=3, hours=5)
+    to_date = START_DATE + datetime.timedelta(days=5)
+
+    window = lazy.between(from_date, to_date)
+
+    assert lazy.loaded_blocks == ([1] if timeframe == "3d" else [1, 2])
+    assert_frames_equal(window.frame, expected.between(from_date, to_date).frame)
+    assert_frames_equal(lazy.materialize().frame, expected.frame)
+    assert lazy.loaded_blocks == list(range(lazy.nb_blocks))
+
+
+def test_lazy_fluctuations_columns_and_take(dataset):
+    parameters = dict(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+        from_date=START_DATE,
+        to_date=START_DATE + datetime.timedelta(days=NB_DAYS - 1),
+    )
+    expected = Fluctuations.load_from_dataset(**parameters)
+    lazy = LazyFluctuations(**parameters, block_days=3)
+
+    assert len(lazy) == len(expected) == NB_DAYS * 24
+    assert list(lazy.get_series("close")) == list(expected.get_series("close"))
+    assert "open" not in lazy.materialize(columns=["close"]).frame.columns
+
+    indexes = list(range(10, 20)) + list(range(100, 130))
+    assert_frames_equal(lazy.take(indexes).frame, expected.frame[indexes])
+
+    splits = create_ccpv_splits(lazy, test_size=0.25)
+    expected_splits = create_ccpv_splits(expected, test_size=0.25)
+    train, test = splits.get_split(1)
+    expected_train, expected_test = expected_splits.get_split(1)
+    assert_frames_equal(train.frame, expected_train.frame)
+    assert_frames_equal(test.frame, expected_test.frame)
+
+
+def test_lazy_fluctuations_take_invalid_candles(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    frame = save_days(dataset, START_DATE, nb_days=4)
+    for day in range(4):
+        day_frame = frame[np.arange(day * 1440, (day + 1) * 1440)]
+        bad = np.arange(10) * 100 + 30  # closes above highs
+        day_frame.columns["close"][bad] = day_frame.columns["high"][bad] + 1
+        save_frame(
+            day_frame,
+            dataset.localize_file(
+                coin=Coin.BTC,
+                currency=Coin.USDT,
+                period=Period(timeframe="1m"),
+                date=START_DATE + datetime.timedelta(days=day),
+            ),
+        )
+    parameters = dict(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        from_date=START_DATE,
+        to_date=START_DATE + datetime.timedelta(days=3),
+    )
+    expected = Fluctuations.load_from_dataset(**parameters)
+    lazy = LazyFluctuations(**parameters, block_days=2)
+
+    indexes = list(range(len(lazy) - 5, len(lazy)))
+
+    assert len(lazy) == len(expected) == 4 * 1430
+    assert_frames_equal(lazy.take(indexes).frame, expected.frame[indexes])
+
+
+def test_lazy_fluctuations_raises(dataset):
+    with pytest.raises(ValueError):
+        LazyFluctuations(
+            dataset=dataset,
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            from_date=START_DATE + datetime.timedelta(days=1),
+            to_date=START_DATE,
+        )
@@ -0,0 +1,108 @@
+import datetime
+
+import numpy as np
+
+from athena.core.candle_frame import load_frame_from_file, save_frame
+from athena.core.fluctuations import Fluctuations
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.manifest import DatasetManifest
+from athena.core.types import Coin, Period
+
+
+def test_manifest_build_save_load(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2, day_length=datetime.timedelta(hours=1))
+    save_days(
+        dataset,
+        start_date + datetime.timedelta(days=5),
+        day_length=datetime.timedelta(hours=1),
+    )
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+
+    DatasetManifest.build(dataset_path).save(dataset_path)
+    manifest = DatasetManifest.load(dataset_path)
+
+    assert len(manifest.entries) == 3
+    entry = manifest.entries["fluctuations_2020-01-01.csv"]
+    assert entry.nb_candles == 60
+    assert entry.first_open_time == start_date
+    assert entry.last_open_time == start_date + datetime.timedelta(minutes=59)
+    assert len(entry.checksum) == 64
+    assert manifest.date_ranges == [
+        (datetime.date(2020, 1, 1), datetime.date(2020, 1, 2)),
+        (datetime.date(2020, 1, 6), datetime.date(2020, 1, 6)),
+    ]
+    assert (
+        manifest.count_candles(
+            dataset_path / "fluctuations_2020-01-02.csv", datetime.date(2020, 1, 2)
+        )
+        == 60
+    )
+    assert manifest.get_files(
+        dataset_path,
+        from_date=start_date + datetime.timedelta(days=1),
+        to_date=start_date + datetime.timedelta(days=6),
+    ) == [
+        dataset_path / "fluctuations_2020-01-02.csv",
+        dataset_path / "fluctuations_2020-01-06.csv",
+    ]
+
+
+def test_load_from_dataset_uses_manifest(tmp_path, mocker, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2, day_length=datetime.timedelta(hours=1))
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+    DatasetManifest.build(dataset_path).save(dataset_path)
+
+    localize_file = mocker.spy(dataset, "localize_file")
+    fluctuations = Fluctuations.load_from_dataset(
+        dataset=dataset, coin=Coin.BTC, currency=Coin.USDT
+    )
+
+    assert len(fluctuations) == 120
+    localize_file.assert_not_called()
+
+
+def test_manifest_gaps_and_coverage(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2, day_length=datetime.timedelta(hours=1))
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+    manifest = DatasetManifest.build(dataset_path)
+    # remove 10 minutes from the first day
+    filename = dataset_path / "fluctuations_2020-01-01.csv"
+    frame = load_frame_from_file(filename)
+    save_frame(frame[np.r_[0:20, 30:60]], filename)
+    manifest.update(filename=filename, frame=frame[np.r_[0:20, 30:60]])
+
+    assert manifest.entries[filename.name].gaps == [
+        (
+            start_date + datetime.timedelta(minutes=20),
+            start_date + datetime.timedelta(minutes=30),
+        )
+    ]
+    assert manifest.get_gaps(
+        from_date=start_date, to_date=start_date + datetime.timedelta(days=2)
+    ) == [
+        (
+            start_date + datetime.timedelta(minutes=20),
+            start_date + datetime.timedelta(minutes=30),
+        ),
+        (
+            start_date + datetime.timedelta(hours=1),
+            start_date + datetime.timedelta(days=1),
+        ),
+        (
+            start_date + datetime.timedelta(days=1, hours=1),
+            start_date + datetime.timedelta(days=2),
+        ),
+    ]
+    assert manifest.get_coverage(datetime.date(2020, 1, 2)) == 60 / 1440
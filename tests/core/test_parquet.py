@@ -0,0 +1,72 @@
+import datetime
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from athena.core.candle import candles_to_frame, frame_to_candles
+from athena.core.candle_frame import NAT
+from athena.core.parquet import (
+    load_frame_from_parquet,
+    save_frame_to_parquet,
+    update_parquet_file,
+)
+from athena.core.types import Coin, Period
+from athena.testing.equality import assert_candles_equal, assert_frames_equal
+from athena.testing.generate import generate_candles
+
+
+def test_save_and_load_frame_parquet(tmp_path):
+    candles = generate_candles(size=10, coin=Coin.BTC, currency=Coin.USDT)
+
+    save_frame_to_parquet(candles_to_frame(candles), tmp_path / "candles.parquet")
+    frame = load_frame_from_parquet(tmp_path / "candles.parquet")
+
+    assert frame.coin == Coin.BTC
+    assert frame.currency == Coin.USDT
+    assert frame.period == Period(timeframe="1m")
+    assert all(frame.columns["high_time"] == NAT)
+    for candle, expected in zip(frame_to_candles(frame), candles):
+        assert_candles_equal(candle, expected)
+
+
+def test_parquet_row_groups_by_day(tmp_path):
+    from_date = datetime.datetime(2020, 1, 1)
+    candles = generate_candles(
+        from_date=from_date, to_date=from_date + datetime.timedelta(days=3)
+    )
+
+    save_frame_to_parquet(candles_to_frame(candles), tmp_path / "candles.parquet")
+    frame = load_frame_from_parquet(
+        tmp_path / "candles.parquet",
+        from_date=from_date + datetime.timedelta(days=1),
+        to_date=from_date + datetime.timedelta(days=2),
+    )
+
+    assert pq.ParquetFile(tmp_path / "candles.parquet").metadata.num_row_groups == 3
+    assert len(frame) == 1440
+    assert frame_to_candles(frame[:1])[0].open_time == from_date + datetime.timedelta(
+        days=1
+    )
+
+
+def test_update_parquet_file(tmp_path):
+    frame = candles_to_frame(generate_candles(size=10))
+    update_parquet_file(frame[:6], tmp_path / "candles.parquet")
+
+    new_frame = candles_to_frame(generate_candles(size=10))
+    update_parquet_file(new_frame[4:], tmp_path / "candles.parquet")
+
+    updated = load_frame_from_parquet(tmp_path / "candles.parquet")
+    assert len(updated) == 10
+    assert np.array_equal(updated.columns["close"][:4], frame.columns["close"][:4])
+    assert np.array_equal(updated.columns["close"][4:], new_frame.columns["close"][4:])
+
+
+def test_save_and_load_frame_parquet_float32(tmp_path):
+    frame = candles_to_frame(generate_candles(size=10)).with_precision("float32")
+
+    save_frame_to_parquet(frame, tmp_path / "candles.parquet")
+    loaded = load_frame_from_parquet(tmp_path / "candles.parquet")
+
+    assert loaded.precision == "float32"
+    assert_frames_equal(loaded, frame)
@@ -0,0 +1,188 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from athena.core import pyramid
+from athena.core.candle_frame import save_frame
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.manifest import DatasetManifest
+from athena.core.parquet import load_frame_from_parquet, save_frame_to_parquet
+from athena.core.pyramid import get_pyramid_level
+from athena.core.types import Coin, Period
+from athena.testing.generate import generate_candles
+
+
+@pytest.mark.parametrize(
+    "timeframe, expected",
+    [
+        ("1m", None),
+        ("7m", None),
+        ("30m", "15m"),
+        ("1h", "1h"),
+        ("2h", "1h"),
+        ("3d", "1d"),
+    ],
+)
+def test_get_pyramid_level(timeframe, expected):
+    level = get_pyramid_level(Period(timeframe=timeframe))
+
+    assert (level and level.timeframe) == expected
+
+
+def test_load_from_dataset_with_cache(tmp_path, mocker, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2)
+    load_spy = mocker.spy(pyramid, "load_frame_from_file")
+
+    loaded = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="4h"),
+    )
+    cached = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="4h"),
+    )
+    uncached = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="4h"),
+        cache=False,
+    )
+
+    assert load_spy.call_count == 2  # raw files are parsed once
+    for timeframe in ("5m", "15m", "1h", "4h"):
+        manifest = DatasetManifest.load(
+            dataset.get_pyramid_path(
+                coin=Coin.BTC, currency=Coin.USDT, level=Period(timeframe=timeframe)
+            )
+        )
+        assert len(manifest.entries) == 2
+    assert len(loaded) == 12
+    assert cached.model_dump() == loaded.model_dump()
+    for name, values in uncached.frame.columns.items():
+        assert np.allclose(values, loaded.frame.columns[name])
+
+
+def test_load_from_dataset_cache_keeps_downloaded_level(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path, storage_format="parquet")
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2)
+    hourly_period = Period(timeframe="1h")
+    downloaded = Fluctuations.from_candles(
+        generate_candles(
+            size=240,
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=hourly_period,
+            from_date=start_date,
+        )
+    )
+    hourly_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=hourly_period
+    )
+    filename = dataset.localize_file(
+        coin=Coin.BTC, currency=Coin.USDT, period=hourly_period, date=start_date
+    )
+    save_frame_to_parquet(downloaded.frame, filename)
+    manifest = DatasetManifest.build(hourly_path)
+    manifest.save(hourly_path)
+
+    cached = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=hourly_period,
+    )
+
+    assert len(cached) == 48
+    assert load_frame_from_parquet(filename) == downloaded.frame
+    assert DatasetManifest.load(hourly_path) == manifest
+
+
+def test_load_from_dataset_cache_invalidation(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=1)
+    Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+
+    candles = generate_candles(
+        from_date=start_date, to_date=start_date + datetime.timedelta(hours=6)
+    )
+    Fluctuations.from_candles(candles).save(
+        dataset.localize_file(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            date=start_date,
+        )
+    )
+    loaded = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+
+    assert len(loaded) == 6
+
+
+@pytest.mark.parametrize("timeframe", ["1h", "2h", "3d"])
+def test_load_from_dataset_cache_gap_at_file_bound(tmp_path, timeframe, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    frame = save_days(dataset, start_date, nb_days=4)
+    save_frame(  # the first day ends at 23:29
+        frame[: 23 * 60 + 30],
+        dataset.localize_file(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            date=start_date,
+        ),
+    )
+
+    parameters = dict(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe=timeframe),
+    )
+    uncached = Fluctuations.load_from_dataset(**parameters, cache=False)
+    cached = Fluctuations.load_from_dataset(**parameters)
+
+    assert len(cached)
+    assert cached.frame == uncached.frame
+
+
+def test_load_from_dataset_cache_manifest_checksums(tmp_path, mocker, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2)
+    dataset_path = dataset.get_dataset_path(
+        coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+    )
+    DatasetManifest.build(dataset_path).save(dataset_path)
+    checksum_spy = mocker.spy(pyramid, "compute_checksum")
+
+    loaded = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+    )
+
+    assert checksum_spy.call_count == 0  # raw files are not hashed again
+    assert len(loaded) == 48
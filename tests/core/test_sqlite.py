@@ -0,0 +1,118 @@
+import datetime
+
+import numpy as np
+
+from athena.core.candle import candles_to_frame
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.sqlite import (
+    connect,
+    count_sqlite_candles,
+    iter_frames_from_sqlite,
+    save_frame_to_sqlite,
+)
+from athena.core.candle_frame import CandleFrame
+from athena.core.types import Coin, Period
+from athena.testing.generate import generate_candles
+
+
+def test_save_and_load_frame_sqlite(tmp_path):
+    start_date = datetime.datetime(2020, 1, 1)
+    frame = candles_to_frame(generate_candles(size=100, from_date=start_date))
+    filename = tmp_path / "candles.sqlite"
+
+    save_frame_to_sqlite(frame[50:], filename)
+    save_frame_to_sqlite(frame[:60], filename)  # overlapping candles are replaced
+    frames = list(
+        iter_frames_from_sqlite(
+            filename,
+            coin=frame.coin,
+            currency=frame.currency,
+            period=frame.period,
+            batch_size=30,
+        )
+    )
+
+    assert [len(batch) for batch in frames] == [30, 30, 30, 10]
+    loaded = CandleFrame.concat(frames)
+    for name, values in frame.columns.items():
+        assert np.array_equal(loaded.columns[name], values)
+    assert (
+        count_sqlite_candles(
+            filename,
+            coin=frame.coin,
+            currency=frame.currency,
+            period=frame.period,
+            from_date=start_date + datetime.timedelta(minutes=10),
+            to_date=start_date + datetime.timedelta(minutes=20),
+        )
+        == 10
+    )
+
+
+def test_sqlite_missing_table(tmp_path):
+    filename = tmp_path / "candles.sqlite"
+    save_frame_to_sqlite(candles_to_frame(generate_candles(size=10)), filename)
+
+    assert not list(
+        iter_frames_from_sqlite(
+            filename, coin=Coin.ETH, currency=Coin.USDT, period=Period(timeframe="1m")
+        )
+    )
+    assert (
+        count_sqlite_candles(
+            filename,
+            coin=Coin.ETH,
+            currency=Coin.USDT,
+            period=Period(timeframe="1m"),
+            from_date=datetime.datetime(2020, 1, 1),
+            to_date=datetime.datetime(2020, 1, 2),
+        )
+        == 0
+    )
+
+
+def test_load_from_sqlite_dataset(tmp_path):
+    dataset = DatasetLayout(tmp_path, storage_format="sqlite")
+    start_date = datetime.datetime(2020, 1, 1)
+    frame = candles_to_frame(
+        generate_candles(
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            from_date=start_date,
+            to_date=start_date + datetime.timedelta(days=3),
+        )
+    )
+    save_frame_to_sqlite(frame, dataset.get_database_path())
+
+    # readers are not blocked by a pending write transaction
+    writer = connect(dataset.get_database_path())
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute('DELETE FROM "BTC_USDT_1m"')
+    fluctuations = Fluctuations.load_from_dataset(
+        dataset=dataset,
+        coin=Coin.BTC,
+        currency=Coin.USDT,
+        target_period=Period(timeframe="1h"),
+        from_date=start_date + datetime.timedelta(days=1),
+        to_date=start_date + datetime.timedelta(days=1),
+    )
+    writer.rollback()
+    writer.close()
+
+    assert len(fluctuations) == 24
+    assert fluctuations.candles[0].open_time == start_date + datetime.timedelta(days=1)
+    chunks = list(
+        Fluctuations.iter_chunks(
+            dataset=dataset,
+            coin=Coin.BTC,
+            currency=Coin.USDT,
+            target_period=Period(timeframe="1h"),
+            from_date=start_date + datetime.timedelta(days=1),
+            to_date=start_date + datetime.timedelta(days=1),
+            chunk_size=10,
+        )
+    )
+    assert sum((chunk.fluctuations.candles for chunk in chunks), []) == (
+        fluctuations.candles
+    )
@@ -1,6 +1,9 @@
+import datetime
+import pickle
+
 import pytest
 
-from athena.core.types.period import _fill_missing_attributes
+from athena.core.types.period import Period, _fill_missing_attributes
 
 
 @pytest.mark.parametrize(
@@ -30,3 +33,12 @@ def test_fill_missing_attributes(timeframe, value, unit, expected_values):
 def test_fill_missing_attributes_fail(timeframe, value, unit):
     with pytest.raises(ValueError):
         _fill_missing_attributes(timeframe, value, unit)
+
+
+def test_period_is_interned():
+    period = Period(timeframe="4h")
+
+    assert Period(value=4, unit="h") is period
+    assert pickle.loads(pickle.dumps(period)) is period
+    assert period.to_timedelta() == datetime.timedelta(hours=4)
+    assert period != Period(timeframe="1h")
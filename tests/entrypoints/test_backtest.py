@@ -74,6 +74,10 @@ def test_run_backtest(config, tmp_path, mocker):
             root_dir.as_posix(),
             "--output-dir",
             output_dir.as_posix(),
+            "--workers",
+            "2",
+            "--engine",
+            "c",
         ],
     )
 
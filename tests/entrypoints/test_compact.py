@@ -0,0 +1,43 @@
+import datetime
+
+from click.testing import CliRunner
+
+from athena.cli import app
+from athena.core.dataset_layout import DatasetLayout
+from athena.core.fluctuations import Fluctuations
+from athena.core.types import Coin, Period
+
+
+def test_compact(tmp_path, save_days):
+    dataset = DatasetLayout(tmp_path)
+    start_date = datetime.datetime(2020, 1, 1)
+    save_days(dataset, start_date, nb_days=2)
+
+    runner = CliRunner().invoke(
+        app,
+        [
+            "compact",
+            "--coin",
+            "BTC",
+            "--currency",
+            "USDT",
+            "--root-dir",
+            str(tmp_path),
+        ],
+    )
+
+    assert runner.exit_code == 0
+    assert [
+        filename.name
+        for filename in dataset.get_dataset_path(
+            coin=Coin.BTC, currency=Coin.USDT, period=Period(timeframe="1m")
+        ).glob("*.csv")
+    ] == ["fluctuations_2020-01.csv"]
+    assert (
+        len(
+            Fluctuations.load_from_dataset(
+                dataset=dataset, coin=Coin.BTC, currency=Coin.USDT
+            )
+        )
+        == 2 * 1440
+    )
@@ -139,3 +139,4 @@ def test_create_ccpv_splits():
         len(train_fluctuations.candles) == 1000 - 198 - 0.01 * 1000
     )  # size - test_size - purge_size
     assert len(test_fluctuations.candles) == 198  # same value as test_indexes length
+    assert train_fluctuations.provenance == "split 0 train"
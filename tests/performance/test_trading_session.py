@@ -2,7 +2,8 @@ import datetime
 
 import pytest
 
-from athena.core.fluctuations import Fluctuations
+from athena.core.candle_frame import CandleFrame
+from athena.core.fluctuations import Fluctuations, FluctuationsChunk
 from athena.core.market_entities import Portfolio
 from athena.core.types import Signal, Period
 from athena.testing.generate import generate_fluctuations
@@ -10,6 +11,8 @@ from athena.tradingtools import Strategy
 
 
 class StrategyBuyMondaySellFriday(Strategy):
+    required_columns = ("open_time",)
+
     def compute_signals(self, fluctuations: Fluctuations) -> list[Signal]:
         """Return dummy signals."""
         signals = []
@@ -132,3 +135,76 @@ def test_get_trades_from_fluctuations_price_reach_sl(
 
     assert trade.stop_loss == pytest.approx(90, abs=1e-3)
     assert trade.close_price == pytest.approx(90, abs=1e-3)
+
+
+def test_get_trades_from_chunks(trading_session):
+    fluctuations = generate_fluctuations(
+        size=60,
+        from_date=datetime.datetime(2024, 10, 14),
+        period=Period(timeframe="1d"),
+        include_high_time=False,
+        include_low_time=False,
+    )
+    chunks = [
+        FluctuationsChunk(
+            fluctuations=Fluctuations.from_trusted_frame(
+                fluctuations.frame[max(start - 3, 0) : start + 10], provenance="chunk"
+            ),
+            lookback=min(start, 3),
+        )
+        for start in range(0, 60, 10)
+    ]
+
+    trades, portfolio = trading_session(
+        StrategyBuyMondaySellFriday()
+    ).get_trades_from_fluctuations(fluctuations=fluctuations)
+    chunked_trades, chunked_portfolio = trading_session(
+        StrategyBuyMondaySellFriday()
+    ).get_trades_from_chunks(chunks)
+
+    assert len(trades) == 8
+    assert chunked_trades == trades
+    assert chunked_portfolio == portfolio
+
+
+def test_get_trades_from_float32_fluctuations(sample_fluctuations, trading_session):
+    fluctuations = sample_fluctuations(
+        timeframe="1d", include_high_time=False, include_low_time=False
+    )
+
+    trades, portfolio = trading_session(
+        StrategyBuyMondaySellFriday()
+    ).get_trades_from_fluctuations(fluctuations=fluctuations)
+    float32_trades, float32_portfolio = trading_session(
+        StrategyBuyMondaySellFriday()
+    ).get_trades_from_fluctuations(fluctuations=fluctuations.with_precision("float32"))
+
+    # sample prices are exact in float32, profits are still computed in float64
+    assert float32_trades == trades
+    assert float32_portfolio == portfolio
+    assert isinstance(float32_trades[0].total_profit, float)
+
+
+def test_get_trades_from_projected_fluctuations(sample_fluctuations, trading_session):
+    fluctuations = sample_fluctuations(timeframe="1d")
+    session = trading_session(StrategyBuyMondaySellFriday())
+    projected = Fluctuations.from_trusted_frame(
+        CandleFrame(
+            coin=fluctuations.frame.coin,
+            currency=fluctuations.frame.currency,
+            period=fluctuations.frame.period,
+            columns={
+                name: fluctuations.frame.columns[name]
+                for name in session.required_columns
+            },
+        ),
+        provenance="test",
+    )
+
+    trades, portfolio = session.get_trades_from_fluctuations(fluctuations=fluctuations)
+    projected_trades, projected_portfolio = trading_session(
+        StrategyBuyMondaySellFriday()
+    ).get_trades_from_fluctuations(fluctuations=projected)
+
+    assert projected_trades == trades
+    assert projected_portfolio == portfolio
@@ -1,6 +1,10 @@
 import pytest
 
-from athena.tradingtools.indicators import TECHNICAL_INDICATORS, build_indicator
+from athena.tradingtools.indicators import (
+    TECHNICAL_INDICATORS,
+    build_indicator,
+    get_indicator_columns,
+)
 
 
 def dummy_indicator(x: int, parameter_a: int, parameter_b: int):
@@ -20,3 +24,17 @@ def test_build_indicator():
     )
 
     assert indicator_function(10) == 25
+
+
+def test_get_indicator_columns():
+    assert get_indicator_columns(name="ichimoku", parameters={}) == ("high", "low")
+    assert get_indicator_columns(
+        name="simple_moving_average", parameters={"window_size": 3}
+    ) == ("close",)
+    assert get_indicator_columns(
+        name="exponential_moving_average",
+        parameters={"window_size": 3, "column": "volume"},
+    ) == ("volume",)
+
+    with pytest.raises(NotImplementedError):
+        get_indicator_columns(name="unknown_indicator", parameters={})
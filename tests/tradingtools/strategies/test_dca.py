@@ -0,0 +1,33 @@
+import datetime
+
+import pytest
+
+from athena.core.types import Period, Signal
+from athena.testing.generate import generate_fluctuations
+from athena.tradingtools.strategies.dca import StrategyDCA, StrategyDCAModel
+
+
+@pytest.mark.parametrize(
+    "weekday, hour, minute",
+    [("every_day", 12, 0), ("monday", 0, 0), ("sunday", 23, 30)],
+)
+def test_dca_compute_signals(weekday, hour, minute):
+    fluctuations = generate_fluctuations(
+        size=14 * 24 * 4,
+        from_date=datetime.datetime(1969, 12, 25),  # before the epoch
+        period=Period(timeframe="15m"),
+    )
+    strategy = StrategyDCA(StrategyDCAModel(weekday=weekday, hour=hour, minute=minute))
+
+    signals = strategy.compute_signals(fluctuations)
+
+    assert signals == [
+        Signal.BUY
+        if (
+            weekday == "every_day" or candle.open_time.strftime("%A").lower() == weekday
+        )
+        and (candle.open_time.hour, candle.open_time.minute) == (hour, minute)
+        else Signal.WAIT
+        for candle in fluctuations.candles
+    ]
+    assert signals.count(Signal.BUY) == (14 if weekday == "every_day" else 2)